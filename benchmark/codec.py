@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#     codec.py
+#
+#     This file is part of the RoboEarth Cloud Engine framework.
+#
+#     This file was originally created for RoboEearth
+#     http://www.roboearth.org/
+#
+#     The research leading to these results has received funding from
+#     the European Union Seventh Framework Programme FP7/2007-2013 under
+#     grant agreement no248942 RoboEarth.
+#
+#     Copyright 2013 RoboEarth
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+#     \author/s: Dominique Hunziker
+#
+#
+
+# Python specific imports
+import random
+import timeit
+
+# rce specific imports
+from rce.comm import types
+from rce.comm.codec import availableCodecs, getCodec
+
+
+def _dataMessage(msg, clsName):
+    return {'type' : types.DATA_MESSAGE,
+            'data' : {'iTag' : 'benchmark', 'type' : clsName,
+                      'msgID' : 'ID', 'msg' : msg}}
+
+
+def _header():
+    return {'seq' : random.randint(0, 2**31),
+            'stamp' : '2013-04-15T12:00:00.123456',
+            'frame_id' : 'base_link'}
+
+
+def _string():
+    return _dataMessage({'data' : 'Hello World!'}, 'std_msgs/String')
+
+
+def _transform():
+    return _dataMessage({
+        'header' : _header(),
+        'child_frame_id' : 'odom',
+        'transform' : {
+            'translation' : {'x' : random.random(), 'y' : random.random(),
+                             'z' : random.random()},
+            'rotation' : {'x' : random.random(), 'y' : random.random(),
+                          'z' : random.random(), 'w' : random.random()}
+        }
+    }, 'geometry_msgs/TransformStamped')
+
+
+def _odometry():
+    pose = {'position' : {'x' : random.random(), 'y' : random.random(),
+                          'z' : random.random()},
+            'orientation' : {'x' : random.random(), 'y' : random.random(),
+                             'z' : random.random(), 'w' : random.random()}}
+    twist = {'linear' : {'x' : random.random(), 'y' : random.random(),
+                         'z' : random.random()},
+             'angular' : {'x' : random.random(), 'y' : random.random(),
+                          'z' : random.random()}}
+    return _dataMessage({
+        'header' : _header(),
+        'child_frame_id' : 'base_link',
+        'pose' : {'pose' : pose,
+                  'covariance' : [random.random() for _ in xrange(36)]},
+        'twist' : {'twist' : twist,
+                   'covariance' : [random.random() for _ in xrange(36)]}
+    }, 'nav_msgs/Odometry')
+
+
+def _laserScan():
+    return _dataMessage({
+        'header' : _header(),
+        'angle_min' : -1.57, 'angle_max' : 1.57, 'angle_increment' : 0.004,
+        'time_increment' : 0.0, 'scan_time' : 0.1,
+        'range_min' : 0.02, 'range_max' : 30.0,
+        'ranges' : [random.uniform(0.02, 30.0) for _ in xrange(720)],
+        'intensities' : [random.uniform(0.0, 1.0) for _ in xrange(720)]
+    }, 'sensor_msgs/LaserScan')
+
+
+PAYLOADS = [('std_msgs/String', _string),
+            ('geometry_msgs/TransformStamped', _transform),
+            ('nav_msgs/Odometry', _odometry),
+            ('sensor_msgs/LaserScan', _laserScan)]
+
+
+def run(codecs, number, repeat):
+    print('{0:<32}{1:<12}{2:>14}{3:>14}'.format('payload', 'codec',
+                                                'dumps [us]', 'loads [us]'))
+
+    for name, factory in PAYLOADS:
+        msg = factory()
+
+        for codecName in codecs:
+            codec = getCodec(codecName)
+            encoded = codec.dumps(msg)
+
+            dumps = min(timeit.repeat(lambda: codec.dumps(msg),
+                                      number=number, repeat=repeat))
+            loads = min(timeit.repeat(lambda: codec.loads(encoded),
+                                      number=number, repeat=repeat))
+
+            print('{0:<32}{1:<12}{2:>14.2f}{3:>14.2f}'.format(
+                name, codecName, dumps / number * 1e6, loads / number * 1e6))
+
+
+def _get_argparse():
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(prog='codec',
+                            description='Compare the JSON codecs which are '
+                                        'available for the WebSocket '
+                                        'connections on DATA_MESSAGE '
+                                        'payloads.')
+
+    parser.add_argument('--codec', help='Codec which should be measured. '
+                        'Can be given multiple times. (default: all '
+                        'available codecs)', action='append', type=str)
+    parser.add_argument('--number', help='Number of calls per measurement.',
+                        type=int, default=1000)
+    parser.add_argument('--repeat', help='Number of measurements.',
+                        type=int, default=3)
+
+    return parser
+
+
+if __name__ == '__main__':
+    args = _get_argparse().parse_args()
+
+    run(args.codec or availableCodecs(), args.number, args.repeat)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#     compression.py
+#
+#     This file is part of the RoboEarth Cloud Engine framework.
+#
+#     This file was originally created for RoboEearth
+#     http://www.roboearth.org/
+#
+#     The research leading to these results has received funding from
+#     the European Union Seventh Framework Programme FP7/2007-2013 under
+#     grant agreement no248942 RoboEarth.
+#
+#     Copyright 2013 RoboEarth
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+#     \author/s: Dominique Hunziker
+#
+#
+
+# Python specific imports
+import os
+import zlib
+import struct
+import timeit
+
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from StringIO import StringIO
+
+# rce specific imports
+from rce.comm.codec import getCodec
+from rce.comm.assembler import recursiveBinarySearch
+from rce.comm.compression import FrameCompressor, StreamCompressor
+
+# benchmark specific imports
+from codec import PAYLOADS, _dataMessage
+
+
+def _image():
+    """ Already compressed image data, i.e. PNG or JPEG, is approximated by
+        random data.
+    """
+    return _dataMessage({'format' : 'png',
+                         'data' : StringIO(os.urandom(65536))},
+                        'sensor_msgs/CompressedImage')
+
+
+def _serialize(msg):
+    """ Approximate the serialized ROS message which is compressed by the
+        forwarders by packing all numbers of the message as doubles.
+    """
+    parts = []
+
+    def pack(obj):
+        if isinstance(obj, dict):
+            for key in sorted(obj):
+                pack(obj[key])
+        elif isinstance(obj, (list, tuple)):
+            parts.append(struct.pack('<I', len(obj)))
+
+            for elem in obj:
+                pack(elem)
+        elif isinstance(obj, (int, long, float)):
+            parts.append(struct.pack('<d', obj))
+        elif isinstance(obj, basestring):
+            parts.append(struct.pack('<I', len(obj)))
+            parts.append(obj)
+        else:
+            parts.append(obj.getvalue())
+
+    pack(msg['data']['msg'])
+    return ''.join(parts)
+
+
+# Number of messages of an interface which are compressed as one stream
+STREAM = 100
+
+
+def _stream(msgs, level):
+    compressor = StreamCompressor(level)
+    return [compressor.compress(msg) for msg in msgs]
+
+
+def _frame(codec, msg):
+    """ Build the frame which is sent over the WebSocket connection. Binaries
+        are sent in separate frames of which only the largest one is used.
+    """
+    uriBinary, msgURI = recursiveBinarySearch(msg)
+    frames = [codec.dumps(msgURI)]
+    frames += [uri + binary.getvalue() for uri, binary in uriBinary]
+
+    return max(frames, key=len)
+
+
+def _measure(func, number, repeat):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def run(levels, thresholds, number, repeat):
+    codec = getCodec()
+    payloads = PAYLOADS + [('sensor_msgs/CompressedImage', _image)]
+
+    print('Forwarder path (zlib.compress of the serialized message)')
+    print('{0:<36}{1:>8}{2:>10}{3:>10}{4:>12}'.format('payload', 'level',
+                                                      'size', 'ratio',
+                                                      'time [us]'))
+
+    for name, factory in payloads:
+        data = _serialize(factory())
+
+        for level in levels:
+            size = len(zlib.compress(data, level))
+            t = _measure(lambda: zlib.compress(data, level), number, repeat)
+
+            print('{0:<36}{1:>8}{2:>10}{3:>10.2f}{4:>12.2f}'.format(
+                name, level, len(data), float(size) / len(data), t * 1e6))
+
+    print('')
+    print('Forwarder path (StreamCompressor on {0} messages of an '
+          'interface)'.format(STREAM))
+    print('{0:<36}{1:>8}{2:>10}{3:>10}{4:>10}{5:>12}{6:>12}'.format(
+                                'payload', 'level', 'size', 'ratio',
+                                'stream', 'time [us]', 'stream [us]'))
+
+    for name, factory in payloads:
+        msgs = [_serialize(factory()) for _ in xrange(STREAM)]
+        size = sum(len(msg) for msg in msgs)
+
+        for level in levels:
+            plain = sum(len(zlib.compress(msg, level)) for msg in msgs)
+            stream = sum(len(msg) for msg in _stream(msgs, level))
+
+            t = _measure(lambda: [zlib.compress(msg, level) for msg in msgs],
+                         number, repeat)
+            ts = _measure(lambda: _stream(msgs, level), number, repeat)
+
+            print('{0:<36}{1:>8}{2:>10}{3:>10.2f}{4:>10.2f}{5:>12.2f}'
+                  '{6:>12.2f}'.format(name, level, size // STREAM,
+                                      float(plain) / size,
+                                      float(stream) / size,
+                                      t * 1e6 / STREAM, ts * 1e6 / STREAM))
+
+    print('')
+    print('WebSocket path (FrameCompressor on the frames of the connection)')
+    print('{0:<36}{1:>8}{2:>10}{3:>10}{4:>12}'.format('payload', 'thresh',
+                                                      'size', 'ratio',
+                                                      'time [us]'))
+
+    for name, factory in payloads:
+        frame = _frame(codec, factory())
+
+        for threshold in thresholds:
+            for level in levels:
+                compressor = FrameCompressor(threshold, level)
+                chunks = compressor.compress((frame,), False)
+                size = sum(len(c) for c in chunks) if chunks else len(frame)
+                t = _measure(lambda: compressor.compress((frame,), False),
+                             number, repeat)
+
+                print('{0:<36}{1:>8}{2:>10}{3:>10.2f}{4:>12.2f}'.format(
+                    '{0} [{1}]'.format(name, level), threshold, len(frame),
+                    float(size) / len(frame), t * 1e6))
+
+
+def _get_argparse():
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(prog='compression',
+                            description='Compare the compression of the data '
+                                        'messages in the forwarders, on '
+                                        'their own and as streams, with the '
+                                        'selective compression of the '
+                                        'WebSocket connections.')
+
+    parser.add_argument('--level', help='Compression level which should be '
+                        'measured. Can be given multiple times. (default: 1, '
+                        '6, 9)', action='append', type=int)
+    parser.add_argument('--threshold', help='Compression threshold in bytes '
+                        'of the WebSocket connections which should be '
+                        'measured. Can be given multiple times. (default: '
+                        '0, 1024)', action='append', type=int)
+    parser.add_argument('--number', help='Number of calls per measurement.',
+                        type=int, default=100)
+    parser.add_argument('--repeat', help='Number of measurements.',
+                        type=int, default=3)
+
+    return parser
+
+
+if __name__ == '__main__':
+    args = _get_argparse().parse_args()
+
+    run(args.level or [1, 6, 9], args.threshold or [0, 1024], args.number,
+        args.repeat)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#     connect.py
+#
+#     This file is part of the RoboEarth Cloud Engine framework.
+#
+#     This file was originally created for RoboEearth
+#     http://www.roboearth.org/
+#
+#     The research leading to these results has received funding from
+#     the European Union Seventh Framework Programme FP7/2007-2013 under
+#     grant agreement no248942 RoboEarth.
+#
+#     Copyright 2013 RoboEarth
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+#     \author/s: Dominique Hunziker
+#
+#
+
+# Python specific imports
+import time
+from urllib import urlencode
+
+# zope specific imports
+from zope.interface import implements
+
+# twisted specific imports
+from twisted.internet.defer import Deferred, DeferredList, DeferredSemaphore
+from twisted.web.client import getPage
+
+# rce specific imports
+from rce.comm._version import CURRENT_VERSION
+from rce.comm.interfaces import IMessageReceiver
+from rce.comm.client import RCE
+
+
+class _Receiver(object):
+    """ Receiver for the robots of the connect storm which discards all
+        messages.
+    """
+    implements(IMessageReceiver)
+
+    def processReceivedMessage(self, iTag, clsName, msgID, msg):
+        pass
+
+
+class ConnectStorm(object):
+    """ Connect a large number of robots simultaneously to the cloud engine
+        and measure the time until each robot is connected.
+    """
+    def __init__(self, reactor, url, robots, concurrency, userID, password):
+        self._reactor = reactor
+        self._url = url
+        self._robots = robots
+        self._semaphore = DeferredSemaphore(concurrency)
+        self._userID = userID
+        self._password = password
+
+        self._latencies = []
+        self._errors = []
+        self._connections = []
+
+    def _request(self, nr):
+        """ Only request the URL of a robot process from the Master.
+        """
+        args = urlencode((('userID', self._userID),
+                          ('version', CURRENT_VERSION)))
+        return getPage('{0}?{1}'.format(self._url, args))
+
+    def _connect(self, nr):
+        """ Request the URL of a robot process and establish the WebSocket
+            connection.
+        """
+        d = Deferred()
+        conn = RCE(_Receiver(), self._userID, 'storm{0}'.format(nr),
+                   self._password, self._reactor)
+        conn.connect(self._url, d)
+        self._connections.append(conn)
+        return d
+
+    def _run(self, func, nr):
+        start = time.time()
+
+        def cb(_):
+            self._latencies.append(time.time() - start)
+
+        def eb(e):
+            self._errors.append(e.getErrorMessage())
+
+        return func(nr).addCallbacks(cb, eb)
+
+    def run(self, websocket):
+        """ Start the connect storm.
+
+            @param websocket:   Flag which is True if the robots should also
+                                establish the WebSocket connection.
+            @type  websocket:   bool
+
+            @return:            Deferred which fires as soon as all robots
+                                are either connected or failed.
+            @rtype:             twisted.internet.defer.Deferred
+        """
+        func = self._connect if websocket else self._request
+
+        if websocket:
+            # Each robot requests the URL in a thread of the pool
+            self._reactor.suggestThreadPoolSize(self._semaphore.limit)
+
+        start = time.time()
+        d = DeferredList([self._semaphore.run(self._run, func, nr)
+                          for nr in xrange(self._robots)])
+        d.addCallback(lambda _: self._report(time.time() - start))
+        return d
+
+    def _report(self, duration):
+        for conn in self._connections:
+            conn.close()
+
+        latencies = sorted(self._latencies)
+
+        print('robots:      {0}'.format(self._robots))
+        print('connected:   {0}'.format(len(latencies)))
+        print('failed:      {0}'.format(len(self._errors)))
+        print('duration:    {0:.3f} s'.format(duration))
+        print('rate:        {0:.1f} robots/s'.format(len(latencies) / duration))
+
+        if latencies:
+            for p in (50, 90, 99, 100):
+                i = min(len(latencies) - 1, len(latencies) * p // 100)
+                print('latency p{0:<3} {1:>10.2f} ms'.format(p,
+                                                            latencies[i] * 1e3))
+
+        for msg in sorted(set(self._errors)):
+            print('error: {0}'.format(msg))
+
+
+def _get_argparse():
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(prog='connect',
+                            description='Measure a connect storm of many '
+                                        'robots which connect simultaneously '
+                                        'to the cloud engine.')
+
+    parser.add_argument('ipMaster', help='IP address of master process.',
+                        type=str)
+    parser.add_argument('--port', help='HTTP port of master process.',
+                        type=int, default=9000)
+    parser.add_argument('--robots', help='Number of robots which connect.',
+                        type=int, default=1000)
+    parser.add_argument('--concurrency', help='Maximal number of robots '
+                        'which are connecting at the same time.',
+                        type=int, default=1000)
+    parser.add_argument('--websocket', help='Establish the WebSocket '
+                        'connections as well instead of only requesting the '
+                        'URLs from the master process.', action='store_true')
+    parser.add_argument('--user', help='User ID of the robots.', type=str,
+                        default='testUser')
+    parser.add_argument('--password', help='Password of the user.', type=str,
+                        default='testUser')
+
+    return parser
+
+
+def main(reactor, args):
+    url = 'http://{0}:{1}/'.format(args.ipMaster, args.port)
+    storm = ConnectStorm(reactor, url, args.robots, args.concurrency,
+                         args.user, args.password)
+
+    d = storm.run(args.websocket)
+    d.addBoth(lambda _: reactor.stop())
+
+    reactor.run()
+
+
+if __name__ == '__main__':
+    from twisted.internet import reactor
+
+    main(reactor, _get_argparse().parse_args())
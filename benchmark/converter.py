@@ -0,0 +1,543 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#     converter.py
+#
+#     This file is part of the RoboEarth Cloud Engine framework.
+#
+#     This file was originally created for RoboEearth
+#     http://www.roboearth.org/
+#
+#     The research leading to these results has received funding from
+#     the European Union Seventh Framework Programme FP7/2007-2013 under
+#     grant agreement no248942 RoboEarth.
+#
+#     Copyright 2013 RoboEarth
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+#     \author/s: Dominique Hunziker
+#
+#
+
+# Python specific imports
+import json
+import zlib
+import random
+import timeit
+from functools import partial
+
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from StringIO import StringIO
+
+import numpy
+
+# ROS specific imports
+from rospkg.environment import get_ros_paths
+
+# rce specific imports
+from rce.util.loader import Loader
+from rce.util.converter import Converter, _stringify
+from rce.util.converters.image import ImageConverter
+from rce.util.converters.pointcloud import PointCloud2Converter
+from rce.util.converters.occupancygrid import OccupancyGridConverter
+
+
+class _ElementConverter(Converter):
+    """ Converter which walks the slots of each message for every conversion
+        as the converter did before the conversion plans were introduced.
+    """
+    def _encodeMsg(self, rosMsg):
+        data = {}
+
+        for (slotName, slotType) in zip(rosMsg.__slots__, rosMsg._slot_types):
+            if '[]' == slotType[-2:]:
+                listBool = True
+                slotType = slotType[:-2]
+            else:
+                listBool = False
+
+            if slotType in self._BASE_TYPES:
+                convFunc = self._BASE_TYPES[slotType]
+            elif slotType in self._SPECIAL_TYPES:
+                convFunc = self._SPECIAL_TYPES[slotType]().encode
+            elif slotType in self._customTypes:
+                convFunc = self._customTypes[slotType][0]().encode
+            else:
+                convFunc = self._encodeMsg
+
+            if listBool:
+                convFunc = partial(map, convFunc)
+
+            data[slotName] = convFunc(getattr(rosMsg, slotName))
+
+        return data
+
+    def _decodeMsg(self, msgCls, data):
+        rosMsg = msgCls()
+
+        for (slotName, slotType) in zip(rosMsg.__slots__, rosMsg._slot_types):
+            if slotName not in data:
+                continue
+
+            if '[]' == slotType[-2:]:
+                listBool = True
+                slotType = slotType[:-2]
+            else:
+                listBool = False
+
+            if slotType == 'string':
+                convFunc = _stringify
+            elif slotType in self._BASE_TYPES:
+                convFunc = self._BASE_TYPES[slotType]
+            elif slotType in self._SPECIAL_TYPES:
+                convFunc = self._SPECIAL_TYPES[slotType]().decode
+            else:
+                convFunc = partial(self._decodeMsg,
+                                   self._loader.loadMsg(*slotType.split('/')))
+
+            if listBool:
+                convFunc = partial(map, convFunc)
+
+            setattr(rosMsg, slotName, convFunc(data[slotName]))
+
+        return rosMsg
+
+    def encode(self, rosMsg):
+        return self._encodeMsg(rosMsg)
+
+    def decode(self, msgCls, data):
+        return self._decodeMsg(msgCls, data)
+
+
+def _header():
+    return {'seq' : random.randint(0, 2**31),
+            'stamp' : '2013-04-15T12:00:00.123456',
+            'frame_id' : 'base_link'}
+
+
+def _vector():
+    return {'x' : random.random(), 'y' : random.random(),
+            'z' : random.random()}
+
+
+def _quaternion():
+    return {'x' : random.random(), 'y' : random.random(),
+            'z' : random.random(), 'w' : random.random()}
+
+
+def _string():
+    return {'data' : 'Hello World!'}
+
+
+def _poseStamped():
+    return {'header' : _header(),
+            'pose' : {'position' : _vector(), 'orientation' : _quaternion()}}
+
+
+def _transform():
+    return {'header' : _header(),
+            'child_frame_id' : 'odom',
+            'transform' : {'translation' : _vector(),
+                           'rotation' : _quaternion()}}
+
+
+def _jointState():
+    joints = 7
+    return {'header' : _header(),
+            'name' : ['joint{0}'.format(i) for i in xrange(joints)],
+            'position' : [random.random() for _ in xrange(joints)],
+            'velocity' : [random.random() for _ in xrange(joints)],
+            'effort' : [random.random() for _ in xrange(joints)]}
+
+
+def _imu():
+    return {'header' : _header(),
+            'orientation' : _quaternion(),
+            'orientation_covariance' : [random.random() for _ in xrange(9)],
+            'angular_velocity' : _vector(),
+            'angular_velocity_covariance' : [random.random()
+                                             for _ in xrange(9)],
+            'linear_acceleration' : _vector(),
+            'linear_acceleration_covariance' : [random.random()
+                                                for _ in xrange(9)]}
+
+
+def _laserScan():
+    return {'header' : _header(),
+            'angle_min' : -1.57, 'angle_max' : 1.57, 'angle_increment' : 0.004,
+            'time_increment' : 0.0, 'scan_time' : 0.1,
+            'range_min' : 0.1, 'range_max' : 30.0,
+            'ranges' : [random.uniform(0.1, 30.0) for _ in xrange(720)],
+            'intensities' : []}
+
+
+def _image(encoding, channels, width=640, height=480):
+    """ Image with smooth gradients and some noise, similar to a camera image.
+    """
+    rows = []
+
+    for y in xrange(height):
+        row = bytearray(width * channels)
+
+        for x in xrange(width):
+            for c in xrange(channels):
+                row[x * channels + c] = ((x + y * c) // 3 +
+                                         random.randint(0, 7)) % 256
+
+        rows.append(str(row))
+
+    return {'encoding' : encoding, 'width' : width, 'height' : height,
+            'step' : width * channels, 'is_bigendian' : 0,
+            'data' : StringIO(''.join(rows))}
+
+
+def _pointCloud(width=640, height=480):
+    """ Point cloud of a depth camera with the fields x, y, z and rgb.
+    """
+    pointType = numpy.dtype([('x', '<f4'), ('y', '<f4'), ('z', '<f4'),
+                             ('rgb', '<u4')])
+    points = numpy.zeros((height, width), pointType)
+
+    v, u = numpy.mgrid[0:height, 0:width]
+    depth = (1.5 + 0.3 * numpy.sin(u / 50.0) +
+             numpy.random.normal(0.0, 0.002, (height, width)))
+    depth[::7, ::11] = numpy.nan
+
+    points['x'] = (u - width / 2) / 525.0 * depth
+    points['y'] = (v - height / 2) / 525.0 * depth
+    points['z'] = depth
+    points['rgb'] = (u // 3 + v // 3 * 256) % 2 ** 24
+
+    fields = [{'name' : name, 'offset' : 4 * i, 'datatype' : datatype,
+               'count' : 1}
+              for i, (name, datatype) in enumerate([('x', 7), ('y', 7),
+                                                    ('z', 7), ('rgb', 7)])]
+
+    return {'header' : _header(), 'height' : height, 'width' : width,
+            'fields' : fields, 'is_bigendian' : False, 'point_step' : 16,
+            'row_step' : 16 * width, 'is_dense' : False,
+            'data' : StringIO(points.tostring())}
+
+
+def _occupancyGrids(frames, size=1000):
+    """ Occupancy grids of a map which is explored step by step.
+    """
+    cells = numpy.empty((size, size), numpy.int8)
+    cells.fill(-1)
+    grids = []
+
+    for i in xrange(frames):
+        row = size // 4 + 4 * i
+        cells[row:row + 4, size // 4:3 * size // 4] = 0
+        cells[row:row + 4, size // 4] = 100
+        cells[row:row + 4, 3 * size // 4] = 100
+
+        grids.append({'header' : _header(),
+                      'info' : {'resolution' : 0.05, 'width' : size,
+                                'height' : size,
+                                'origin' : {'position' : _vector(),
+                                            'orientation' : _quaternion()}},
+                      'data' : cells.ravel().tolist()})
+
+    return grids
+
+
+# Codecs of the images as tuples of the form (codec, quality)
+CODECS = [('png', None), ('jpeg', 90), ('jpeg', 75), ('webp', 90),
+          ('raw', None)]
+
+IMAGES = [('rgb8', 3), ('bgr8', 3), ('mono8', 1)]
+
+# Codecs of the point clouds and occupancy grids as tuples of the form
+# (codec, quality)
+CLOUD_CODECS = [('columnar', None), ('quantized', 1), ('quantized', 5)]
+GRID_CODECS = [('rle', None), ('delta', None)]
+
+# Number of occupancy grids in the measured sequence
+FRAMES = 20
+
+
+PAYLOADS = [('std_msgs/String', _string),
+            ('geometry_msgs/PoseStamped', _poseStamped),
+            ('geometry_msgs/TransformStamped', _transform),
+            ('sensor_msgs/JointState', _jointState),
+            ('sensor_msgs/Imu', _imu),
+            ('sensor_msgs/LaserScan', _laserScan)]
+
+
+# Number of messages which are converted at once for the 'many' path
+BURST = 100
+
+
+def _measure(func, number, repeat, size=1):
+    return min(timeit.repeat(func, number=number,
+                             repeat=repeat)) / (number * size)
+
+
+def _serialize(rosMsg):
+    buf = StringIO()
+    rosMsg.serialize(buf)
+    return buf.getvalue()
+
+
+def _deserialize(msgCls, msg):
+    rosMsg = msgCls()
+    rosMsg.deserialize(msg)
+    return rosMsg
+
+
+def _frames(data):
+    """ JSON frame and binary frames which are sent for the data.
+    """
+    binaries = []
+
+    def reference(obj):
+        binaries.append(obj.getvalue())
+        return '*' * 32
+
+    return [json.dumps(data, default=reference)] + binaries
+
+
+def _compress(frames):
+    return [zlib.compress(frame, 6) for frame in frames]
+
+
+def _decompress(frames):
+    return [zlib.decompress(frame) for frame in frames]
+
+
+def _print(name, convName, enc, dec):
+    print('{0:<32}{1:<12}{2:>14.2f}{3:>14.2f}'.format(name, convName,
+                                                      enc * 1e6, dec * 1e6))
+
+
+def run(number, repeat):
+    loader = Loader(get_ros_paths())
+    converters = [('element', _ElementConverter(loader)),
+                  ('plan', Converter(loader))]
+
+    print('Conversion of ROS message instances:')
+    print('{0:<32}{1:<12}{2:>14}{3:>14}'.format('payload', 'converter',
+                                                'encode [us]', 'decode [us]'))
+
+    for name, factory in PAYLOADS:
+        msgCls = loader.loadMsg(*name.split('/'))
+        data = factory()
+        rosMsg = Converter(loader).decode(msgCls, data)
+
+        for convName, converter in converters:
+            try:
+                converter.decode(msgCls, data)
+                converter.encode(rosMsg)
+            except (AttributeError, TypeError, ValueError):
+                # Fixed-size arrays are not supported by the element converter
+                print('{0:<32}{1:<12}{2:>14}{3:>14}'.format(name, convName,
+                                                            'n/a', 'n/a'))
+                continue
+
+            enc = _measure(lambda: converter.encode(rosMsg), number, repeat)
+            dec = _measure(lambda: converter.decode(msgCls, data), number,
+                           repeat)
+            _print(name, convName, enc, dec)
+
+    converter = Converter(loader)
+
+    print('')
+    print('Conversion of serialized ROS messages:')
+    print('{0:<32}{1:<12}{2:>14}{3:>14}'.format('payload', 'path',
+                                                'encode [us]', 'decode [us]'))
+
+    for name, factory in PAYLOADS:
+        msgCls = loader.loadMsg(*name.split('/'))
+        data = factory()
+        msg = _serialize(converter.decode(msgCls, data))
+
+        enc = _measure(lambda: converter.encode(_deserialize(msgCls, msg)),
+                       number, repeat)
+        dec = _measure(lambda: _serialize(converter.decode(msgCls, data)),
+                       number, repeat)
+        _print(name, 'object', enc, dec)
+
+        enc = _measure(lambda: converter.encodeSerialized(msgCls, msg),
+                       number, repeat)
+        dec = _measure(lambda: converter.decodeSerialized(msgCls, data),
+                       number, repeat)
+        _print(name, 'direct', enc, dec)
+
+        msgs = [msg] * BURST
+        dataList = [data] * BURST
+
+        enc = _measure(lambda: converter.encodeSerializedMany(msgCls, msgs),
+                       max(number // BURST, 1), repeat, BURST)
+        dec = _measure(lambda: converter.decodeSerializedMany(msgCls,
+                                                              dataList),
+                       max(number // BURST, 1), repeat, BURST)
+        _print(name, 'many', enc, dec)
+
+
+def runImages(number, repeat):
+    loader = Loader(get_ros_paths())
+    converter = Converter(loader)
+    msgCls = loader.loadMsg('sensor_msgs', 'Image')
+
+    print('')
+    print('Conversion of 640x480 images:')
+    print('{0:<32}{1:<12}{2:>14}{3:>14}'.format('encoding', 'codec',
+                                                'encode [us]', 'decode [us]'))
+
+    for encoding, channels in IMAGES:
+        rosMsg = converter.decode(msgCls, _image(encoding, channels))
+
+        for codec, quality in CODECS:
+            imageConverter = ImageConverter(codec, quality)
+            data = imageConverter.encode(rosMsg)
+
+            enc = _measure(lambda: imageConverter.encode(rosMsg), number,
+                           repeat)
+
+            if codec == 'raw':
+                dec = _measure(lambda: converter.decode(msgCls, data),
+                               number, repeat)
+            else:
+                dec = _measure(lambda: imageConverter.decode(data), number,
+                               repeat)
+
+            _print(encoding, '{0}:{1}'.format(codec, quality or '-'), enc,
+                   dec)
+
+
+def _printLarge(name, codec, size, enc, dec):
+    print('{0:<32}{1:<14}{2:>12.1f}{3:>12.1f}{4:>12.1f}'.format(
+                                    name, codec, size / 1024.0, enc * 1e3,
+                                    dec * 1e3))
+
+
+def runLarge(number, repeat):
+    loader = Loader(get_ros_paths())
+    converter = Converter(loader)
+
+    print('')
+    print('Conversion of 640x480 point clouds and sequences of 1000x1000 '
+          'occupancy grids:')
+    print('{0:<32}{1:<14}{2:>12}{3:>12}{4:>12}'.format('payload', 'codec',
+                                                       'size [kB]',
+                                                       'encode [ms]',
+                                                       'decode [ms]'))
+
+    name = 'sensor_msgs/PointCloud2'
+    msgCls = loader.loadMsg(*name.split('/'))
+    rosMsg = converter.decode(msgCls, _pointCloud())
+
+    # Without a custom converter the points are sent as binary and the
+    # frames are compressed by the connection if requested
+    data = converter.encode(rosMsg)
+    size = sum(len(frame) for frame in _frames(data))
+    enc = _measure(lambda: _frames(converter.encode(rosMsg)), number, repeat)
+    dec = _measure(lambda: converter.decode(msgCls, data), number, repeat)
+    _printLarge(name, 'plain', size, enc, dec)
+
+    frames = _compress(_frames(data))
+    size = sum(len(frame) for frame in frames)
+    enc = _measure(lambda: _compress(_frames(converter.encode(rosMsg))),
+                   number, repeat)
+    dec = _measure(lambda: (_decompress(frames),
+                            converter.decode(msgCls, data)), number, repeat)
+    _printLarge(name, 'plain+zlib', size, enc, dec)
+
+    for codec, quality in CLOUD_CODECS:
+        cloudConverter = PointCloud2Converter(codec, quality)
+        encoded = cloudConverter.encode(rosMsg)
+
+        enc = _measure(lambda: cloudConverter.encode(rosMsg), number, repeat)
+        dec = _measure(lambda: cloudConverter.decode(encoded), number, repeat)
+        _printLarge(name, '{0}:{1}'.format(codec, quality or '-'),
+                    len(encoded.getvalue()), enc, dec)
+
+    name = 'nav_msgs/OccupancyGrid'
+    msgCls = loader.loadMsg(*name.split('/'))
+    rosMsgs = converter.decodeMany(msgCls, _occupancyGrids(FRAMES))
+
+    # The occupancy grids are measured as a sequence, which contains the
+    # keyframes and the deltas
+    dataList = converter.encodeMany(rosMsgs)
+    size = sum(len(frame) for data in dataList
+               for frame in _frames(data)) / FRAMES
+    enc = _measure(lambda: map(_frames, converter.encodeMany(rosMsgs)),
+                   number, repeat, FRAMES)
+    dec = _measure(lambda: converter.decodeMany(msgCls, dataList), number,
+                   repeat, FRAMES)
+    _printLarge(name, 'plain', size, enc, dec)
+
+    frameList = [_compress(_frames(data)) for data in dataList]
+    size = sum(len(frame) for frames in frameList
+               for frame in frames) / FRAMES
+    enc = _measure(lambda: [_compress(_frames(data))
+                            for data in converter.encodeMany(rosMsgs)],
+                   number, repeat, FRAMES)
+    dec = _measure(lambda: (map(_decompress, frameList),
+                            converter.decodeMany(msgCls, dataList)),
+                   number, repeat, FRAMES)
+    _printLarge(name, 'plain+zlib', size, enc, dec)
+
+    for codec, quality in GRID_CODECS:
+        gridConverter = OccupancyGridConverter(codec, quality)
+        encoded = map(gridConverter.encode, rosMsgs)
+        size = sum(len(e.getvalue()) for e in encoded) / FRAMES
+
+        # Each measured sequence starts with a keyframe
+        enc = _measure(lambda: map(OccupancyGridConverter(codec,
+                                                          quality).encode,
+                                   rosMsgs), number, repeat, FRAMES)
+        dec = _measure(lambda: map(OccupancyGridConverter().decode,
+                                   encoded), number, repeat, FRAMES)
+        _printLarge(name, '{0}:{1}'.format(codec, quality or '-'), size, enc,
+                    dec)
+
+
+def _get_argparse():
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(prog='converter',
+                            description='Compare the conversion of ROS '
+                                        'messages using the compiled plans '
+                                        'with the element-by-element '
+                                        'conversion and the direct '
+                                        'translation of serialized ROS '
+                                        'messages, one by one and in bursts, '
+                                        'with the conversion of the ROS '
+                                        'message instances.')
+
+    parser.add_argument('--number', help='Number of calls per measurement.',
+                        type=int, default=1000)
+    parser.add_argument('--repeat', help='Number of measurements.',
+                        type=int, default=3)
+    parser.add_argument('--images', help='Number of calls per measurement '
+                                         'of the image codecs.',
+                        type=int, default=20)
+    parser.add_argument('--large', help='Number of calls per measurement '
+                                        'of the point cloud and occupancy '
+                                        'grid codecs.',
+                        type=int, default=5)
+
+    return parser
+
+
+if __name__ == '__main__':
+    args = _get_argparse().parse_args()
+
+    run(args.number, args.repeat)
+    runImages(args.images, args.repeat)
+    runLarge(args.large, args.repeat)
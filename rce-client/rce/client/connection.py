@@ -62,7 +62,8 @@ class _Connection(object):
 
     INTERFACE_MAP = {}
 
-    def __init__(self, userID, robotID, password, reactor):
+    def __init__(self, userID, robotID, password, reactor,
+                 compressedStreams=False):
         """ Initialize the Connection.
 
             @param userID:      User ID which will be used to authenticate the
@@ -80,11 +81,18 @@ class _Connection(object):
             @param reactor:     Reference to reactor which is used for this
                                 connection.
             @type  reactor:     twisted::reactor
+
+            @param compressedStreams:   Flag which is True if the serialized
+                                        ROS messages of the forwarders should
+                                        be compressed as one stream per
+                                        interface.
+            @type  compressedStreams:   bool
         """
         self._userID = userID
         self._robotID = robotID
         self._password = password
         self._reactor = reactor
+        self._compressedStreams = compressedStreams
 
         self._rce = None
         self._interfaces = {}
@@ -99,6 +107,13 @@ class _Connection(object):
         """ Reference to twisted::reactor. """
         return self._reactor
 
+    @property
+    def streamEpoch(self):
+        """ Epoch of the compressed streams of the forwarders or None, if the
+            messages should be compressed on their own.
+        """
+        return self._rce.streamEpoch if self._rce else None
+
     def connect(self, masterUrl, deferred):
         """ Connect to RCE.
 
@@ -116,7 +131,8 @@ class _Connection(object):
             raise ConnectionError('There is already a connection registered.')
 
         self._rce = RCE(self, self._userID, self._robotID, self._password,
-                        self._reactor)
+                        self._reactor,
+                        compressedStreams=self._compressedStreams)
 
         # Connect
         self._rce.connect(masterUrl, deferred)
@@ -266,6 +282,26 @@ class _Connection(object):
 
     removeInterface.__doc__ = RCE.removeInterface.__doc__ #@UndefinedVariable
 
+    def configureComponent(self, config):
+        if not self._rce:
+            raise ConnectionError('No connection to RCE.')
+
+        if 'addInterfaces' in config:
+            interfaces = []
+
+            for iface in config['addInterfaces']:
+                iface = list(iface)
+                iface[2] = self.INTERFACE_MAP.get(iface[2], iface[2])
+                interfaces.append(tuple(iface))
+
+            config = dict(config)
+            config['addInterfaces'] = interfaces
+
+        self._rce.configureComponent(config)
+
+    configureComponent.__doc__ = \
+        RCE.configureComponent.__doc__ #@UndefinedVariable
+
     def addConnection(self, tagA, tagB):
         if not self._rce:
             raise ConnectionError('No connection to RCE.')
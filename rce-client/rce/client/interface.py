@@ -51,10 +51,17 @@ except ImportError:
 # twisted specific imports
 from twisted.internet.defer import Deferred
 
+# rce specific imports
+from rce.comm.compression import StreamCompressor, StreamDecompressor
+
 
 # Compression level used for communication
 _GZIP_LVL = 9
 
+# Compression level used for the compressed streams; higher levels only search
+# longer through the previous messages of the stream
+_STREAM_LVL = 6
+
 
 class _Base(object):
     """ Abstract base for all Interface classes.
@@ -291,6 +298,42 @@ if HAS_ROS:
         """
 
 
+    class _Compression(object):
+        """ Helper class which compresses the serialized ROS messages of an
+            interface as one stream, if the connection requested it, or else
+            on their own.
+        """
+        def __init__(self, conn):
+            self._conn = conn
+            self._compressor = StreamCompressor(_STREAM_LVL)
+            self._decompressor = StreamDecompressor()
+            self._epoch = None
+
+        def compress(self, msg):
+            """ Compress a serialized ROS message; the messages have to be
+                sent in the order in which they have been compressed.
+            """
+            epoch = self._conn.streamEpoch
+
+            if epoch is None:
+                return zlib.compress(msg, _GZIP_LVL)
+
+            if epoch != self._epoch:
+                # Messages of the stream might have been lost
+                self._compressor.reset()
+                self._epoch = epoch
+
+            return self._compressor.compress(msg)
+
+        def decompress(self, msg):
+            """ Decompress a received serialized ROS message.
+
+                @raise:     ValueError, if the message is invalid or a
+                            previous message of the stream is missing.
+            """
+            return self._decompressor.decompress(msg)
+
+
     class _EventRef(object):
         """ Helper class which acts as a threading.Event, but which can be used
             to pass a reference together which signaling the event.
@@ -334,6 +377,8 @@ if HAS_ROS:
             """
             self._sub = None
             self._addr = addr
+            self._lock = Lock()
+            self._compression = _Compression(conn)
 
             self._sub = rospy.Subscriber(addr, rospy.AnyMsg, self._rosCB)
             print("Local ROS Subscriber on topic '{0}' is up.".format(addr))
@@ -343,7 +388,8 @@ if HAS_ROS:
         def _rosCB(self, msg):
             """ Internally used callback for ROS Subscriber.
             """
-            self.publish(StringIO(zlib.compress(msg._buff, _GZIP_LVL)))
+            with self._lock:
+                self.publish(StringIO(self._compression.compress(msg._buff)))
 
         def __del__(self):
             """ Finalize the Publisher.
@@ -365,6 +411,7 @@ if HAS_ROS:
             """
             self._pub = None
             self._addr = addr
+            self._compression = _Compression(conn)
 
             args = msgType.split('/')
 
@@ -383,7 +430,13 @@ if HAS_ROS:
                 Publisher.
             """
             rosMsg = rospy.AnyMsg()
-            rosMsg._buff = zlib.decompress(msg.getvalue())
+
+            try:
+                rosMsg._buff = self._compression.decompress(msg.getvalue())
+            except ValueError as e:
+                print('Dropped message: {0}'.format(e))
+                return
+
             self._pub.publish(rosMsg)
 
         def __del__(self):
@@ -408,6 +461,7 @@ if HAS_ROS:
             self._addr = addr
             self._lock = Lock()
             self._pending = set()
+            self._compression = _Compression(conn)
 
             args = srvType.split('/')
 
@@ -428,12 +482,11 @@ if HAS_ROS:
             """ Internally used callback for ROS Service.
             """
             event = _EventRef()
-            msg = StringIO(zlib.compress(req._buff, _GZIP_LVL))
 
             with self._lock:
                 self._pending.add(event)
-
-            self._call(msg, self._rceCB, event)
+                msg = StringIO(self._compression.compress(req._buff))
+                self._call(msg, self._rceCB, event)
 
             with self._lock:
                 self._pending.discard(event)
@@ -450,7 +503,14 @@ if HAS_ROS:
                 Service as response.
             """
             rosMsg = rospy.AnyMsg()
-            rosMsg._buff = zlib.decompress(msg.getvalue())
+
+            try:
+                rosMsg._buff = self._compression.decompress(msg.getvalue())
+            except ValueError as e:
+                print('Dropped response: {0}'.format(e))
+                event.set(None)
+                return
+
             event.set(rosMsg)
 
         def __del__(self):
@@ -476,6 +536,7 @@ if HAS_ROS:
             """ Initialize the Service Client.
             """
             self._addr = addr
+            self._compression = _Compression(conn)
 
             args = srvType.split('/')
 
@@ -499,3 +560,23 @@ if HAS_ROS:
             rospy.wait_for_service(self._addr, timeout=5)
             serviceFunc = rospy.ServiceProxy(self._addr, self._srvCls)
             return serviceFunc(rosMsg)
+
+        def _callback(self, msg, msgID):
+            """ Callback hook; the requests are decompressed in the order in
+                which they have been received.
+            """
+            try:
+                msg = self._compression.decompress(msg.getvalue())
+            except ValueError as e:
+                print('Dropped request: {0}'.format(e))
+                return
+
+            super(ROSServiceProvider, self)._callback(msg, msgID)
+
+        def _response_success(self, msg, msgID):
+            """ Internally used method which is executed when the service has
+                been successfully called; the responses are compressed in the
+                order in which they are sent.
+            """
+            msg = StringIO(self._compression.compress(msg._buff))
+            super(ROSServiceProvider, self)._response_success(msg, msgID)
@@ -123,7 +123,8 @@ def main(config, reactor):
         print('Configuration is missing the key {0}.'.format(e))
         return 1
 
-    conn = ROSConnection(userID, robotID, password, reactor)
+    conn = ROSConnection(userID, robotID, password, reactor,
+                         config.get('compressedStreams', False))
     env = Environment(reactor, conn, config)
 
     deferred = Deferred()
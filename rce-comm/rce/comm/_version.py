@@ -30,5 +30,40 @@
 #
 #
 
-CURRENT_VERSION = '20130415'
+CURRENT_VERSION = '20261018'
 MINIMAL_VERSION = '20130415'
+
+# Every change of the protocol gets its own version below and CURRENT_VERSION
+# is set to the latest of them; a client only uses the features whose
+# version is not newer than the one of the server.
+
+# Version from which on the wire format can be negotiated
+FORMAT_VERSION = '20261009'
+
+# Version from which on data messages can be batched
+BATCH_VERSION = '20261010'
+
+# Version from which on frames can be compressed
+COMPRESS_VERSION = '20261011'
+
+# Version from which on compact URIs can be used for binary messages
+COMPACT_URI_VERSION = '20261012'
+
+# Version from which on binary messages can be sent in chunks
+CHUNK_VERSION = '20261013'
+
+# Version from which on sessions can be resumed after a reconnect
+SESSION_VERSION = '20261014'
+
+# Version from which on byte arrays of data messages can be sent as binaries
+BINARY_VERSION = '20261015'
+
+# Version from which on times and durations can be sent in the numeric form
+TIME_VERSION = '20261016'
+
+# Version from which on the codec of the binaries can be selected per interface
+CODEC_VERSION = '20261017'
+
+# Version from which on the messages of the forwarders can be compressed as
+# streams
+STREAM_VERSION = '20261018'
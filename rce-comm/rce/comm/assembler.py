@@ -31,8 +31,12 @@
 #
 
 # Python specific imports
-import json
-from datetime import datetime, timedelta
+import mmap
+import struct
+import weakref
+from tempfile import TemporaryFile
+from itertools import count
+from collections import deque
 from uuid import uuid4
 
 try:
@@ -52,6 +56,7 @@ from twisted.python import log
 from twisted.internet.task import LoopingCall
 
 # rce specific imports
+from rce.comm import types
 from rce.comm.error import InvalidRequest
 
 
@@ -60,59 +65,261 @@ class AssemblerError(Exception):
     """
 
 
-def recursiveBinarySearch(multidict):
+def _uuidURI():
+    """ Internally used function to generate a URI for a binary message which
+        is understood by all versions of the protocol.
+    """
+    return uuid4().hex
+
+
+def compactURIGenerator():
+    """ Create a generator of compact URIs for the binary messages of a single
+        connection. The URIs consist of the compact URI marker followed by a
+        monotonically increasing counter.
+
+        @return:                Callable which returns the next URI.
+        @rtype:                 callable
+    """
+    mask = 16 ** (types.COMPACT_URI_LENGTH - 1) - 1
+    fmt = '{0}{{0:0{1}x}}'.format(types.COMPACT_URI_MARKER,
+                                  types.COMPACT_URI_LENGTH - 1)
+    return (fmt.format(i & mask) for i in count()).next
+
+
+def getURILength(msg):
+    """ Get the length of the URI with which the received binary message
+        starts.
+
+        @param msg:             Received binary message.
+        @type  msg:             str
+
+        @return:                Length of the URI.
+        @rtype:                 int
+    """
+    if msg[:1] == types.COMPACT_URI_MARKER:
+        return types.COMPACT_URI_LENGTH
+
+    return types.URI_LENGTH
+
+
+# Header of a chunk of a binary message: sequence number, offset, total size
+_CHUNK_HEADER = struct.Struct('!IQQ')
+
+
+def chunkBinary(uri, data, chunkSize):
+    """ Split binary data into the chunks which are sent as separate binary
+        messages.
+
+        @param uri:             URI which is used to identify the binary data.
+        @type  uri:             str
+
+        @param data:            Binary data which should be split.
+        @type  data:            str
+
+        @param chunkSize:       Maximal size in bytes of the data of a chunk.
+        @type  chunkSize:       int
+
+        @return:                Iterator over the chunk messages where each
+                                chunk message is given as a tuple of strings
+                                which have to be concatenated.
+        @rtype:                 iterator of (str)
+    """
+    size = len(data)
+
+    for seq, offset in enumerate(xrange(0, size, chunkSize)):
+        yield (types.CHUNK_MARKER, uri, _CHUNK_HEADER.pack(seq, offset, size),
+               data[offset:offset + chunkSize])
+
+
+class _PlanMismatch(Exception):
+    """ Internally used exception which is raised when a message does not
+        match the cached traversal plan of its message class.
+    """
+
+
+# Cached traversal plans for the binary search with the message class as key
+_PLANS = {}
+
+
+def _replaceBinary(value, nextURI, uriBinary):
+    """ Internally used function to replace a StringIO instance or a list of
+        StringIO instances with the URIs of the binary messages.
+
+        @return:                URI or list of URIs, or None if the value does
+                                not contain any binaries.
+    """
+    if isinstance(value, (list, tuple)):
+        if not (value and _checkIsStringIO(value[0])):
+            return None
+
+        uris = []
+
+        for e in value:
+            if not _checkIsStringIO(e):
+                raise ValueError('Can not mix binary and string message in '
+                                 'an array.')
+
+            uri = nextURI()
+            uris.append(uri)
+            uriBinary.append((uri, e))
+
+        return uris
+    elif _checkIsStringIO(value):
+        uri = nextURI()
+        uriBinary.append((uri, value))
+        return uri
+
+    return None
+
+
+def _search(multidict, nextURI, uriBinary):
+    """ Internally used function to search a whole JSON message for binaries.
+
+        @return:                JSON message where the binaries have been
+                                replaced with their URIs and the traversal
+                                plan of the message. The message is only
+                                copied if it contains binaries. The plan
+                                contains the keys of each dictionary, as
+                                fields might be missing in a message, and the
+                                entries which have to be visited.
+        @rtype:                 ({ str : ... },
+                                 (frozenset, ((str, tuple / None))))
+    """
+    result = multidict
+    plan = []
+
+    for k, v in multidict.iteritems():
+        if isinstance(v, dict):
+            new, subplan = _search(v, nextURI, uriBinary)
+            plan.append((k, subplan))
+
+            if new is v:
+                continue
+
+            if result is multidict:
+                result = dict(multidict)
+
+            result[k] = new
+        elif isinstance(v, (list, tuple)) or _checkIsStringIO(v):
+            plan.append((k, None))
+            uris = _replaceBinary(v, nextURI, uriBinary)
+
+            if uris is None:
+                continue
+
+            if result is multidict:
+                result = dict(multidict)
+
+            del result[k]
+            result['{0}*'.format(k)] = uris
+
+    return result, (frozenset(multidict), tuple(plan))
+
+
+def _planSearch(multidict, plan, nextURI, uriBinary):
+    """ Internally used function to search a JSON message for binaries where
+        only the subtrees of the traversal plan are visited.
+
+        @return:                JSON message where the binaries have been
+                                replaced with their URIs. The message is only
+                                copied if it contains binaries.
+        @rtype:                 { str : ... }
+
+        @raise:                 _PlanMismatch, if the message does not match
+                                the plan.
+    """
+    keys, entries = plan
+
+    if multidict.viewkeys() != keys:
+        raise _PlanMismatch()
+
+    result = multidict
+
+    for k, subplan in entries:
+        v = multidict[k]
+
+        if subplan:
+            if not isinstance(v, dict):
+                raise _PlanMismatch()
+
+            new = _planSearch(v, subplan, nextURI, uriBinary)
+
+            if new is v:
+                continue
+
+            if result is multidict:
+                result = dict(multidict)
+
+            result[k] = new
+        else:
+            if isinstance(v, dict):
+                raise _PlanMismatch()
+
+            uris = _replaceBinary(v, nextURI, uriBinary)
+
+            if uris is None:
+                continue
+
+            if result is multidict:
+                result = dict(multidict)
+
+            del result[k]
+            result['{0}*'.format(k)] = uris
+
+    return result
+
+
+def recursiveBinarySearch(multidict, nextURI=None, clsName=None):
     """ Search a JSON message for StringIO instances which should be replaced
         with a reference to a binary message. Returns a list of all binary
-        messages and the modified JSON string message.
+        messages and the modified JSON string message. The given message is
+        not modified.
+
+        If a message class is given, the search only visits the subtrees of
+        the message which can contain binaries according to the traversal
+        plan cached for the message class. Messages of the same class are
+        expected to have the same structure, i.e. a field which contains a
+        number or string never contains a binary in another message; messages
+        with other fields than the cached plan are searched completely and
+        replace the plan.
 
         @param multidict:       JSON message which might contain StringIO
                                 instances and which should be prepared for
                                 sending.
         @type  multidict:       { str : ... }
 
+        @param nextURI:         Callable which returns the URI for the next
+                                binary message. If it is omitted a UUID is
+                                used.
+        @type  nextURI:         callable
+
+        @param clsName:         Message class of the JSON message which is
+                                used to cache the traversal plan.
+        @type  clsName:         str
+
         @return:                A list of tuples containing the URI and the
                                 matching StringIO instance. Also the modified
                                 JSON message where the StringIO instances have
                                 been replaced with the URIs is returned.
         @rtype:                 ((str, StringIO), { str : ... })
     """
+    nextURI = nextURI or _uuidURI
     uriBinary = []
-    keys = []
 
-    for k, v in multidict.iteritems():
-        if isinstance(v, dict):
-            uriBinaryPart, multidictPart = recursiveBinarySearch(v)
-            uriBinary += uriBinaryPart
-            multidict[k] = multidictPart
-        elif isinstance(v, (list, tuple)):
-            if v and _checkIsStringIO(v[0]):
-                for e in v:
-                    if not _checkIsStringIO(e):
-                        raise ValueError('Can not mix binary and string '
-                                         'message in an array.')
+    if clsName:
+        plan = _PLANS.get(clsName)
 
-                keys.append(k)
-        elif _checkIsStringIO(v):
-            keys.append(k)
-
-    for k in keys:
-        ele = multidict.pop(k)
-
-        if isinstance(ele, (list, tuple)):
-            uris = []
-
-            for e in ele:
-                tmpURI = uuid4().hex
-                uris.append(tmpURI)
-                uriBinary.append((tmpURI, e))
+        if plan is not None:
+            try:
+                return uriBinary, _planSearch(multidict, plan, nextURI,
+                                              uriBinary)
+            except _PlanMismatch:
+                uriBinary = []
 
-            ele = uris
-        else:
-            tmpURI = uuid4().hex
-            uriBinary.append((tmpURI, ele))
-            ele = tmpURI
+    multidict, plan = _search(multidict, nextURI, uriBinary)
 
-        multidict['{0}*'.format(k)] = ele
+    if clsName:
+        _PLANS[clsName] = plan
 
     return uriBinary, multidict
 
@@ -140,7 +347,13 @@ class _IncompleteMsg(object):
         for uri, msgDict, key in uris:
             self._uris[uri] = (msgDict, key)
 
-        self._added = datetime.now()
+        # Time after which the message is dropped; set by the assembler
+        self.deadline = None
+
+    @property
+    def uris(self):
+        """ URIs of the binaries which are still missing. """
+        return self._uris.keys()
 
     @property
     def msg(self):
@@ -150,12 +363,6 @@ class _IncompleteMsg(object):
 
         return self._msg
 
-    def older(self, timestamp):
-        """ Returns True if this incomplete message is older the the given
-            timestamp.
-        """
-        return self._added < timestamp
-
     def addBinary(self, uri, binaryData):
         """ Add the binary data with the given uri.
 
@@ -168,7 +375,7 @@ class _IncompleteMsg(object):
             parent[key] = binaryData
 
             if self._uris:
-                self._added = datetime.now()
+                self._assembler.refreshIncompleteMessage(self)
             else:
                 self._assembler.forwardCompleteMessage(self)
 
@@ -177,11 +384,134 @@ class _IncompleteMsg(object):
             return False
 
 
+class _IncompleteBinary(object):
+    """ Class which represents a binary which is received in chunks.
+
+        The binary is reassembled either in a preallocated buffer or in a
+        temporary file which is memory mapped when the binary is complete.
+    """
+    def __init__(self, size, inMemory):
+        """ Initialize the incomplete binary.
+
+            @param size:        Total size of the binary in bytes.
+            @type  size:        int
+
+            @param inMemory:    Flag which is True if the binary should be
+                                reassembled in memory and False if it should
+                                be reassembled in a temporary file.
+            @type  inMemory:    bool
+        """
+        self._size = size
+        self._received = 0
+        self._nextSeq = 0
+
+        if inMemory:
+            self._buf = bytearray(size)
+            self._file = None
+        else:
+            self._buf = None
+            self._file = TemporaryFile()
+            self._file.truncate(size)
+
+        # Time after which the binary is dropped; set by the assembler
+        self.deadline = None
+
+    @property
+    def size(self):
+        """ Total size of the binary in bytes. """
+        return self._size
+
+    @property
+    def received(self):
+        """ Number of bytes which have been received. """
+        return self._received
+
+    @property
+    def inMemory(self):
+        """ Flag which is True if the binary is reassembled in memory. """
+        return self._buf is not None
+
+    def addChunk(self, seq, offset, chunk):
+        """ Add a chunk of the binary.
+
+            @param seq:         Sequence number of the chunk.
+            @type  seq:         int
+
+            @param offset:      Offset of the chunk in the binary.
+            @type  offset:      int
+
+            @param chunk:       Data of the chunk.
+            @type  chunk:       buffer
+
+            @return:            True if the binary is complete; False
+                                otherwise.
+            @rtype:             bool
+
+            @raise:             rce.comm.error.InvalidRequest, if the chunk
+                                does not match the binary.
+        """
+        if seq != self._nextSeq:
+            raise InvalidRequest('Expected chunk {0} of binary message, but '
+                                 'received chunk {1}.'.format(self._nextSeq,
+                                                              seq))
+
+        # The chunks have to be contiguous such that a complete binary has no
+        # holes
+        if offset != self._received:
+            raise InvalidRequest('Expected chunk of binary message at offset '
+                                 '{0}, but received chunk at offset '
+                                 '{1}.'.format(self._received, offset))
+
+        end = offset + len(chunk)
+
+        if end > self._size:
+            raise InvalidRequest('Chunk exceeds the size of the binary '
+                                 'message.')
+
+        if self._buf is not None:
+            self._buf[offset:end] = chunk
+        else:
+            self._file.seek(offset)
+            self._file.write(chunk)
+
+        self._nextSeq += 1
+        self._received += len(chunk)
+        return self._received == self._size
+
+    def getBinary(self):
+        """ Get the complete binary.
+
+            @return:            Binary data which has been received.
+            @rtype:             StringIO
+        """
+        if self._buf is not None:
+            data = buffer(self._buf)
+        else:
+            self._file.flush()
+            data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._file.close()
+
+        self._buf = self._file = None
+        return StringIO(data)
+
+    def discard(self):
+        """ Discard the incomplete binary.
+        """
+        if self._file:
+            self._file.close()
+
+        self._buf = self._file = None
+
+
 class MessageAssembler(object):
     """ Class which is used to store incomplete messages for a certain time
         and which is used to assemble them when possible.
     """
-    def __init__(self, protocol, timeout):
+    # CONFIG
+    # Maximum size in bytes of a binary which is received in chunks
+    MAX_CHUNKED_SIZE = 2 ** 31
+
+    def __init__(self, protocol, timeout, codec, maxMemory=0, progress=None):
         """ Initialize the binary assembler.
 
             @param protocol:    Protocol instance for which this assembler is
@@ -190,19 +520,104 @@ class MessageAssembler(object):
             @param timeout:     Timeout in seconds after which incomplete
                                 message parts are removed.
             @type  timeout:     int
+
+            @param codec:       JSON codec which is used to decode the
+                                received string messages.
+            @type  codec:       rce.comm.interfaces.IJSONCodec
+
+            @param maxMemory:   Maximum number of bytes which are used to
+                                reassemble binaries which are received in
+                                chunks. Binaries which do not fit are
+                                reassembled in temporary files.
+            @type  maxMemory:   int
+
+            @param progress:    Callable which is called with the URI, the
+                                number of received bytes and the total size
+                                of a binary whenever a chunk of the binary
+                                has been received.
+            @type  progress:    callable
         """
         self._protocol = protocol
         self._timeout = timeout
+        self._codec = codec
+        self._maxMemory = maxMemory
+        self._progress = progress
 
         # Set of _IncompleteMessage instances
         self._incompleteMsgs = set()
 
-        # Dictionary with binary UID as key and the binary as value
+        # Dictionary with binary UID as key and the _IncompleteMessage
+        # instance which is waiting for the binary as value
+        self._uriIndex = {}
+
+        # Dictionary with binary UID as key and the tuple (binary, deadline)
+        # as value
         self._binaries = {}
 
+        # Dictionary with binary UID as key and the _IncompleteBinary instance
+        # which reassembles the chunks of the binary as value
+        self._chunked = {}
+        self._chunkedMemory = 0
+
+        # Queues of (deadline, weak reference to _IncompleteMessage) and
+        # (deadline, binary UID) tuples ordered by their deadline. Since all
+        # entries use the same timeout, appending keeps the queues sorted and
+        # refreshed or completed entries are skipped when they are popped.
+        self._msgDeadlines = deque()
+        self._binaryDeadlines = deque()
+
+        # Counters of the incomplete messages and binaries which have been
+        # dropped since the assembler was created
+        self._expiredMessages = 0
+        self._expiredBinaries = 0
+
         # Setup repeated calling of the clean up method
         self._cleaner = LoopingCall(self._cleanUp)
 
+    @property
+    def pendingMessages(self):
+        """ Number of incomplete messages which wait for binary data. """
+        return len(self._incompleteMsgs)
+
+    @property
+    def orphanBinaries(self):
+        """ Number of binaries which wait for their string message. """
+        return len(self._binaries)
+
+    @property
+    def incompleteBinaries(self):
+        """ Number of binaries which are received in chunks. """
+        return len(self._chunked)
+
+    @property
+    def chunkedMemory(self):
+        """ Number of bytes which are used to reassemble binaries in memory. """
+        return self._chunkedMemory
+
+    @property
+    def expiredMessages(self):
+        """ Number of incomplete messages which have been dropped. """
+        return self._expiredMessages
+
+    @property
+    def expiredBinaries(self):
+        """ Number of unused binaries which have been dropped. """
+        return self._expiredBinaries
+
+    def _getDeadline(self):
+        """ Internally used method to get the time after which a newly added
+            incomplete message or binary should be dropped.
+        """
+        return self._cleaner.clock.seconds() + self._timeout
+
+    def refreshIncompleteMessage(self, msgRepr):
+        """ Callback for client.assembler._IncompleteMsg to reset the time
+            after which the incomplete message is dropped.
+        """
+        deadline = self._getDeadline()
+        msgRepr.deadline = deadline
+        self._msgDeadlines.append((deadline, weakref.ref(msgRepr)))
+
     def forwardCompleteMessage(self, msgRepr):
         """ Callback for client.assembler._IncompleteMsg to send a completed
             message to the correct handler.
@@ -210,6 +625,26 @@ class MessageAssembler(object):
         self._incompleteMsgs.remove(msgRepr)
         self._protocol.processCompleteMessage(msgRepr.msg)
 
+    def _addIncompleteMsg(self, msgRepr):
+        """ Internally used method to store an incomplete message and to
+            register all its missing URIs in the index.
+        """
+        self._incompleteMsgs.add(msgRepr)
+
+        for uri in msgRepr.uris:
+            self._uriIndex[uri] = msgRepr
+
+        self.refreshIncompleteMessage(msgRepr)
+
+    def _removeIncompleteMsg(self, msgRepr):
+        """ Internally used method to drop an incomplete message and to
+            remove all its missing URIs from the index.
+        """
+        self._incompleteMsgs.remove(msgRepr)
+
+        for uri in msgRepr.uris:
+            self._uriIndex.pop(uri, None)
+
     def _handleString(self, msg, uris):
         """ Try to process the received incomplete string message, i.e.
             assemble the message with the waiting binary data. Forward the
@@ -234,7 +669,7 @@ class MessageAssembler(object):
                 missing.append(ref)
 
         if missing:
-            self._incompleteMsgs.add(_IncompleteMsg(self, msg, missing))
+            self._addIncompleteMsg(_IncompleteMsg(self, msg, missing))
         else:
             self._protocol.processCompleteMessage(msg)
 
@@ -247,15 +682,99 @@ class MessageAssembler(object):
             @param msg:     Received binary message.
             @type  msg:     str
         """
-        uri = msg[:32]
-        binaryData = StringIO()
-        binaryData.write(msg[32:])
+        if msg[:1] == types.CHUNK_MARKER:
+            self._handleChunk(msg)
+            return
+
+        length = getURILength(msg)
+
+        # Wrap the payload without copying it; the StringIO instance keeps a
+        # reference to the received message
+        self._addBinary(msg[:length], StringIO(buffer(msg, length)))
+
+    def _handleChunk(self, msg):
+        """ Process a received chunk of a binary message, i.e. add the chunk
+            to the reassembled binary and process the binary if it is
+            complete.
+
+            @param msg:     Received chunk of a binary message.
+            @type  msg:     str
+        """
+        length = getURILength(msg[1:2])
+        uri = msg[1:1 + length]
+        start = 1 + length + _CHUNK_HEADER.size
 
-        for msg in self._incompleteMsgs:
-            if msg.addBinary(uri, binaryData):
-                break
+        if len(msg) < start:
+            raise InvalidRequest('Chunk of binary message is missing its '
+                                 'header.')
+
+        seq, offset, size = _CHUNK_HEADER.unpack_from(msg, 1 + length)
+        binary = self._chunked.get(uri)
+
+        if binary:
+            if size != binary.size:
+                self._removeChunked(uri)
+                raise InvalidRequest('Size of the chunk header does not match '
+                                     'the size of the binary message.')
         else:
-            self._binaries[uri] = (binaryData, datetime.now())
+            if size > self.MAX_CHUNKED_SIZE:
+                raise InvalidRequest('Binary message of {0} bytes exceeds the '
+                                     'maximum size of {1} bytes.'.format(
+                                         size, self.MAX_CHUNKED_SIZE))
+
+            inMemory = self._chunkedMemory + size <= self._maxMemory
+            binary = _IncompleteBinary(size, inMemory)
+            self._chunked[uri] = binary
+
+            if inMemory:
+                self._chunkedMemory += size
+
+        try:
+            complete = binary.addChunk(seq, offset, buffer(msg, start))
+        except InvalidRequest:
+            self._removeChunked(uri)
+            raise
+
+        if self._progress:
+            self._progress(uri, binary.received, size)
+
+        if complete:
+            self._removeChunked(uri)
+            self._addBinary(uri, binary.getBinary())
+        else:
+            deadline = self._getDeadline()
+            binary.deadline = deadline
+            self._binaryDeadlines.append((deadline, uri))
+
+    def _removeChunked(self, uri):
+        """ Internally used method to remove a binary which is received in
+            chunks from the assembler.
+        """
+        binary = self._chunked.pop(uri)
+
+        if binary.inMemory:
+            self._chunkedMemory -= binary.size
+
+        return binary
+
+    def _addBinary(self, uri, binaryData):
+        """ Internally used method to assemble the waiting string message with
+            the received binary data or to store the binary data otherwise.
+
+            @param uri:         URI which is used to identify the binary data.
+            @type  uri:         str
+
+            @param binaryData:  Received binary data.
+            @type  binaryData:  StringIO
+        """
+        msgRepr = self._uriIndex.pop(uri, None)
+
+        if msgRepr:
+            msgRepr.addBinary(uri, binaryData)
+        else:
+            deadline = self._getDeadline()
+            self._binaries[uri] = (binaryData, deadline)
+            self._binaryDeadlines.append((deadline, uri))
 
     def _recursiveURISearch(self, multidict):
         """ Internally used method to find binary data in incoming messages.
@@ -294,7 +813,7 @@ class MessageAssembler(object):
             self._handleBinary(msg)
         else:
             try:
-                msg = json.loads(msg)
+                msg = self._codec.loads(msg)
             except ValueError:
                 raise InvalidRequest('Message is not in valid JSON format.')
 
@@ -315,6 +834,16 @@ class MessageAssembler(object):
             references.
         """
         self._incompleteMsgs = set()
+        self._uriIndex = {}
+        self._binaries = {}
+        self._msgDeadlines = deque()
+        self._binaryDeadlines = deque()
+
+        for binary in self._chunked.itervalues():
+            binary.discard()
+
+        self._chunked = {}
+        self._chunkedMemory = 0
 
         if self._cleaner.running:
             self._cleaner.stop()
@@ -322,23 +851,44 @@ class MessageAssembler(object):
     def _cleanUp(self):
         """ Internally used method to remove old incomplete messages.
         """
-        limit = datetime.now() - timedelta(seconds=self._timeout)
+        now = self._cleaner.clock.seconds()
+
+        queue = self._msgDeadlines
+        dropped = 0
 
-        toClean = [msg for msg in self._incompleteMsgs if msg.older(limit)]
+        while queue and queue[0][0] <= now:
+            deadline, ref = queue.popleft()
+            msgRepr = ref()
 
-        if toClean:
-            for msg in toClean:
-                self._incompleteMsgs.remove(msg)
+            if (msgRepr in self._incompleteMsgs and
+                msgRepr.deadline == deadline):
+                self._removeIncompleteMsg(msgRepr)
+                dropped += 1
 
+        if dropped:
+            self._expiredMessages += dropped
             log.msg('{0} incomplete messages have been dropped '
-                    'from assembler.'.format(len(toClean)))
+                    'from assembler.'.format(dropped))
+
+        queue = self._binaryDeadlines
+        dropped = 0
 
-        toClean = [uri for uri, (_, timestamp) in self._binaries.iteritems()
-                   if timestamp < limit]
+        while queue and queue[0][0] <= now:
+            deadline, uri = queue.popleft()
+            binary = self._binaries.get(uri)
 
-        if toClean:
-            for uri in toClean:
+            if binary and binary[1] == deadline:
                 del self._binaries[uri]
+                dropped += 1
+                continue
+
+            binary = self._chunked.get(uri)
+
+            if binary and binary.deadline == deadline:
+                self._removeChunked(uri).discard()
+                dropped += 1
 
+        if dropped:
+            self._expiredBinaries += dropped
             log.msg('{0} unused binaries have been dropped '
-                    'from assembler.'.format(len(toClean)))
+                    'from assembler.'.format(dropped))
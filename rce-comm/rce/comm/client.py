@@ -50,9 +50,15 @@ from autobahn.websocket import connectWS, WebSocketClientFactory, \
 
 # rce specific imports
 from rce.comm import types
-from rce.comm._version import CURRENT_VERSION
-from rce.comm.interfaces import IRobot, IMessageReceiver
-from rce.comm.assembler import recursiveBinarySearch, MessageAssembler
+from rce.comm._version import CURRENT_VERSION, FORMAT_VERSION, \
+    BATCH_VERSION, COMPRESS_VERSION, COMPACT_URI_VERSION, CHUNK_VERSION, \
+    SESSION_VERSION, BINARY_VERSION, TIME_VERSION, CODEC_VERSION, \
+    STREAM_VERSION
+from rce.comm.codec import getCodec, getWireCodec
+from rce.comm.compression import FrameCompressor, decompressFrame
+from rce.comm.interfaces import IRobot, IMessageReceiver, IJSONCodec
+from rce.comm.assembler import recursiveBinarySearch, compactURIGenerator, \
+    chunkBinary, MessageAssembler
 from rce.util.interface import verifyObject
 
 
@@ -60,15 +66,50 @@ class RCERobotProtocol(WebSocketClientProtocol):
     """ WebSocket client protocol which is used to communicate with the Robot
         Manager.
     """
-    def __init__(self, conn):
+    def __init__(self, conn, codec, wireCodec, compressor, compactURIs,
+                 chunkSize, chunkMemory):
         """ Initialize the protocol.
 
             @param conn:        Connection instance which provides callback
                                 functions.
             @type  conn:        rce.comm.client.RCE
+
+            @param codec:       JSON codec which is used to encode and decode
+                                the string messages.
+            @type  codec:       rce.comm.interfaces.IJSONCodec
+
+            @param wireCodec:   Codec of the negotiated wire format which
+                                carries the binaries inline or None, if the
+                                JSON wire format is used.
+            @type  wireCodec:   rce.comm.interfaces.IJSONCodec
+
+            @param compressor:  Compressor which is used for the outgoing
+                                frames or None, if the frames should not be
+                                compressed.
+            @type  compressor:  rce.comm.compression.FrameCompressor
+
+            @param compactURIs: Flag which is True if compact URIs should be
+                                used for the binary messages.
+            @type  compactURIs: bool
+
+            @param chunkSize:   Size in bytes of the chunks into which larger
+                                binaries are split or 0, if the binaries
+                                should not be split.
+            @type  chunkSize:   int
+
+            @param chunkMemory: Maximum number of bytes which are used to
+                                reassemble binaries which are received in
+                                chunks before temporary files are used.
+            @type  chunkMemory: int
         """
         self._connection = conn
-        self._assembler = MessageAssembler(self, 60)
+        self._codec = codec
+        self._wireCodec = wireCodec
+        self._compressor = compressor
+        self._nextURI = compactURIGenerator() if compactURIs else None
+        self._chunkSize = chunkSize
+        self._assembler = MessageAssembler(self, 60, codec, chunkMemory,
+                                           conn.receivedProgress)
         self._registered = False
 
     def onOpen(self):
@@ -83,7 +124,12 @@ class RCERobotProtocol(WebSocketClientProtocol):
         """ This method is called by twisted when a new message has been
             received.
         """
-        self._assembler.processMessage(msg, binary)
+        msg, binary = decompressFrame(msg, binary)
+
+        if self._wireCodec:
+            self.processCompleteMessage(self._wireCodec.loads(msg))
+        else:
+            self._assembler.processMessage(msg, binary)
 
     def processCompleteMessage(self, msg):
         """ Callback for MessageAssembler which will be called as soon as a
@@ -91,25 +137,104 @@ class RCERobotProtocol(WebSocketClientProtocol):
         """
         self._connection.receivedMessage(msg)
 
-    def sendMessage(self, msg):
+    def sendMessage(self, msg, compress=True, clsName=None):
         """ Internally used method to send messages via RCERobotProtocol.
 
             @param msg:         Message which should be sent.
+
+            @param compress:    Flag which is True if the frames of the
+                                message may be compressed.
+            @type  compress:    bool
+
+            @param clsName:     Message class of the contained ROS message,
+                                if the message is a data message.
+            @type  clsName:     str
         """
         def send(msg):
-            binaries, jsonMsg = recursiveBinarySearch(msg)
+            if self._wireCodec:
+                self._sendFrame(self._wireCodec.dumps(msg), True, compress)
+                return
 
-            WebSocketClientProtocol.sendMessage(self, json.dumps(jsonMsg))
+            binaries, jsonMsg = recursiveBinarySearch(msg, self._nextURI,
+                                                      clsName)
 
-            for data in binaries:
-                msg = data[0] + data[1].getvalue()
-                WebSocketClientProtocol.sendMessage(self, msg, binary=True)
+            self._sendFrame(self._codec.dumps(jsonMsg), False, compress)
+
+            for uri, binary in binaries:
+                self._sendBinary(uri, binary, compress)
 
         if isInIOThread():
             send(msg)
         else:
             self._connection.reactor.callFromThread(send, msg)
 
+    def _sendFrame(self, msg, binary, compress):
+        """ Internally used method to send a single frame which is compressed
+            if a compressor is used.
+
+            @param msg:         Frame which should be sent.
+            @type  msg:         str
+
+            @param binary:      Flag which is True if the frame is a binary
+                                frame.
+            @type  binary:      bool
+
+            @param compress:    Flag which is True if the frame may be
+                                compressed.
+            @type  compress:    bool
+        """
+        if compress and self._compressor:
+            chunks = self._compressor.compress((msg,), binary)
+
+            if chunks:
+                self._sendChunks(chunks)
+                return
+
+        WebSocketClientProtocol.sendMessage(self, msg, binary=binary)
+
+    def _sendBinary(self, uri, binary, compress):
+        """ Internally used method to send a binary message without copying
+            the binary data to prepend the URI. Binaries which are larger than
+            the chunk size are sent as several chunked binary messages.
+
+            @param uri:         URI which is used to identify the binary data.
+            @type  uri:         str
+
+            @param binary:      Binary data which should be sent.
+            @type  binary:      StringIO
+
+            @param compress:    Flag which is True if the frames may be
+                                compressed.
+            @type  compress:    bool
+        """
+        data = binary.getvalue()
+
+        if self._chunkSize and len(data) > self._chunkSize:
+            messages = chunkBinary(uri, data, self._chunkSize)
+        else:
+            messages = ((uri, data),)
+
+        for chunks in messages:
+            if compress and self._compressor:
+                chunks = self._compressor.compress(chunks, True) or chunks
+
+            self._sendChunks(chunks)
+
+    def _sendChunks(self, chunks):
+        """ Internally used method to send a binary frame which is written as
+            separate chunks.
+
+            @param chunks:      Chunks of the binary frame.
+            @type  chunks:      [str]
+        """
+        self.beginMessage(self.MESSAGE_TYPE_BINARY)
+        self.beginMessageFrame(sum(len(chunk) for chunk in chunks))
+
+        for chunk in chunks:
+            self.sendMessageFrameData(chunk)
+
+        self.endMessage()
+
     def onClose(self, *args):
         """ This method is called by twisted when the connection has been
             closed.
@@ -131,7 +256,9 @@ class RCERobotFactory(WebSocketClientFactory):
     """ WebSocket protocol factory which is used for the communication with the
         Robot Manager.
     """
-    def __init__(self, url, conn):
+    def __init__(self, url, conn, codec=None, wireFormat=types.FORMAT_JSON,
+                 compressThreshold=None, compactURIs=False, chunkSize=0,
+                 chunkMemory=0):
         """ Initialize the factory.
 
             @param url:         URL of the Robot process.
@@ -140,15 +267,59 @@ class RCERobotFactory(WebSocketClientFactory):
             @param conn:        Connection instance which provides callback
                                 functions.
             @type  conn:        rce.comm.client.RCE
+
+            @param codec:       Name of the JSON codec which should be used
+                                for the connection. If no name is given, the
+                                'json' module of the standard library is
+                                used.
+            @type  codec:       str
+
+            @param wireFormat:  Wire format which was requested in the URL of
+                                the Robot process.
+            @type  wireFormat:  str
+
+            @param compressThreshold:   Minimal size in bytes of an outgoing
+                                        frame which is compressed or None, if
+                                        the outgoing frames should not be
+                                        compressed.
+            @type  compressThreshold:   int
+
+            @param compactURIs: Flag which is True if compact URIs were
+                                requested in the URL of the Robot process.
+            @type  compactURIs: bool
+
+            @param chunkSize:   Size in bytes of the chunks into which larger
+                                outgoing binaries are split or 0, if the
+                                binaries should not be split.
+            @type  chunkSize:   int
+
+            @param chunkMemory: Maximum number of bytes which are used to
+                                reassemble binaries which are received in
+                                chunks before temporary files are used.
+            @type  chunkMemory: int
         """
         WebSocketClientFactory.__init__(self, url)
         self._connection = conn
+        self._codec = getCodec(codec)
+        self._wireCodec = getWireCodec(wireFormat)
+        self._compressThreshold = compressThreshold
+        self._compactURIs = compactURIs
+        self._chunkSize = chunkSize
+        self._chunkMemory = chunkMemory
+        verifyObject(IJSONCodec, self._codec)
 
     def buildProtocol(self, addr):
         """ This method is called by twisted when a new connection should be
             made.
         """
-        p = RCERobotProtocol(self._connection)
+        if self._compressThreshold is None:
+            compressor = None
+        else:
+            compressor = FrameCompressor(self._compressThreshold)
+
+        p = RCERobotProtocol(self._connection, self._codec, self._wireCodec,
+                             compressor, self._compactURIs, self._chunkSize,
+                             self._chunkMemory)
         p.factory = self
         return p
 
@@ -168,7 +339,25 @@ class RCE(object):
     _SUFFIXES = ['Interface', 'Converter', 'Forwarder']
     _INTERFACES = [''.join(t) for t in itertools.product(_PREFIXES, _SUFFIXES)]
 
-    def __init__(self, receiver, userID, robotID, password, reactor):
+    # Keys of the parts of a 'ConfigureComponent' request in the order of the
+    # arguments of the matching methods
+    _COMPONENT_KEYS = {
+        'addNodes' : ('containerTag', 'nodeTag', 'pkg', 'exe', 'args', 'name',
+                      'namespace'),
+        'removeNodes' : ('containerTag', 'nodeTag'),
+        'addInterfaces' : ('endpointTag', 'interfaceTag', 'interfaceType',
+                           'className', 'addr'),
+        'removeInterfaces' : ('endpointTag', 'interfaceTag'),
+        'setParam' : ('containerTag', 'name', 'value'),
+        'deleteParam' : ('containerTag', 'name')
+    }
+
+    def __init__(self, receiver, userID, robotID, password, reactor,
+                 wireFormat=types.FORMAT_JSON, batching=False, unbatched=(),
+                 compressThreshold=None, uncompressed=(), chunkSize=0,
+                 chunkMemory=2**26, progress=None, resumable=False,
+                 listed=(), numericTime=False, codecs=None,
+                 compressedStreams=False):
         """ Initialize the Connection.
 
             @param receiver:    Object which is responsible for the processing
@@ -190,14 +379,116 @@ class RCE(object):
             @param reactor:     Reference to reactor which is used for this
                                 connection.
             @type  reactor:     twisted::reactor
+
+            @param wireFormat:  Wire format which should be requested for the
+                                WebSocket connection. Falls back to JSON if
+                                the cloud engine does not support the
+                                negotiation of the wire format.
+            @type  wireFormat:  str
+
+            @param batching:    Flag which is True if the cloud engine should
+                                batch the data messages which are sent to the
+                                robot.
+            @type  batching:    bool
+
+            @param unbatched:   Tags of the interfaces whose data messages
+                                should never be batched, i.e. latency
+                                sensitive interfaces.
+            @type  unbatched:   [str]
+
+            @param compressThreshold:   Minimal size in bytes of a frame which
+                                        should be compressed or None, if the
+                                        frames should not be compressed. The
+                                        cloud engine uses its own threshold
+                                        for the frames sent to the robot.
+            @type  compressThreshold:   int
+
+            @param uncompressed:    Tags of the interfaces whose data messages
+                                    should never be compressed, i.e.
+                                    interfaces which carry already compressed
+                                    data as PNG or JPEG images.
+            @type  uncompressed:    [str]
+
+            @param chunkSize:   Size in bytes of the chunks into which larger
+                                binaries should be split or 0, if the binaries
+                                should not be split. The cloud engine uses its
+                                own chunk size for the binaries sent to the
+                                robot.
+            @type  chunkSize:   int
+
+            @param chunkMemory: Maximum number of bytes which are used to
+                                reassemble binaries which are received in
+                                chunks before temporary files are used.
+            @type  chunkMemory: int
+
+            @param progress:    Callable which is called with the URI, the
+                                number of received bytes and the total size
+                                of a binary whenever a chunk of the binary
+                                has been received.
+            @type  progress:    callable
+
+            @param resumable:   Flag which is True if the session should be
+                                resumable, i.e. the containers, interfaces and
+                                connections of the robot are kept by the cloud
+                                engine for a short time after the connection
+                                has been lost. Use 'resume' to reconnect.
+            @type  resumable:   bool
+
+            @param listed:      Tags of the interfaces whose byte arrays, i.e.
+                                uint8[] fields, should be received as lists of
+                                integers instead of binaries.
+            @type  listed:      [str]
+
+            @param numericTime: Flag which is True if times and durations
+                                should be received in the numeric form, i.e.
+                                as dictionaries with the keys 'secs' and
+                                'nsecs', instead of as ISO 8601 strings and
+                                floats.
+            @type  numericTime: bool
+
+            @param codecs:      Codecs which should be used by the cloud
+                                engine to encode the binaries, e.g. images,
+                                of the interfaces; either the name of the
+                                codec, e.g. 'png', 'jpeg', 'webp' or 'raw' for
+                                images, 'columnar' or 'quantized' for point
+                                clouds and 'delta' or 'rle' for occupancy
+                                grids, or a tuple of the name and the quality
+                                from 1 to 100 for each interface tag.
+            @type  codecs:      { str : str / (str, int) }
+
+            @param compressedStreams:   Flag which is True if the serialized
+                                        ROS messages of the forwarders should
+                                        be compressed as one stream per
+                                        interface in both directions. Refer
+                                        to 'streamEpoch' for the messages
+                                        which are sent to the cloud engine.
+            @type  compressedStreams:   bool
         """
         verifyObject(IMessageReceiver, receiver)
+        getWireCodec(wireFormat)
 
         self._receiver = receiver
         self._userID = userID
         self._robotID = robotID
         self._password = sha256(password).hexdigest()
         self._reactor = reactor
+        self._wireFormat = wireFormat
+        self._batching = batching
+        self._unbatched = unbatched
+        self._compressThreshold = compressThreshold
+        self._uncompressed = set(uncompressed)
+        self._chunkSize = chunkSize
+        self._chunkMemory = chunkMemory
+        self._progress = progress
+        self._resumable = resumable
+        self._listed = listed
+        self._numericTime = numericTime
+        self._codecs = codecs or {}
+        self._compressedStreams = compressedStreams
+        self._streamed = False
+        self._registered = 0
+        self._session = None
+        self._robotResp = None
         self._conn = None
         self._connectedDeferred = None
 
@@ -206,6 +497,20 @@ class RCE(object):
         """ Reference to twisted::reactor. """
         return self._reactor
 
+    @property
+    def session(self):
+        """ Token of the current session or None, if there is none. """
+        return self._session
+
+    @property
+    def streamEpoch(self):
+        """ Epoch of the compressed streams of the forwarders or None, if the
+            messages of the forwarders should be compressed on their own. The
+            epoch changes with every new connection, since messages might
+            have been lost, and the streams have to be reset.
+        """
+        return self._registered if self._streamed else None
+
     def registerConnection(self, conn):
         """ Callback for RCERobotProtocol.
 
@@ -216,6 +521,7 @@ class RCE(object):
             raise ConnectionError('There is already a connection registered.')
 
         self._conn = conn
+        self._registered += 1
         print('Connection to RCE established.')
 
         if self._connectedDeferred:
@@ -263,6 +569,7 @@ class RCE(object):
         """ Internally used method to connect to the Robot process.
         """
         # Read the response
+        self._robotResp = resp
         url = resp['url']
         current = resp.get('current', None)
 
@@ -272,10 +579,105 @@ class RCE(object):
 
         print('Connect to Robot Process on: {0}'.format(url))
 
+        # Select the wire format
+        wireFormat = self._wireFormat
+
+        if (wireFormat != types.FORMAT_JSON and current and
+            current < FORMAT_VERSION):
+            print("Warning: Wire format '{0}' is not supported by the cloud "
+                  'engine. Fall back to JSON.'.format(wireFormat))
+            wireFormat = types.FORMAT_JSON
+
         # Make WebSocket connection to Robot Manager
-        args = urlencode((('userID', self._userID), ('robotID', self._robotID),
-                          ('password', self._password)))
-        factory = RCERobotFactory('{0}?{1}'.format(url, args), self)
+        args = [('userID', self._userID), ('robotID', self._robotID),
+                ('password', self._password)]
+
+        if wireFormat != types.FORMAT_JSON:
+            args.append(('format', wireFormat))
+
+        if self._batching:
+            if current and current < BATCH_VERSION:
+                print('Warning: Batching of data messages is not supported by '
+                      'the cloud engine.')
+            else:
+                args.append(('batch', '1'))
+                args += [('unbatched', iTag) for iTag in self._unbatched]
+
+        compressThreshold = self._compressThreshold
+
+        if compressThreshold is not None:
+            if current and current < COMPRESS_VERSION:
+                print('Warning: Compression of frames is not supported by the '
+                      'cloud engine.')
+                compressThreshold = None
+            else:
+                args.append(('compress', '1'))
+                args += [('uncompressed', iTag)
+                         for iTag in self._uncompressed]
+
+        # Use compact URIs for the binary messages if they are supported
+        compactURIs = not (current and current < COMPACT_URI_VERSION)
+
+        if compactURIs:
+            args.append(('compact', '1'))
+
+        # Receive and send chunked binaries if they are supported
+        chunkSize = self._chunkSize
+
+        if current and current < CHUNK_VERSION:
+            chunkSize = 0
+        else:
+            args.append(('chunked', '1'))
+
+        if self._resumable:
+            if current and current < SESSION_VERSION:
+                print('Warning: Resumable sessions are not supported by the '
+                      'cloud engine.')
+            else:
+                args.append(('resumable', '1'))
+
+                if self._session:
+                    args.append(('session', self._session))
+
+        # Receive the byte arrays as binaries if they are supported
+        if not (current and current < BINARY_VERSION):
+            args.append(('binary', '1'))
+            args += [('listed', iTag) for iTag in self._listed]
+
+        if self._numericTime:
+            if current and current < TIME_VERSION:
+                print('Warning: Numeric times are not supported by the cloud '
+                      'engine.')
+            else:
+                args.append(('time', 'numeric'))
+
+        if self._codecs:
+            if current and current < CODEC_VERSION:
+                print('Warning: Codecs are not supported by the cloud '
+                      'engine.')
+            else:
+                for iTag, codec in self._codecs.iteritems():
+                    if isinstance(codec, basestring):
+                        codec = (codec,)
+
+                    args.append(('codec', ':'.join([iTag] + map(str, codec))))
+
+        self._streamed = False
+
+        if self._compressedStreams:
+            if current and current < STREAM_VERSION:
+                print('Warning: Compressed streams are not supported by the '
+                      'cloud engine.')
+            else:
+                args.append(('stream', '1'))
+                self._streamed = True
+
+        factory = RCERobotFactory('{0}?{1}'.format(url, urlencode(args)), self,
+                                  wireFormat=wireFormat,
+                                  compressThreshold=compressThreshold,
+                                  compactURIs=compactURIs,
+                                  chunkSize=chunkSize,
+                                  chunkMemory=self._chunkMemory)
         connectWS(factory)
 
     def connect(self, masterUrl, deferred):
@@ -305,24 +707,56 @@ class RCE(object):
         d.addCallback(self._robotConnect)
         d.addErrback(eb)
 
+    def resume(self, deferred):
+        """ Reconnect to the Robot process of the last connection and resume
+            the session. If the session has expired in the meantime, a new
+            session is started and the containers, interfaces and connections
+            of the robot have to be recreated.
+
+            @param deferred:    Deferred which is called as soon as the
+                                connection was successfully established.
+            @type  deferred:    twisted.internet.defer.Deferred
+
+            @raise:             ConnectionError, if there is no session which
+                                could be resumed.
+        """
+        if not (self._session and self._robotResp):
+            raise ConnectionError('There is no session which could be '
+                                  'resumed.')
+
+        if self._conn:
+            raise ConnectionError('There is already a connection registered.')
+
+        self._connectedDeferred = deferred
+        self._robotConnect(self._robotResp)
+
     def close(self):
         """ Disconnect from RCE.
         """
         if self._conn:
             self._conn.dropConnection()
 
-    def _sendMessage(self, msgType, msgData):
+    def _sendMessage(self, msgType, msgData, compress=True, clsName=None):
         """ Internally used method to send messages via RCERobotProtocol.
 
             @param msgType:     String describing the type of the message.
             @type  msgType:     str
 
             @param msgData:     Message which should be sent.
+
+            @param compress:    Flag which is True if the frames of the
+                                message may be compressed.
+            @type  compress:    bool
+
+            @param clsName:     Message class of the contained ROS message,
+                                if the message is a data message.
+            @type  clsName:     str
         """
         if not self._conn:
             raise ConnectionError('No connection registered.')
 
-        self._conn.sendMessage({'type':msgType, 'data':msgData})
+        self._conn.sendMessage({'type':msgType, 'data':msgData}, compress,
+                               clsName)
 
     def sendMessage(self, dest, msgType, msg, msgID):
         """ Send a data message to the cloud engine.
@@ -345,7 +779,8 @@ class RCE(object):
             @type  msgID:       str
         """
         self._sendMessage(types.DATA_MESSAGE, {'iTag':dest, 'type':msgType,
-                                               'msgID':msgID, 'msg':msg})
+                                               'msgID':msgID, 'msg':msg},
+                          dest not in self._uncompressed, msgType)
 
     def createContainer(self, cTag):
         """ Create a container.
@@ -525,6 +960,40 @@ class RCE(object):
         self._sendMessage(types.CONFIGURE_COMPONENT,
                           {'removeInterfaces':[iface]})
 
+    def configureComponent(self, config):
+        """ Add and remove multiple nodes, interfaces and parameters in a
+            single request.
+
+            @param config:      Dictionary which can contain the keys
+                                'addNodes', 'removeNodes', 'addInterfaces',
+                                'removeInterfaces', 'setParam' and
+                                'deleteParam'. The values are lists of tuples
+                                containing the arguments for the methods
+                                addNode, removeNode, addInterface,
+                                removeInterface, addParameter and
+                                removeParameter, respectively.
+            @type  config:      { str : [ tuple ] }
+        """
+        data = {}
+
+        for key, elements in config.iteritems():
+            try:
+                keys = self._COMPONENT_KEYS[key]
+            except KeyError:
+                raise TypeError("Invalid key '{0}' in configuration of "
+                                'components.'.format(key))
+
+            if key == 'addInterfaces':
+                for element in elements:
+                    if element[2] not in self._INTERFACES:
+                        raise TypeError('Interface type is not valid.')
+
+            data[key] = [dict(zip(keys, element)) for element in elements]
+
+        print('Request configuration of {0} components.'.format(
+                  sum(len(elements) for elements in data.itervalues())))
+        self._sendMessage(types.CONFIGURE_COMPONENT, data)
+
     def addConnection(self, tagA, tagB):
         """ Create a connection.
 
@@ -551,6 +1020,21 @@ class RCE(object):
         conn = {'tagA':tagA, 'tagB':tagB}
         self._sendMessage(types.CONFIGURE_CONNECTION, {'disconnect':[conn]})
 
+    def receivedProgress(self, uri, received, size):
+        """ Callback from RCERobotProtocol.
+
+            @param uri:         URI of the binary which is received in chunks.
+            @type  uri:         str
+
+            @param received:    Number of bytes which have been received.
+            @type  received:    int
+
+            @param size:        Total size of the binary in bytes.
+            @type  size:        int
+        """
+        if self._progress:
+            self._progress(uri, received, size)
+
     def receivedMessage(self, msg):
         """ Callback from RCERobotProtocol.
 
@@ -566,6 +1050,15 @@ class RCE(object):
 
         if msgType == types.ERROR:
             print('Received error message: {0}'.format(data))
+        elif msgType == types.SESSION:
+            if self._session and not data['resumed']:
+                print('Warning: Session could not be resumed. The containers, '
+                      'interfaces and connections have to be recreated.')
+
+            self._session = data['session']
+        elif msgType == types.BATCH:
+            for msg in data:
+                self.receivedMessage(msg)
 #        elif msgType == types.STATUS:
 #            print('Received status message: {0}'.format(data))
         elif msgType == types.DATA_MESSAGE:
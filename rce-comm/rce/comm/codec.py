@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#     rce-comm/rce/comm/codec.py
+#
+#     This file is part of the RoboEarth Cloud Engine framework.
+#
+#     This file was originally created for RoboEearth
+#     http://www.roboearth.org/
+#
+#     The research leading to these results has received funding from
+#     the European Union Seventh Framework Programme FP7/2007-2013 under
+#     grant agreement no248942 RoboEarth.
+#
+#     Copyright 2013 RoboEarth
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+#     \author/s: Dominique Hunziker
+#
+#
+
+# Python specific imports
+import json
+
+try:
+    import simplejson
+except ImportError:
+    simplejson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    from cStringIO import StringIO, InputType, OutputType
+    from StringIO import StringIO as pyStringIO
+
+    def _checkIsStringIO(obj):
+        return isinstance(obj, (InputType, OutputType, pyStringIO))
+except ImportError:
+    from StringIO import StringIO
+
+    def _checkIsStringIO(obj):
+        return isinstance(obj, StringIO)
+
+# zope specific imports
+from zope.interface import implements
+
+# rce specific imports
+from rce.comm import types
+from rce.comm.interfaces import IJSONCodec
+
+
+class CodecError(Exception):
+    """ Exception is raised when a requested codec is not available.
+    """
+
+
+class _JSONCodecBase(object):
+    """ Base class which implements the functionality which is shared by
+        all JSON codecs.
+    """
+    implements(IJSONCodec)
+
+    # Prefix and suffix of a serialized batch message
+    _BATCH_PREFIX = '{{"type":"{0}","data":['.format(types.BATCH)
+    _BATCH_SUFFIX = ']}'
+
+    def dumpsBatch(self, msgs):
+        return ''.join((self._BATCH_PREFIX, ','.join(msgs),
+                        self._BATCH_SUFFIX))
+
+    dumpsBatch.__doc__ = IJSONCodec.get('dumpsBatch').getDoc()
+
+
+class StdlibJSONCodec(_JSONCodecBase):
+    """ JSON codec which uses the 'json' module of the standard library.
+    """
+
+    name = 'json'
+
+    def dumps(self, obj):
+        return json.dumps(obj)
+
+    dumps.__doc__ = IJSONCodec.get('dumps').getDoc()
+
+    def loads(self, msg):
+        return json.loads(msg)
+
+    loads.__doc__ = IJSONCodec.get('loads').getDoc()
+
+
+class SimpleJSONCodec(_JSONCodecBase):
+    """ JSON codec which uses the C speedups of the 'simplejson' module.
+    """
+
+    name = 'simplejson'
+
+    def dumps(self, obj):
+        return simplejson.dumps(obj)
+
+    dumps.__doc__ = IJSONCodec.get('dumps').getDoc()
+
+    def loads(self, msg):
+        return simplejson.loads(msg)
+
+    loads.__doc__ = IJSONCodec.get('loads').getDoc()
+
+
+class UltraJSONCodec(_JSONCodecBase):
+    """ JSON codec which uses the 'ujson' module.
+
+        Older versions of 'ujson' round floats on the wire; therefore, the
+        codec is only used if it is selected explicitly.
+    """
+
+    name = 'ujson'
+
+    def dumps(self, obj):
+        return ujson.dumps(obj)
+
+    dumps.__doc__ = IJSONCodec.get('dumps').getDoc()
+
+    def loads(self, msg):
+        return ujson.loads(msg)
+
+    loads.__doc__ = IJSONCodec.get('loads').getDoc()
+
+
+class MessagePackCodec(object):
+    """ Codec for the MessagePack wire format. In contrast to the JSON codecs
+        StringIO instances are carried inline as MessagePack extension types
+        and are restored as StringIO instances.
+    """
+    implements(IJSONCodec)
+
+    name = types.FORMAT_MSGPACK
+
+    # MessagePack extension type code which is used for binaries
+    _BINARY_EXT = 1
+
+    @classmethod
+    def _default(cls, obj):
+        """ Internally used method to pack objects which are not supported by
+            MessagePack.
+        """
+        if _checkIsStringIO(obj):
+            return msgpack.ExtType(cls._BINARY_EXT, obj.getvalue())
+
+        raise TypeError('Can not pack object of type '
+                        "'{0}'.".format(obj.__class__.__name__))
+
+    @classmethod
+    def _extHook(cls, code, data):
+        """ Internally used method to unpack MessagePack extension types.
+        """
+        if code == cls._BINARY_EXT:
+            return StringIO(data)
+
+        return msgpack.ExtType(code, data)
+
+    def dumps(self, obj):
+        return msgpack.packb(obj, default=self._default, use_bin_type=True)
+
+    dumps.__doc__ = IJSONCodec.get('dumps').getDoc()
+
+    def loads(self, msg):
+        try:
+            return msgpack.unpackb(msg, ext_hook=self._extHook, raw=False)
+        except Exception as e:
+            # msgpack does not use a common base class for its errors
+            raise ValueError(str(e))
+
+    loads.__doc__ = IJSONCodec.get('loads').getDoc()
+
+    def dumpsBatch(self, msgs):
+        packer = msgpack.Packer(use_bin_type=True)
+        return ''.join([packer.pack_map_header(2),
+                        packer.pack('type'), packer.pack(types.BATCH),
+                        packer.pack('data'), packer.pack_array_header(len(msgs))]
+                       + msgs)
+
+    dumpsBatch.__doc__ = IJSONCodec.get('dumpsBatch').getDoc()
+
+
+# Available codecs ordered by preference
+_CODECS = [(UltraJSONCodec, ujson), (SimpleJSONCodec, simplejson),
+           (StdlibJSONCodec, json)]
+
+# Codec which is used if no codec is selected
+_DEFAULT_CODEC = StdlibJSONCodec
+
+
+def availableCodecs():
+    """ Get the names of all JSON codecs which can be used on this host.
+
+        @return:                Names of the available codecs ordered by
+                                preference.
+        @rtype:                 [str]
+    """
+    return [cls.name for cls, mod in _CODECS if mod]
+
+
+def getCodec(name=None):
+    """ Get a JSON codec.
+
+        @param name:            Name of the codec which should be used. If no
+                                name is given, the 'json' module of the
+                                standard library is used.
+        @type  name:            str
+
+        @return:                New JSON codec instance.
+        @rtype:                 rce.comm.interfaces.IJSONCodec
+
+        @raise:                 rce.comm.codec.CodecError
+    """
+    if not name:
+        return _DEFAULT_CODEC()
+
+    for cls, mod in _CODECS:
+        if mod and name == cls.name:
+            return cls()
+
+    raise CodecError("JSON codec '{0}' is not available.".format(name))
+
+
+def getWireCodec(wireFormat):
+    """ Get the codec for a wire format which carries binaries inline.
+
+        @param wireFormat:      Wire format which was negotiated for the
+                                connection.
+        @type  wireFormat:      str
+
+        @return:                New codec instance or None, if the wire
+                                format is JSON, in which case the binaries
+                                are sent in separate frames.
+        @rtype:                 rce.comm.interfaces.IJSONCodec
+
+        @raise:                 rce.comm.codec.CodecError
+    """
+    if wireFormat == types.FORMAT_JSON:
+        return None
+
+    if wireFormat == types.FORMAT_MSGPACK and msgpack:
+        return MessagePackCodec()
+
+    raise CodecError("Wire format '{0}' is not supported.".format(wireFormat))
@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#     rce-comm/rce/comm/compression.py
+#
+#     This file is part of the RoboEarth Cloud Engine framework.
+#
+#     This file was originally created for RoboEearth
+#     http://www.roboearth.org/
+#
+#     The research leading to these results has received funding from
+#     the European Union Seventh Framework Programme FP7/2007-2013 under
+#     grant agreement no248942 RoboEarth.
+#
+#     Copyright 2013 RoboEarth
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+#     \author/s: Dominique Hunziker
+#
+#
+
+# Python specific imports
+import zlib
+import struct
+
+# rce specific imports
+from rce.comm import types
+
+
+_MARKERS = (types.COMPRESSED_TEXT, types.COMPRESSED_BINARY)
+
+_STREAM_MARKERS = (types.STREAM_CONTINUED, types.STREAM_STARTED)
+
+# Header of the messages of a compressed stream of the form
+#     (marker, sequence number)
+_STREAM_HEADER = struct.Struct('<cI')
+
+# Empty stored block which ends the deflate data after a sync flush; it is
+# not sent
+_SYNC_MARKER = '\x00\x00\xff\xff'
+
+
+class FrameCompressor(object):
+    """ Compressor which is used to selectively compress the frames of a
+        WebSocket connection.
+
+        Frames which are smaller than the threshold are not compressed. Frames
+        whose size is not reduced by the compression, e.g. frames containing
+        PNG or JPEG images, are sent uncompressed as well.
+    """
+    def __init__(self, threshold, level=6):
+        """ Initialize the compressor.
+
+            @param threshold:   Minimal size in bytes of a frame which should
+                                be compressed.
+            @type  threshold:   int
+
+            @param level:       Compression level which is used for zlib.
+            @type  level:       int
+        """
+        self._threshold = threshold
+        self._level = level
+
+        self._compressed = 0
+        self._incompressible = 0
+        self._saved = 0
+
+    @property
+    def threshold(self):
+        """ Minimal size in bytes of a frame which is compressed. """
+        return self._threshold
+
+    @property
+    def compressed(self):
+        """ Number of frames which have been compressed. """
+        return self._compressed
+
+    @property
+    def incompressible(self):
+        """ Number of frames which have been sent uncompressed, because the
+            compression did not reduce their size.
+        """
+        return self._incompressible
+
+    @property
+    def saved(self):
+        """ Number of bytes which have been saved by the compression. """
+        return self._saved
+
+    def compress(self, chunks, binary):
+        """ Compress the frame consisting of the given chunks.
+
+            @param chunks:      Chunks of the frame which should be compressed.
+            @type  chunks:      [str]
+
+            @param binary:      Flag which is True if the frame is a binary
+                                frame and False if it is a text frame.
+            @type  binary:      bool
+
+            @return:            Chunks of the binary frame containing the
+                                compressed frame or None, if the frame should
+                                be sent uncompressed.
+            @rtype:             [str] / None
+        """
+        size = sum(len(chunk) for chunk in chunks)
+
+        if size < self._threshold:
+            return None
+
+        compressor = zlib.compressobj(self._level)
+        compressed = [compressor.compress(chunk) for chunk in chunks]
+        compressed.append(compressor.flush())
+
+        compressedSize = sum(len(chunk) for chunk in compressed) + 1
+
+        if compressedSize >= size:
+            self._incompressible += 1
+            return None
+
+        self._compressed += 1
+        self._saved += size - compressedSize
+
+        if binary:
+            compressed.insert(0, types.COMPRESSED_BINARY)
+        else:
+            compressed.insert(0, types.COMPRESSED_TEXT)
+
+        return compressed
+
+
+def decompressFrame(msg, binary):
+    """ Decompress a received frame, if it has been compressed by a
+        FrameCompressor.
+
+        @param msg:         Received frame.
+        @type  msg:         str
+
+        @param binary:      Flag which is True if the frame is a binary frame.
+        @type  binary:      bool
+
+        @return:            Decompressed frame and the flag which is True if
+                            the decompressed frame is a binary frame.
+        @rtype:             (str, bool)
+
+        @raise:             ValueError, if the compressed frame is invalid.
+    """
+    if not binary or msg[:1] not in _MARKERS:
+        return msg, binary
+
+    try:
+        data = zlib.decompress(buffer(msg, 1))
+    except zlib.error as e:
+        raise ValueError('Compressed frame is invalid: {0}'.format(e))
+
+    return data, msg[0] == types.COMPRESSED_BINARY
+
+
+class StreamCompressor(object):
+    """ Compressor which is used to compress the serialized ROS messages of a
+        forwarder interface as one stream.
+
+        Each message is flushed using Z_SYNC_FLUSH such that it can be
+        decompressed as soon as it has been received, while the compression
+        of each message uses the previous messages as dictionary. Small and
+        similar messages, e.g. of high-rate topics, are therefore compressed
+        much better and faster than on their own.
+
+        The stream has to be reset whenever messages might have been lost,
+        since the StreamDecompressor rejects all messages after a missing
+        message until a new stream has been started.
+    """
+    def __init__(self, level=6):
+        """ Initialize the compressor.
+
+            @param level:       Compression level which is used for zlib.
+            @type  level:       int
+        """
+        self._level = level
+        self.reset()
+
+    def reset(self):
+        """ Start a new stream with the next message.
+        """
+        self._compressor = None
+        self._sequence = 0
+
+    def compress(self, msg):
+        """ Compress a message as part of the stream.
+
+            @param msg:         Message which should be compressed.
+            @type  msg:         str
+
+            @return:            Compressed message.
+            @rtype:             str
+        """
+        if self._compressor:
+            marker = types.STREAM_CONTINUED
+        else:
+            marker = types.STREAM_STARTED
+            self._compressor = zlib.compressobj(self._level, zlib.DEFLATED,
+                                                -zlib.MAX_WBITS)
+
+        data = (self._compressor.compress(msg) +
+                self._compressor.flush(zlib.Z_SYNC_FLUSH))
+        header = _STREAM_HEADER.pack(marker, self._sequence)
+        self._sequence = (self._sequence + 1) & 0xFFFFFFFF
+
+        return header + data[:-len(_SYNC_MARKER)]
+
+
+class StreamDecompressor(object):
+    """ Decompressor which is used to decompress the serialized ROS messages
+        of a forwarder interface, which have been compressed either on their
+        own or by a StreamCompressor.
+    """
+    def __init__(self):
+        """ Initialize the decompressor.
+        """
+        self._decompressor = None
+        self._sequence = 0
+
+    def decompress(self, msg):
+        """ Decompress a received message.
+
+            @param msg:         Received message.
+            @type  msg:         str
+
+            @return:            Decompressed message.
+            @rtype:             str
+
+            @raise:             ValueError, if the compressed message is
+                                invalid or if a previous message of the
+                                stream is missing.
+        """
+        marker = msg[:1]
+
+        if marker not in _STREAM_MARKERS:
+            try:
+                return zlib.decompress(msg)
+            except zlib.error as e:
+                raise ValueError('Compressed message is invalid: '
+                                 '{0}'.format(e))
+
+        try:
+            _, sequence = _STREAM_HEADER.unpack_from(msg)
+        except struct.error:
+            raise ValueError('Compressed message is invalid.')
+
+        if marker == types.STREAM_STARTED:
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        elif not self._decompressor or sequence != self._sequence:
+            self._decompressor = None
+            raise ValueError('Previous message of the compressed stream is '
+                             'missing; waiting for a new stream.')
+
+        try:
+            data = self._decompressor.decompress(msg[_STREAM_HEADER.size:] +
+                                                 _SYNC_MARKER)
+        except zlib.error as e:
+            self._decompressor = None
+            raise ValueError('Compressed message is invalid: {0}'.format(e))
+
+        self._sequence = (sequence + 1) & 0xFFFFFFFF
+        return data
@@ -48,15 +48,54 @@ class IMasterRealm(Interface):
 
             @return:            The IP address of Robot process to which a
                                 WebSocket connection should be established.
-                                (type: str)
-            @rtype:             twisted.internet.defer.Deferred
+                                The address should be returned directly if
+                                it is available without a round trip.
+            @rtype:             str / twisted.internet.defer.Deferred
+        """
+
+
+class IJSONCodec(Interface):
+    """ Interface which a JSON codec used for the WebSocket connections has to
+        implement.
+    """
+    def dumps(obj): #@NoSelf
+        """ Serialize a JSON compatible object.
+
+            @param obj:         Object which should be serialized.
+            @type  obj:         { str : {} / base_types }
+
+            @return:            JSON encoded string.
+            @rtype:             str
+        """
+
+    def loads(msg): #@NoSelf
+        """ Deserialize a JSON encoded string.
+
+            @param msg:         JSON encoded string.
+            @type  msg:         str
+
+            @return:            Deserialized object.
+            @rtype:             { str : {} / base_types }
+
+            @raise:             ValueError, if the string is not valid JSON.
+        """
+
+    def dumpsBatch(msgs): #@NoSelf
+        """ Wrap already serialized messages in a serialized batch message
+            without serializing the messages again.
+
+            @param msgs:        Messages which were serialized using 'dumps'.
+            @type  msgs:        [str]
+
+            @return:            Serialized batch message.
+            @rtype:             str
         """
 
 
 class IRobotRealm(Interface):
     """ Interface which the Robot realm has to implement.
     """
-    def login(userID, robotID, password): #@NoSelf
+    def login(userID, robotID, password, session=None): #@NoSelf
         """ Callback for Robot connection to login and authenticate.
 
             @param userID:      User ID under which the robot is logging in.
@@ -70,8 +109,15 @@ class IRobotRealm(Interface):
                                 used to authenticate the user.
             @type  password:    str
 
+            @param session:     Token of the session which the robot tries to
+                                resume or None, if a new session should be
+                                started.
+            @type  session:     str
+
             @return:            Representation of the connection to the robot
-                                which is used in the Robot process.
+                                which is used in the Robot process. Its
+                                attribute 'session' contains the token of
+                                the session which is either resumed or new.
                                 (type: rce.robot.Connection)
             @rtype:             twisted.internet.defer.Deferred
         """
@@ -126,6 +172,49 @@ class IServersideProtocol(Interface):
             @type  msg:         {str : {} / base_types / StringIO} / StringIO
         """
 
+    def sendsBinaryArrays(iTag): #@NoSelf
+        """ Check whether the byte arrays, i.e. uint8[] fields, of the data
+            messages of an interface can be sent to the robot client as
+            binaries.
+
+            @param iTag:        Tag which is used to identify the interface.
+            @type  iTag:        str
+
+            @return:            True if the byte arrays can be sent as binaries
+                                and False if they have to be sent as lists of
+                                integers.
+            @rtype:             bool
+        """
+
+    def sendsNumericTime(): #@NoSelf
+        """ Check whether the times and durations in the data messages should
+            be sent to the robot client in the numeric form, i.e. as
+            dictionaries with the keys 'secs' and 'nsecs', instead of as ISO
+            8601 strings and floats.
+
+            @return:            True if the numeric form should be used.
+            @rtype:             bool
+        """
+
+    def getCodecs(): #@NoSelf
+        """ Get the codecs which the robot client requested for the binaries,
+            e.g. images, of the data messages of the interfaces.
+
+            @return:            Codec and quality, e.g. ('jpeg', 80), for each
+                                interface tag; the default codec should be
+                                used for the interfaces which are missing.
+            @rtype:             { str : (str, int / None) }
+        """
+
+    def sendsCompressedStreams(): #@NoSelf
+        """ Check whether the serialized ROS messages of the forwarders should
+            be compressed as one stream per interface instead of on their own.
+
+            @return:            True if the messages should be compressed as
+                                streams.
+            @rtype:             bool
+        """
+
     def sendErrorMessage(msg): #@NoSelf
         """ Send an error message to the robot client.
 
@@ -137,6 +226,18 @@ class IServersideProtocol(Interface):
         """ Request that the protocol drops the connection to the client.
         """
 
+    def registerProducer(producer): #@NoSelf
+        """ Register a producer which is paused while the transport of the
+            protocol can not keep up with the outgoing messages.
+
+            @param producer:    Producer which should be registered.
+            @type  producer:    twisted.internet.interfaces.IPushProducer
+        """
+
+    def unregisterProducer(): #@NoSelf
+        """ Unregister the previously registered producer.
+        """
+
 
 class IRobot(Interface):
     """ Interface which the Robot Avatar has to implement.
@@ -283,6 +384,21 @@ class IRobot(Interface):
             @type  name:        str
         """
 
+    def configureComponent(config): #@NoSelf
+        """ Add and remove multiple nodes, interfaces and parameters in a
+            single request.
+
+            @param config:      Dictionary which can contain the keys
+                                'addNodes', 'removeNodes', 'addInterfaces',
+                                'removeInterfaces', 'setParam' and
+                                'deleteParam'. The values are lists of tuples
+                                containing the arguments for the methods
+                                addNode, removeNode, addInterface,
+                                removeInterface, addParameter and
+                                removeParameter, respectively.
+            @type  config:      { str : [ tuple ] }
+        """
+
     def addConnection(tagA, tagB): #@NoSelf
         """ Create a connection between two interfaces.
 
@@ -32,17 +32,15 @@
 
 # Python specific imports
 import json
-
-try:
-    from cStringIO import StringIO
-except ImportError:
-    from StringIO import StringIO #@UnusedImport
+from operator import itemgetter
 
 # zope specific imports
 from zope.interface import implements
 
 # twisted specific imports
 #from twisted.python import log
+from twisted.internet import reactor
+from twisted.internet.defer import Deferred
 from twisted.python.failure import Failure
 from twisted.cred.error import UnauthorizedLogin
 from twisted.web.resource import Resource
@@ -57,9 +55,12 @@ from autobahn.websocket import HttpException, \
 from rce.comm import types
 from rce.comm._version import MINIMAL_VERSION, CURRENT_VERSION
 from rce.comm.error import InvalidRequest, DeadConnection
-from rce.comm.assembler import recursiveBinarySearch, MessageAssembler
+from rce.comm.codec import CodecError, getCodec, getWireCodec
+from rce.comm.compression import FrameCompressor, decompressFrame
+from rce.comm.assembler import recursiveBinarySearch, compactURIGenerator, \
+    chunkBinary, MessageAssembler
 from rce.comm.interfaces import IMasterRealm, IRobotRealm, \
-    IServersideProtocol, IRobot, IMessageReceiver
+    IServersideProtocol, IRobot, IMessageReceiver, IJSONCodec
 from rce.util.interface import verifyObject
 
 
@@ -69,6 +70,68 @@ class _VersionError(Exception):
     """
 
 
+class _Validator(object):
+    """ Precompiled validator which checks that a request contains all
+        required keys and extracts the arguments for the request.
+    """
+    def __init__(self, request, part, required, optional=()):
+        """ Initialize the validator.
+
+            @param request:     Name of the request which is validated.
+            @type  request:     str
+
+            @param part:        Name of the part of the request which is
+                                validated or None, if the whole request is
+                                validated.
+            @type  part:        str
+
+            @param required:    Keys which are required.
+            @type  required:    (str)
+
+            @param optional:    Optional keys and their default values.
+            @type  optional:    ((str, object))
+        """
+        getter = itemgetter(*required)
+
+        if len(required) == 1:
+            self._required = lambda data: (getter(data),)
+        else:
+            self._required = getter
+
+        self._optional = optional
+
+        if part:
+            self._error = ("Can not process '{0}' request. '{1}' is missing "
+                           'key: {{0}}'.format(request, part))
+        else:
+            self._error = ("Can not process '{0}' request. Missing key: "
+                           '{{0}}'.format(request))
+
+    def __call__(self, data):
+        """ Validate the request.
+
+            @param data:        Request which should be validated.
+            @type  data:        { str : ... }
+
+            @return:            Arguments for the request, i.e. the values of
+                                the required keys followed by the values of
+                                the optional keys.
+            @rtype:             tuple
+
+            @raise:             rce.comm.error.InvalidRequest
+        """
+        try:
+            args = self._required(data)
+        except KeyError as e:
+            raise InvalidRequest(self._error.format(e))
+
+        if self._optional:
+            args += tuple(data.get(key, default)
+                          for key, default in self._optional)
+
+        return args
+
+
 class RobotResource(Resource):
     """ Twisted web.Resource which is used in the Master to distribute new
         robots connections.
@@ -97,16 +160,24 @@ class RobotResource(Resource):
         request.finish()
 
     @classmethod
-    def _build_response(cls, addr, version, request):
-        """ Internally used method to build the response to a GET request.
+    def _build_message(cls, addr, version):
+        """ Internally used method to build the body of the response to a GET
+            request.
         """
         msg = {'url' : 'ws://{0}/'.format(addr)}
 
         if version != CURRENT_VERSION:
             msg['current'] = CURRENT_VERSION
 
+        return json.dumps(msg)
+
+    @classmethod
+    def _build_response(cls, addr, version, request):
+        """ Internally used method to build the response to a GET request.
+        """
         cls._render(request, httpstatus.HTTP_STATUS_CODE_OK[0],
-                    'application/json; charset=utf-8', json.dumps(msg))
+                    'application/json; charset=utf-8',
+                    cls._build_message(addr, version))
 
     @classmethod
     def _handle_error(cls, e, request):
@@ -164,11 +235,17 @@ class RobotResource(Resource):
         userID = userID[0]
 
         # Get the URL of a Robot process
-        d = self._realm.requestURL(userID)
-        d.addCallback(self._build_response, version, request)
-        d.addErrback(self._handle_error, request)
+        addr = self._realm.requestURL(userID)
+
+        if isinstance(addr, Deferred):
+            addr.addCallback(self._build_response, version, request)
+            addr.addErrback(self._handle_error, request)
+            return NOT_DONE_YET
 
-        return NOT_DONE_YET
+        # The address was cached; respond immediately
+        request.setResponseCode(httpstatus.HTTP_STATUS_CODE_OK[0])
+        request.setHeader('content-type', 'application/json; charset=utf-8')
+        return self._build_message(addr, version)
 
 
 class RobotWebSocketProtocol(WebSocketServerProtocol):
@@ -180,18 +257,88 @@ class RobotWebSocketProtocol(WebSocketServerProtocol):
     # CONFIG
     MSG_QUEUE_TIMEOUT = 60
 
-    def __init__(self, realm):
+    def __init__(self, realm, codec, batchInterval=None, batchSize=0,
+                 compressor=None, chunkSize=0, chunkMemory=0):
         """ Initialize the Protocol.
 
             @param realm:       Robot realm implementing necessary callback
                                 methods.
             @type  realm:       rce.comm.interfaces.IRobotRealm
+
+            @param codec:       JSON codec which is used to encode and decode
+                                the string messages.
+            @type  codec:       rce.comm.interfaces.IJSONCodec
+
+            @param batchInterval:   Time in seconds after which batched data
+                                    messages are flushed or None, if the data
+                                    messages should not be batched.
+            @type  batchInterval:   float
+
+            @param batchSize:   Number of bytes of batched data messages after
+                                which the batch is flushed immediately.
+            @type  batchSize:   int
+
+            @param compressor:  Compressor which is used for the outgoing
+                                frames or None, if the frames should not be
+                                compressed.
+            @type  compressor:  rce.comm.compression.FrameCompressor
+
+            @param chunkSize:   Size in bytes of the chunks into which larger
+                                binaries are split or 0, if the binaries
+                                should not be split.
+            @type  chunkSize:   int
+
+            @param chunkMemory: Maximum number of bytes which are used to
+                                reassemble binaries which are received in
+                                chunks before temporary files are used.
+            @type  chunkMemory: int
         """
         verifyObject(IRobotRealm, realm)
 
         self._realm = realm
-        self._assembler = MessageAssembler(self, self.MSG_QUEUE_TIMEOUT)
+        self._codec = codec
+        self._assembler = MessageAssembler(self, self.MSG_QUEUE_TIMEOUT, codec,
+                                           chunkMemory)
+        self._wireCodec = None
+        self._nextURI = None
         self._avatar = None
+        self._registered = False
+
+        # Resumable session
+        self._resumable = False
+        self._session = None
+
+        # Batching of outgoing data messages
+        self._batchInterval = batchInterval
+        self._batchSize = batchSize
+        self._batching = False
+        self._unbatched = set()
+        self._batch = []
+        self._batchBytes = 0
+        self._batchCompress = True
+        self._batchCall = None
+
+        # Compression of outgoing frames
+        self._compressor = compressor
+        self._compressing = False
+        self._uncompressed = set()
+
+        # Splitting of outgoing binaries into chunks
+        self._chunkSize = chunkSize
+        self._chunking = False
+
+        # Byte arrays of outgoing data messages as binaries
+        self._binaryArrays = False
+        self._listed = set()
+
+        # Times and durations of outgoing data messages in the numeric form
+        self._numericTime = False
+
+        # Codecs of the binaries of outgoing data messages per interface
+        self._codecs = {}
+
+        # Compression of the messages of the forwarders as streams
+        self._compressedStreams = False
 
     def onConnect(self, req):
         """ Method is called by the Autobahn engine when a request to establish
@@ -213,14 +360,95 @@ class RobotWebSocketProtocol(WebSocketServerProtocol):
             raise HttpException(httpstatus.HTTP_STATUS_CODE_BAD_REQUEST[0],
                                 'Request is missing parameter: {0}'.format(e))
 
+        wireFormat = params.get('format', [types.FORMAT_JSON])
+        batch = params.get('batch', ['0'])
+        compress = params.get('compress', ['0'])
+        compact = params.get('compact', ['0'])
+        chunked = params.get('chunked', ['0'])
+        resumable = params.get('resumable', ['0'])
+        session = params.get('session', [None])
+        binary = params.get('binary', ['0'])
+        timeFormat = params.get('time', ['iso'])
+        stream = params.get('stream', ['0'])
+
         for name, param in [('userID', userID), ('robotID', robotID),
-                            ('password', password)]:
+                            ('password', password), ('format', wireFormat),
+                            ('batch', batch), ('compress', compress),
+                            ('compact', compact), ('chunked', chunked),
+                            ('resumable', resumable), ('session', session),
+                            ('binary', binary), ('time', timeFormat),
+                            ('stream', stream)]:
             if len(param) != 1:
                 raise HttpException(httpstatus.HTTP_STATUS_CODE_BAD_REQUEST[0],
                                     "Parameter '{0}' has to be unique in "
                                     'request.'.format(name))
 
-        d = self._realm.login(userID[0], robotID[0], password[0])
+        try:
+            self._wireCodec = getWireCodec(wireFormat[0])
+        except CodecError as e:
+            raise HttpException(httpstatus.HTTP_STATUS_CODE_BAD_REQUEST[0],
+                                str(e))
+
+        # Batching has to be requested by the client and enabled in the server
+        self._batching = batch[0] == '1' and self._batchInterval is not None
+        self._unbatched = set(params.get('unbatched', []))
+
+        # Compression has to be requested by the client and enabled in the
+        # server
+        self._compressing = compress[0] == '1' and self._compressor is not None
+        self._uncompressed = set(params.get('uncompressed', []))
+
+        # Compact URIs for the binary messages have to be requested by the
+        # client
+        if compact[0] == '1':
+            self._nextURI = compactURIGenerator()
+
+        # Chunked binaries have to be requested by the client and enabled in
+        # the server
+        self._chunking = chunked[0] == '1' and self._chunkSize > 0
+
+        # Byte arrays are only sent as binaries to clients which requested it
+        self._binaryArrays = binary[0] == '1'
+        self._listed = set(params.get('listed', []))
+
+        # Times are sent as ISO 8601 strings unless the client requested the
+        # numeric form
+        if timeFormat[0] not in ('iso', 'numeric'):
+            raise HttpException(httpstatus.HTTP_STATUS_CODE_BAD_REQUEST[0],
+                                "Parameter 'time' has to be either 'iso' or "
+                                "'numeric'.")
+
+        self._numericTime = timeFormat[0] == 'numeric'
+
+        # Codecs have the form 'iTag:codec' or 'iTag:codec:quality'
+        self._codecs = {}
+
+        for codec in params.get('codec', []):
+            codec = codec.split(':')
+
+            try:
+                if len(codec) not in (2, 3) or not all(codec):
+                    raise ValueError
+
+                quality = int(codec[2]) if len(codec) == 3 else None
+            except ValueError:
+                raise HttpException(httpstatus.HTTP_STATUS_CODE_BAD_REQUEST[0],
+                                    "Parameter 'codec' has to be of the form "
+                                    "'iTag:codec' or 'iTag:codec:quality'.")
+
+            self._codecs[codec[0]] = (codec[1], quality)
+
+        # The messages of the forwarders are only compressed as streams for
+        # clients which can decompress them
+        self._compressedStreams = stream[0] == '1'
+
+        # Sessions are only resumed for clients which can handle the session
+        # messages
+        self._resumable = resumable[0] == '1'
+        self._session = session[0] if self._resumable else None
+
+        d = self._realm.login(userID[0], robotID[0], password[0],
+                              self._session)
         d.addCallback(self._authenticate_success)
         d.addErrback(self._authenticate_failed)
         return d
@@ -232,7 +460,6 @@ class RobotWebSocketProtocol(WebSocketServerProtocol):
         verifyObject(IRobot, avatar)
         verifyObject(IMessageReceiver, avatar)
 
-        self._realm.registerWebsocketProtocol(avatar, self)
         self._avatar = avatar
         self._assembler.start()
 
@@ -263,123 +490,46 @@ class RobotWebSocketProtocol(WebSocketServerProtocol):
         except KeyError as e:
             raise InvalidRequest('Message is missing key: {0}'.format(e))
 
-        if msgType == types.DATA_MESSAGE:
-            self._process_DataMessage(data)
-        elif msgType == types.CONFIGURE_COMPONENT:
-            self._process_configureComponent(data)
-        elif msgType == types.CONFIGURE_CONNECTION:
-            self._process_configureConnection(data)
-        elif msgType == types.CREATE_CONTAINER:
-            self._process_createContainer(data)
-        elif msgType == types.DESTROY_CONTAINER:
-            self._process_destroyContainer(data)
-        else:
+        try:
+            handler = self._HANDLERS[msgType]
+        except KeyError:
             raise InvalidRequest('This message type is not supported.')
 
+        handler(self, data)
+
     def _process_createContainer(self, data):
         """ Internally used method to process a request to create a container.
         """
-        try:
-            self._avatar.createContainer(data['containerTag'])
-        except KeyError as e:
-            raise InvalidRequest("Can not process 'CreateContainer' request. "
-                                 'Missing key: {0}'.format(e))
+        self._avatar.createContainer(*self._CREATE_CONTAINER(data))
 
     def _process_destroyContainer(self, data):
         """ Internally used method to process a request to destroy a container.
         """
-        try:
-            self._avatar.destroyContainer(data['containerTag'])
-        except KeyError as e:
-            raise InvalidRequest("Can not process 'DestroyContainer' request. "
-                                 'Missing key: {0}'.format(e))
+        self._avatar.destroyContainer(*self._DESTROY_CONTAINER(data))
 
     def _process_configureComponent(self, data):
         """ Internally used method to process a request to configure
-            components.
+            components. The whole request is validated and then forwarded as
+            a single request.
         """
-        for node in data.pop('addNodes', []):
-            try:
-                self._avatar.addNode(node['containerTag'],
-                                     node['nodeTag'],
-                                     node['pkg'],
-                                     node['exe'],
-                                     node.get('args', ''),
-                                     node.get('name', ''),
-                                     node.get('namespace', ''))
-            except KeyError as e:
-                raise InvalidRequest("Can not process 'ConfigureComponent' "
-                                     "request. 'addNodes' is missing key: "
-                                     '{0}'.format(e))
-
-        for node in data.pop('removeNodes', []):
-            try:
-                self._avatar.removeNode(node['containerTag'],
-                                        node['nodeTag'])
-            except KeyError as e:
-                raise InvalidRequest("Can not process 'ConfigureComponent' "
-                                     "request. 'removeNodes' is missing key: "
-                                     '{0}'.format(e))
-
-        for conf in data.pop('addInterfaces', []):
-            try:
-                self._avatar.addInterface(conf['endpointTag'],
-                                          conf['interfaceTag'],
-                                          conf['interfaceType'],
-                                          conf['className'],
-                                          conf.get('addr', ''))
-            except KeyError as e:
-                raise InvalidRequest("Can not process 'ConfigureComponent' "
-                                     "request. 'addInterfaces' is missing "
-                                     'key: {0}'.format(e))
-
-        for conf in data.pop('removeInterfaces', []):
-            try:
-                self._avatar.removeInterface(conf['endpointTag'],
-                                             conf['interfaceTag'])
-            except KeyError as e:
-                raise InvalidRequest("Can not process 'ConfigureComponent' "
-                                     "request. 'removeInterfaces' is missing "
-                                     'key: {0}'.format(e))
-
-        for param in data.pop('setParam', []):
-            try:
-                self._avatar.addParameter(param['containerTag'],
-                                          param['name'],
-                                          param['value'])
-            except KeyError as e:
-                raise InvalidRequest("Can not process 'ConfigureComponent' "
-                                     "request. 'setParam' is missing key: "
-                                     '{0}'.format(e))
-
-        for param in data.pop('deleteParam', []):
-            try:
-                self._avatar.removeParameter(param['containerTag'],
-                                             param['name'])
-            except KeyError as e:
-                raise InvalidRequest("Can not process 'ConfigureComponent' "
-                                     "request. 'deleteParam' is missing key: "
-                                     '{0}'.format(e))
+        config = {}
+
+        for key, validator in self._CONFIGURE_COMPONENT:
+            elements = data.get(key)
+
+            if elements:
+                config[key] = [validator(element) for element in elements]
+
+        if config:
+            self._avatar.configureComponent(config)
 
     def _process_configureConnection(self, data):
         """ Internally used method to process a request to configure
             connections.
         """
-        for conf in data.pop('connect', []):
-            try:
-                self._avatar.addConnection(conf['tagA'], conf['tagB'])
-            except KeyError as e:
-                raise InvalidRequest("Can not process 'ConfigureComponent' "
-                                     "request. 'connect' is missing key: "
-                                     '{0}'.format(e))
-
-        for conf in data.pop('disconnect', []):
-            try:
-                self._avatar.removeConnection(conf['tagA'], conf['tagB'])
-            except KeyError as e:
-                raise InvalidRequest("Can not process 'ConfigureComponent' "
-                                     "request. 'disconnect' is missing key: "
-                                     '{0}'.format(e))
+        for key, validator, method in self._CONFIGURE_CONNECTION:
+            for conf in data.get(key, ()):
+                getattr(self._avatar, method)(*validator(conf))
 
     def _process_DataMessage(self, data):
         """ Internally used method to process a data message.
@@ -399,6 +549,47 @@ class RobotWebSocketProtocol(WebSocketServerProtocol):
 
         self._avatar.processReceivedMessage(iTag, mType, msgID, msg)
 
+    # Precompiled validators for the requests
+    _CREATE_CONTAINER = _Validator('CreateContainer', None, ('containerTag',))
+    _DESTROY_CONTAINER = _Validator('DestroyContainer', None,
+                                    ('containerTag',))
+
+    _CONFIGURE_COMPONENT = (
+        ('addNodes', _Validator('ConfigureComponent', 'addNodes',
+                                ('containerTag', 'nodeTag', 'pkg', 'exe'),
+                                (('args', ''), ('name', ''),
+                                 ('namespace', '')))),
+        ('removeNodes', _Validator('ConfigureComponent', 'removeNodes',
+                                   ('containerTag', 'nodeTag'))),
+        ('addInterfaces', _Validator('ConfigureComponent', 'addInterfaces',
+                                     ('endpointTag', 'interfaceTag',
+                                      'interfaceType', 'className'),
+                                     (('addr', ''),))),
+        ('removeInterfaces', _Validator('ConfigureComponent',
+                                        'removeInterfaces',
+                                        ('endpointTag', 'interfaceTag'))),
+        ('setParam', _Validator('ConfigureComponent', 'setParam',
+                                ('containerTag', 'name', 'value'))),
+        ('deleteParam', _Validator('ConfigureComponent', 'deleteParam',
+                                   ('containerTag', 'name')))
+    )
+
+    _CONFIGURE_CONNECTION = (
+        ('connect', _Validator('ConfigureConnection', 'connect',
+                               ('tagA', 'tagB')), 'addConnection'),
+        ('disconnect', _Validator('ConfigureConnection', 'disconnect',
+                                  ('tagA', 'tagB')), 'removeConnection')
+    )
+
+    # Handlers for the message types which can be received from the robot
+    _HANDLERS = {
+        types.DATA_MESSAGE : _process_DataMessage,
+        types.CONFIGURE_COMPONENT : _process_configureComponent,
+        types.CONFIGURE_CONNECTION : _process_configureConnection,
+        types.CREATE_CONTAINER : _process_createContainer,
+        types.DESTROY_CONTAINER : _process_destroyContainer
+    }
+
     def onMessage(self, msg, binary):
         """ Method is called by the Autobahn engine when a message has been
             received from the client.
@@ -413,7 +604,15 @@ class RobotWebSocketProtocol(WebSocketServerProtocol):
 #        log.msg('WebSocket: Received new message from client. '
 #                '(binary={0})'.format(binary))
         try:
-            self._assembler.processMessage(msg, binary)
+            try:
+                msg, binary = decompressFrame(msg, binary)
+            except ValueError as e:
+                raise InvalidRequest(str(e))
+
+            if self._wireCodec:
+                self._processWireMessage(msg, binary)
+            else:
+                self._assembler.processMessage(msg, binary)
         except InvalidRequest as e:
             msg = 'Invalid Request: {0}'.format(e)
             self.sendErrorMessage(msg)
@@ -424,7 +623,23 @@ class RobotWebSocketProtocol(WebSocketServerProtocol):
             traceback.print_exc()
             self.sendErrorMessage("Fatal Error")
 
-    def sendMessage(self, msg):
+    def _processWireMessage(self, msg, binary):
+        """ Internally used method to process a message which was received
+            using a wire format which carries the binaries inline.
+        """
+        if not binary:
+            raise InvalidRequest('Negotiated wire format requires binary '
+                                 'messages.')
+
+        try:
+            msg = self._wireCodec.loads(msg)
+        except ValueError:
+            raise InvalidRequest('Message is not in valid '
+                                 "'{0}' format.".format(self._wireCodec.name))
+
+        self.processCompleteMessage(msg)
+
+    def sendMessage(self, msg, compress=True, clsName=None):
         """ Internally used method to send a message to the robot.
 
             Should not be used from outside the Protocol; instead use the
@@ -432,15 +647,181 @@ class RobotWebSocketProtocol(WebSocketServerProtocol):
 
             (Overwrites method from autobahn.websocket.WebSocketServerProtocol)
 
-            @param msg:     Message which should be sent.
+            @param msg:         Message which should be sent.
+
+            @param compress:    Flag which is True if the frames of the
+                                message may be compressed.
+            @type  compress:    bool
+
+            @param clsName:     Message class of the contained ROS message,
+                                if the message is a data message.
+            @type  clsName:     str
+        """
+        # Preserve the order of the messages
+        if self._batch:
+            self._flushBatch()
+
+        if self._wireCodec:
+            self._sendFrame(self._wireCodec.dumps(msg), True, compress)
+            return
+
+        uriBinary, msgURI = recursiveBinarySearch(msg, self._nextURI, clsName)
+        self._sendJSON(self._codec.dumps(msgURI), uriBinary, compress)
+
+    def _sendJSON(self, msg, uriBinary, compress):
+        """ Internally used method to send a JSON encoded message followed by
+            its binaries.
+
+            @param msg:         JSON encoded message.
+            @type  msg:         str
+
+            @param uriBinary:   List of tuples containing the URI and the
+                                matching binary which are referenced in the
+                                message.
+            @type  uriBinary:   [(str, StringIO)]
+
+            @param compress:    Flag which is True if the frames of the
+                                message may be compressed.
+            @type  compress:    bool
+        """
+        self._sendFrame(msg, False, compress)
+
+        for uri, binary in uriBinary:
+            self._sendBinary(uri, binary, compress)
+
+    def _sendFrame(self, msg, binary, compress):
+        """ Internally used method to send a single frame to the robot which
+            is compressed if the compression has been negotiated.
+
+            @param msg:         Frame which should be sent.
+            @type  msg:         str
+
+            @param binary:      Flag which is True if the frame is a binary
+                                frame.
+            @type  binary:      bool
+
+            @param compress:    Flag which is True if the frame may be
+                                compressed.
+            @type  compress:    bool
+        """
+        if compress and self._compressing:
+            chunks = self._compressor.compress((msg,), binary)
+
+            if chunks:
+                self._sendChunks(chunks)
+                return
+
+        WebSocketServerProtocol.sendMessage(self, msg, binary=binary)
+
+    def _batchMessage(self, msg, compress, clsName):
+        """ Internally used method to add a data message to the batch of
+            outgoing messages. Messages with binaries are sent immediately
+            when the JSON wire format is used.
+
+            @param msg:         Message which should be sent.
+
+            @param compress:    Flag which is True if the frames of the
+                                message may be compressed.
+            @type  compress:    bool
+
+            @param clsName:     Message class of the contained ROS message.
+            @type  clsName:     str
+        """
+        if self._wireCodec:
+            codec = self._wireCodec
+            encoded = codec.dumps(msg)
+        else:
+            codec = self._codec
+            uriBinary, msgURI = recursiveBinarySearch(msg, self._nextURI,
+                                                      clsName)
+
+            if uriBinary:
+                if self._batch:
+                    self._flushBatch()
+
+                self._sendJSON(codec.dumps(msgURI), uriBinary, compress)
+                return
+
+            encoded = codec.dumps(msgURI)
+
+        self._batch.append(encoded)
+        self._batchBytes += len(encoded)
+        self._batchCompress = self._batchCompress and compress
+
+        if self._batchBytes >= self._batchSize:
+            self._flushBatch()
+        elif not self._batchCall:
+            self._batchCall = reactor.callLater(self._batchInterval,
+                                                self._flushBatch)
+
+    def _flushBatch(self):
+        """ Internally used method to send all batched data messages in a
+            single frame.
+        """
+        if self._batchCall:
+            if self._batchCall.active():
+                self._batchCall.cancel()
+
+            self._batchCall = None
+
+        batch = self._batch
+        compress = self._batchCompress
+        self._batch = []
+        self._batchBytes = 0
+        self._batchCompress = True
+
+        if not batch:
+            return
+
+        codec = self._wireCodec or self._codec
+        msg = batch[0] if len(batch) == 1 else codec.dumpsBatch(batch)
+        self._sendFrame(msg, bool(self._wireCodec), compress)
+
+    def _sendBinary(self, uri, binary, compress):
+        """ Internally used method to send a binary message to the robot.
+
+            The URI and the binary data are written as two separate chunks of
+            the same frame such that the binary data has not to be copied to
+            prepend the URI. Binaries which are larger than the chunk size are
+            sent as several chunked binary messages, if negotiated.
+
+            @param uri:         URI which is used to identify the binary data.
+            @type  uri:         str
+
+            @param binary:      Binary data which should be sent.
+            @type  binary:      StringIO
+
+            @param compress:    Flag which is True if the frames may be
+                                compressed.
+            @type  compress:    bool
+        """
+        data = binary.getvalue()
+
+        if self._chunking and len(data) > self._chunkSize:
+            messages = chunkBinary(uri, data, self._chunkSize)
+        else:
+            messages = ((uri, data),)
+
+        for chunks in messages:
+            if compress and self._compressing:
+                chunks = self._compressor.compress(chunks, True) or chunks
+
+            self._sendChunks(chunks)
+
+    def _sendChunks(self, chunks):
+        """ Internally used method to send a binary frame which is written as
+            separate chunks.
+
+            @param chunks:      Chunks of the binary frame.
+            @type  chunks:      [str]
         """
-        uriBinary, msgURI = recursiveBinarySearch(msg)
+        self.beginMessage(self.MESSAGE_TYPE_BINARY)
+        self.beginMessageFrame(sum(len(chunk) for chunk in chunks))
 
-        WebSocketServerProtocol.sendMessage(self, json.dumps(msgURI))
+        for chunk in chunks:
+            self.sendMessageFrameData(chunk)
 
-        for binData in uriBinary:
-            WebSocketServerProtocol.sendMessage(self,
-                binData[0] + binData[1].getvalue(), binary=True)
+        self.endMessage()
 
     def sendDataMessage(self, iTag, clsName, msgID, msg):
         """ Callback for Connection object to send a data message to the robot
@@ -466,9 +847,59 @@ class RobotWebSocketProtocol(WebSocketServerProtocol):
                                 instance which is interpreted as binary data.
             @type  msg:         {str : {} / base_types / StringIO} / StringIO
         """
-        self.sendMessage({'type' : types.DATA_MESSAGE,
-                          'data' : {'iTag' : iTag, 'type' : clsName,
-                                    'msgID' : msgID, 'msg' : msg}})
+        msg = {'type' : types.DATA_MESSAGE,
+               'data' : {'iTag' : iTag, 'type' : clsName,
+                         'msgID' : msgID, 'msg' : msg}}
+
+        compress = iTag not in self._uncompressed
+
+        if self._batching and iTag not in self._unbatched:
+            self._batchMessage(msg, compress, clsName)
+        else:
+            self.sendMessage(msg, compress, clsName)
+
+    def sendsBinaryArrays(self, iTag):
+        """ Callback for Connection object to check whether the byte arrays,
+            i.e. uint8[] fields, of the data messages of an interface can be
+            sent to the robot as binaries.
+
+            @param iTag:        Tag which is used to identify the interface.
+            @type  iTag:        str
+
+            @return:            True if the byte arrays can be sent as
+                                binaries.
+            @rtype:             bool
+        """
+        return self._binaryArrays and iTag not in self._listed
+
+    def sendsNumericTime(self):
+        """ Callback for Connection object to check whether the times and
+            durations in the data messages should be sent to the robot in the
+            numeric form.
+
+            @return:            True if the numeric form should be used.
+            @rtype:             bool
+        """
+        return self._numericTime
+
+    def getCodecs(self):
+        """ Callback for Connection object to get the codecs which the robot
+            requested for the binaries of the data messages of the interfaces.
+
+            @return:            Codec and quality for each interface tag.
+            @rtype:             { str : (str, int / None) }
+        """
+        return self._codecs
+
+    def sendsCompressedStreams(self):
+        """ Callback for Connection object to check whether the messages of
+            the forwarders should be compressed as streams.
+
+            @return:            True if the messages should be compressed as
+                                streams.
+            @rtype:             bool
+        """
+        return self._compressedStreams
 
     def sendErrorMessage(self, msg):
         """ Callback for Connection object to send an error message to the robot
@@ -479,12 +910,51 @@ class RobotWebSocketProtocol(WebSocketServerProtocol):
         """
         self.sendMessage({'data' : msg, 'type' : types.ERROR})
 
+    def registerProducer(self, producer):
+        """ Callback for Connection object to register a producer which is
+            paused while the transport can not keep up with the outgoing
+            messages.
+
+            @param producer:    Producer which should be registered.
+            @type  producer:    twisted.internet.interfaces.IPushProducer
+        """
+        self.transport.registerProducer(producer, True)
+
+    def unregisterProducer(self):
+        """ Callback for Connection object to unregister the previously
+            registered producer.
+        """
+        self.transport.unregisterProducer()
+
+    def onOpen(self):
+        """ Method is called by the Autobahn engine when the opening handshake
+            has been completed.
+        """
+        # The session message has to be sent before any data messages which
+        # have been buffered for a resumed session
+        if self._resumable:
+            session = self._avatar.session
+            self.sendMessage({'type' : types.SESSION,
+                              'data' : {'session' : session,
+                                        'resumed' : session == self._session}})
+
+        self._realm.registerWebsocketProtocol(self._avatar, self)
+        self._registered = True
+
     def onClose(self, wasClean, code, reason):
         """ Method is called by the Autobahn engine when the connection has
             been lost.
         """
-        if self._avatar:
+        if self._registered:
             self._realm.unregisterWebsocketProtocol(self._avatar, self)
+            self._registered = False
+
+        if self._batchCall and self._batchCall.active():
+            self._batchCall.cancel()
+
+        self._batchCall = None
+        self._batch = []
+        self._batchCompress = True
 
         self._assembler.stop()
 
@@ -496,7 +966,9 @@ class CloudEngineWebSocketFactory(WebSocketServerFactory):
     """ Factory which is used for the connections from the robots to the
         RoboEarth Cloud Engine.
     """
-    def __init__(self, realm, url, **kw):
+    def __init__(self, realm, url, codec=None, batchInterval=None,
+                 batchSize=65536, compressThreshold=None, compressLevel=6,
+                 chunkSize=0, chunkMemory=0, **kw):
         """ Initialize the Factory.
 
             @param realm:       Robot realm implementing necessary callback
@@ -509,17 +981,74 @@ class CloudEngineWebSocketFactory(WebSocketServerFactory):
                                     autobahn.websocket.WebSocketServerFactory
             @type  url:         str
 
+            @param codec:       Name of the JSON codec which should be used
+                                for the connections. If no name is given, the
+                                'json' module of the standard library is
+                                used.
+            @type  codec:       str
+
+            @param batchInterval:   Time in seconds after which batched data
+                                    messages are flushed. Batching is only
+                                    used for robots which request it and is
+                                    disabled if no interval is given.
+            @type  batchInterval:   float
+
+            @param batchSize:   Number of bytes of batched data messages after
+                                which the batch is flushed immediately.
+            @type  batchSize:   int
+
+            @param compressThreshold:   Minimal size in bytes of a frame which
+                                        is compressed. Compression is only
+                                        used for robots which request it and
+                                        is disabled if no threshold is given.
+            @type  compressThreshold:   int
+
+            @param compressLevel:   Compression level which is used for zlib.
+            @type  compressLevel:   int
+
+            @param chunkSize:   Size in bytes of the chunks into which larger
+                                binaries are split. Chunking is only used for
+                                robots which request it and is disabled if
+                                the size is 0.
+            @type  chunkSize:   int
+
+            @param chunkMemory: Maximum number of bytes per connection which
+                                are used to reassemble binaries which are
+                                received in chunks before temporary files are
+                                used.
+            @type  chunkMemory: int
+
             @param kw:          Additional keyworded arguments will be passed
                                 to the __init__ of the base class.
         """
         WebSocketServerFactory.__init__(self, url, **kw)
 
         self._realm = realm
+        self._codec = getCodec(codec)
+        verifyObject(IJSONCodec, self._codec)
+
+        self._batchInterval = batchInterval
+        self._batchSize = batchSize
+
+        self._compressThreshold = compressThreshold
+        self._compressLevel = compressLevel
+
+        self._chunkSize = chunkSize
+        self._chunkMemory = chunkMemory
 
     def buildProtocol(self, addr):
         """ Method is called by the twisted reactor when a new connection
             attempt is made.
         """
-        p = RobotWebSocketProtocol(self._realm)
+        if self._compressThreshold is None:
+            compressor = None
+        else:
+            compressor = FrameCompressor(self._compressThreshold,
+                                         self._compressLevel)
+
+        p = RobotWebSocketProtocol(self._realm, self._codec,
+                                   self._batchInterval, self._batchSize,
+                                   compressor, self._chunkSize,
+                                   self._chunkMemory)
         p.factory = self
         return p
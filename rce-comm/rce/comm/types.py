@@ -39,9 +39,11 @@
         CX      Change connections between Interfaces
 
         DM      ROS Message
+        BM      Batch of messages which have been sent together
 
         ST      Status message (currently not used)
         ER      Error message
+        SS      Session message containing the token to resume the session
 """
 
 CREATE_CONTAINER = 'CC'
@@ -51,6 +53,78 @@ CONFIGURE_COMPONENT = 'CN'
 CONFIGURE_CONNECTION = 'CX'
 
 DATA_MESSAGE = 'DM'
+BATCH = 'BM'
 
 #STATUS = 'ST'
 ERROR = 'ER'
+SESSION = 'SS'
+
+
+""" Wire Formats of RCE Client Protocol:
+
+        json        JSON encoded text frames; binaries are sent in separate
+                    binary frames (default)
+        msgpack     MessagePack encoded binary frames; binaries are carried
+                    inline
+"""
+
+FORMAT_JSON = 'json'
+FORMAT_MSGPACK = 'msgpack'
+
+
+""" URIs of binary messages of RCE Client Protocol:
+
+        Binary messages start with the URI which is used to reference them in
+        the string messages. Either a UUID given as 32 hexadecimal digits is
+        used or, if negotiated for the connection, a compact URI consisting of
+        the marker below followed by 7 hexadecimal digits of a counter.
+"""
+
+URI_LENGTH = 32
+COMPACT_URI_MARKER = '#'
+COMPACT_URI_LENGTH = 8
+
+
+""" Chunked binary messages of RCE Client Protocol:
+
+        Large binary messages can be split into chunks if negotiated for the
+        connection. Each chunk is sent as a binary message consisting of the
+        marker below, the URI of the binary message, a header containing the
+        sequence number of the chunk, the offset of the chunk and the total
+        size of the binary message (network byte order; 4, 8 and 8 bytes) and
+        the data of the chunk.
+"""
+
+CHUNK_MARKER = '+'
+
+
+""" Markers of compressed frames of RCE Client Protocol:
+
+        Compressed frames are sent as binary frames whose first byte is one of
+        the markers below followed by the zlib compressed frame. The markers
+        can neither be the first byte of a URI nor of a MessagePack message.
+
+        0x00        Compressed text frame
+        0x01        Compressed binary frame
+"""
+
+COMPRESSED_TEXT = '\x00'
+COMPRESSED_BINARY = '\x01'
+
+
+""" Markers of the compressed streams of the forwarder interfaces:
+
+        The serialized ROS messages of the forwarder interfaces are sent as
+        zlib compressed binaries. Messages which are compressed as part of the
+        stream of their interface start with one of the markers below followed
+        by the sequence number of the message in the stream as unsigned 32 bit
+        integer in little-endian and the raw deflate data of the message
+        without the trailing sync marker. The markers can not be the first
+        byte of a zlib compressed binary.
+
+        0x02        Message which continues the stream
+        0x03        Message which starts a new stream
+"""
+
+STREAM_CONTINUED = '\x02'
+STREAM_STARTED = '\x03'
@@ -31,7 +31,8 @@
 #
 
 # Python specific imports
-from collections import Counter
+import time
+from collections import Counter, deque
 
 # rce specific imports
 from rce.util.error import InternalError
@@ -58,12 +59,20 @@ class Distributor(object):
 
         There should only one instance running in the Master process.
     """
+    # CONFIG
+    ASSIGNMENT_TIMEOUT = 30
+
     def __init__(self):
         """ Initialize the Distributor.
         """
         self._robots = set()
         self._iter = iter(self._robots)
 
+        # Robot processes which have been handed out to robots which have not
+        # necessarily connected yet
+        self._assigned = deque()
+        self._pending = Counter()
+
     def registerRobotProcess(self, robot):
         assert robot not in self._robots
         self._robots.add(robot)
@@ -71,20 +80,46 @@ class Distributor(object):
     def unregisterRobotProcess(self, robot):
         assert robot in self._robots
         self._robots.remove(robot)
+        del self._pending[robot]
+
+    def _load(self, robot):
+        """ Internally used method to get the load of a robot process. Robot
+            processes whose WebSocket address is not yet cached are only used
+            if there is no other robot process.
+        """
+        return (robot.websocketAddress is None,
+                robot.active + self._pending[robot])
 
     def getNextLocation(self):
         """ Get the next endpoint running in an robot process to create a new
             robot WebSocket connection.
 
+            Robot processes which were handed out during the last
+            ASSIGNMENT_TIMEOUT seconds count as additionally loaded such that
+            many simultaneously connecting robots are spread over all robot
+            processes.
+
             @return:            Next robot endpoint.
             @rtype:             rce.core.robot.RobotEndpoint
                                 (subclass of rce.core.base.Proxy)
         """
+        now = time.time()
+
+        while self._assigned and self._assigned[0][0] < now:
+            robot = self._assigned.popleft()[1]
+
+            if robot in self._robots:
+                self._pending[robot] -= 1
+
         try:
-            return min(self._robots, key=lambda r: r.active)
+            location = min(self._robots, key=self._load)
         except ValueError:
             raise RobotProcessError('There is no free robot process.')
 
+        self._assigned.append((now + self.ASSIGNMENT_TIMEOUT, location))
+        self._pending[location] += 1
+        return location
+
     def cleanUp(self):
         assert len(self._robots) == 0
 
@@ -31,6 +31,7 @@
 #
 
 # twisted specific imports
+from twisted.internet.defer import succeed
 from twisted.internet.address import IPv4Address
 from twisted.spread.pb import Avatar
 
@@ -140,6 +141,8 @@ class RobotEndpoint(Endpoint):
         self._root = root
         self._port = port
 
+        self._websocketAddress = None
+
     @property
     def active(self):
         """ The number of active robot websocket connections in the
@@ -147,6 +150,14 @@ class RobotEndpoint(Endpoint):
         """
         return len(self._namespaces)
 
+    @property
+    def websocketAddress(self):
+        """ The cached address which can be used to connect to the robot
+            namespaces which belong to this endpoint. The address is None as
+            long as it has not yet been retrieved from the robot process.
+        """
+        return self._websocketAddress
+
     def getAddress(self):
         """ Get the address of the robot endpoint's internal communication
             server.
@@ -167,11 +178,23 @@ class RobotEndpoint(Endpoint):
         """ Get the address which can be used to connect to the robot
             namespaces which belong to this endpoint.
 
+            The address is retrieved only once from the robot process and
+            cached afterwards.
+
             @return:            Address of the endpoint process. The address
                                 has the form [IP]:[port] (type: str)
             @rtype:             twisted.internet.defer.Deferred
         """
-        return self.callRemote('getWebsocketAddress')
+        if self._websocketAddress:
+            return succeed(self._websocketAddress)
+
+        def cb(address):
+            if self._distributor:
+                self._websocketAddress = address
+
+            return address
+
+        return self.callRemote('getWebsocketAddress').addCallback(cb)
 
     def createRobotProxy(self, robotID, remoteRobot):
         """ Create a Namespace object in the endpoint.
@@ -200,6 +223,7 @@ class RobotEndpoint(Endpoint):
             print('Destroying Connection to Robot Process.')
             self._distributor.unregisterRobotProcess(self)
             self._distributor = None
+            self._websocketAddress = None
             super(RobotEndpoint, self).destroy()
         else:
             print('robot.RobotEndpoint destroy() called multiple times...')
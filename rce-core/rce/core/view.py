@@ -290,6 +290,40 @@ class ControlView(Viewable):
 
         # TODO: Return some info about success/failure of request
 
+    def view_configureComponent(self, user, config):
+        """ Add and remove multiple nodes, interfaces and parameters in a
+            single request. All parts of the request are processed even if
+            some of them fail.
+
+            @param user:        User for which the components will be
+                                configured.
+            @type  user:        rce.core.user.User
+
+            @param config:      Dictionary which can contain the keys
+                                'addNodes', 'removeNodes', 'addInterfaces',
+                                'removeInterfaces', 'setParam' and
+                                'deleteParam'. The values are lists of tuples
+                                containing the arguments for the methods
+                                view_addNode, view_removeNode,
+                                view_addInterface, view_removeInterface,
+                                view_addParameter and view_removeParameter,
+                                respectively.
+            @type  config:      { str : [ tuple ] }
+        """
+        errors = []
+
+        for key, method in self._COMPONENT_METHODS:
+            for args in config.get(key, ()):
+                try:
+                    method(self, user, *args)
+                except InvalidRequest as e:
+                    errors.append(str(e))
+
+        if errors:
+            raise InvalidRequest('\n'.join(errors))
+
+        # TODO: Return some info about success/failure of request
+
     def view_addConnection(self, user, tagA, tagB):
         """ Create a connection between two interfaces.
 
@@ -358,6 +392,15 @@ class ControlView(Viewable):
 
         # TODO: Return some info about success/failure of request
 
+    # Methods which are used for the parts of a 'configureComponent' request
+    # in the order in which the parts are processed
+    _COMPONENT_METHODS = (('addNodes', view_addNode),
+                          ('removeNodes', view_removeNode),
+                          ('addInterfaces', view_addInterface),
+                          ('removeInterfaces', view_removeInterface),
+                          ('setParam', view_addParameter),
+                          ('deleteParam', view_removeParameter))
+
 
 class MonitorView(Viewable):
     """ View implementing all monitor actions which a normal user can perform to
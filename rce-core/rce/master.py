@@ -87,7 +87,7 @@ class RoboEarthCloudEngine(object):
     LOAD_BALANCER_CLS = LoadBalancer
     DISTRIBUTOR_CLS = Distributor
 
-    def __init__(self, checker, intIP, port):
+    def __init__(self, checker, intIP):
         """ Initialize the RoboEarth Cloud Engine realm.
 
             @param checker:     Login checker which authenticates the User when
@@ -97,14 +97,9 @@ class RoboEarthCloudEngine(object):
             @param intIP:       IP address of the network interface used for
                                 the internal communication.
             @type  intIP:       str
-
-            @param port:        Port where the robot process is listening for
-                                connections to other endpoints.
-            @type  port:        int
         """
         self._checker = checker
         self._intIP = intIP
-        self._port = port
 
         self._network = Network()
         self._balancer = self.LOAD_BALANCER_CLS(self)
@@ -131,8 +126,12 @@ class RoboEarthCloudEngine(object):
             print('Connection to Container process established.')
         elif avatarId == 'robot':
             endpoint = RobotEndpoint(self._network, self._distributor, self,
-                                     self._port)
-            endpoint.callback(mind)
+                                     mind[1])
+            endpoint.callback(mind[0])
+            # Cache the WebSocket address such that the robot resource can
+            # answer requests immediately; on failure it is retrieved again
+            # on the next request
+            endpoint.getWebsocketAddress().addErrback(lambda _: None)
             avatar = RobotEndpointAvatar(self, endpoint)
             detach = lambda: avatar.logout()
             print('Connection to Robot process established.')
@@ -181,8 +180,9 @@ class RoboEarthCloudEngine(object):
 
             @return:            The IP address of Robot process to which a
                                 WebSocket connection should be established.
-                                (type: str)
-            @rtype:             twisted.internet.defer.Deferred
+                                The address is returned directly if it is
+                                cached.
+            @rtype:             str / twisted.internet.defer.Deferred
         """
         try:
             location = self._distributor.getNextLocation()
@@ -190,7 +190,7 @@ class RoboEarthCloudEngine(object):
             # TODO: What should we do here?
             raise InternalError('Robot can not be created.')
 
-        return location.getWebsocketAddress()
+        return location.websocketAddress or location.getWebsocketAddress()
 
     def createContainer(self, userID):
         """ Callback for User instance to create a new Container object in a
@@ -258,15 +258,18 @@ class RoboEarthCloudEngine(object):
 
 
 def main(reactor, internalCred, externalCred, internalPort, externalPort,
-         intIP, commPort, consolePort, extIP):
+         intIP, consolePort, extIP):
     log.startLogging(sys.stdout)
 
     # Realms
-    rce = RoboEarthCloudEngine(externalCred, intIP, commPort)
+    rce = RoboEarthCloudEngine(externalCred, intIP)
     user = UserRealm(rce)
 
     internalCred.add_checker(rce.checkUIDValidity)
 
+    # Keep the credentials in memory such that no login accesses the disk
+    externalCred.watch(reactor)
+
     # Portals
     rcePortal = Portal(rce, (internalCred,))
     consolePortal = Portal(user, (externalCred,))
@@ -46,10 +46,15 @@ except ImportError:
     def _checkIsStringIO(obj):
         return isinstance(obj, StringIO)
 
+# twisted specific imports
+from twisted.python import log
+
 # rce specific imports
+from rce.comm.compression import StreamCompressor, StreamDecompressor
 from rce.util.error import InternalError
 from rce.slave.interface import Interface, InvalidResoureName
 from rce.util.settings import getSettings
+from rce.util.workerpool import QueueFull
 settings = getSettings()
 
 
@@ -68,6 +73,10 @@ class _AbstractConverter(Interface):
     """ Abstract base class which provides the basics for the robot-side
         interfaces.
     """
+    # Flag which is True if the messages of this interface which are queued
+    # for the robot may be dropped while the connection is congested
+    _DROPPABLE = True
+
     def __init__(self, owner, status, uid, clsName, tag):
         """ Initialize the robot-side Interface.
 
@@ -119,12 +128,35 @@ class _AbstractConverter(Interface):
 
 class _ConverterBase(_AbstractConverter):
     """ Class which implements the basic functionality of a Converter.
+
+        If the owner has a worker pool, the messages are converted in the
+        threads of the pool; the messages of each Converter are converted one
+        after the other such that their order is preserved. The pending
+        conversions are limited like the queue of the connection: the oldest
+        pending topic message is dropped and new service messages are
+        rejected when the limit is reached.
     """
     def __init__(self, owner, status, uid, clsName, tag):
         _AbstractConverter.__init__(self, owner, status, uid, clsName, tag)
 
         self._converter = owner.converter
 
+        workerPool = owner.workerPool
+
+        if workerPool:
+            if self._DROPPABLE:
+                limit = settings.topic_queue
+            else:
+                limit = settings.service_queue
+
+            self._conversions = workerPool.queue(limit, self._DROPPABLE)
+        else:
+            self._conversions = None
+
+        # Custom converters of the messages of this interface, which can
+        # encode the messages relative to the previous ones
+        self._context = {}
+
         self._inputMsgCls = None
         self._outputMsgCls = None
 
@@ -169,15 +201,19 @@ class _ConverterBase(_AbstractConverter):
             raise InvalidResoureName('Sent message type does not match the '
                                      'used message type for this interface.')
 
+        if self._conversions:
+            d = self._conversions.run(self._converter.decodeSerialized,
+                                      self._inputMsgCls, msg, self._context)
+            d.addCallback(self._receive, msgID)
+            d.addErrback(self._conversionFailed, 'incoming', msgID)
+            return
+
         try:
-            msg = self._converter.decode(self._inputMsgCls, msg)
+            msg = self._converter.decodeSerialized(self._inputMsgCls, msg,
+                                                   self._context)
         except (TypeError, ValueError) as e:
             raise ConversionError(str(e))
 
-        buf = StringIO()
-        msg.serialize(buf)
-        msg = buf.getvalue()
-
         self._receive(msg, msgID)
 
     def _send(self, msg, msgID, protocol, remoteID):
@@ -201,20 +237,46 @@ class _ConverterBase(_AbstractConverter):
             raise InternalError('This converter can not handle outgoing '
                                 'messages.')
 
-        rosMsg = self._outputMsgCls()
-        rosMsg.deserialize(msg)
+        binary = self._owner.sendsBinaryArrays(self._tag)
+        numericTime = self._owner.sendsNumericTime()
+        codec = self._owner.getCodec(self._tag)
+
+        if self._conversions:
+            d = self._conversions.run(self._converter.encodeSerialized,
+                                      self._outputMsgCls, msg, binary,
+                                      numericTime, codec, self._context)
+            d.addCallback(self._sendToClient, msgID, protocol, remoteID)
+            d.addErrback(self._conversionFailed, 'outgoing', msgID)
+            return
 
         try:
-            jsonMsg = self._converter.encode(rosMsg)
+            jsonMsg = self._converter.encodeSerialized(self._outputMsgCls, msg,
+                                                       binary, numericTime,
+                                                       codec, self._context)
         except (TypeError, ValueError) as e:
             raise ConversionError(str(e))
 
         self._sendToClient(jsonMsg, msgID, protocol, remoteID)
 
+    def _conversionFailed(self, failure, direction, msgID):
+        """ Internally used method to log a message which could not be
+            converted in the worker pool.
+        """
+        if failure.check(QueueFull):
+            self._owner.discardMessage(self._tag, msgID, self._DROPPABLE)
+        elif failure.check(TypeError, ValueError):
+            log.msg("Dropped {0} message of interface '{1}' which could not "
+                    'be converted: {2}'.format(direction, self._tag,
+                                               failure.getErrorMessage()))
+        else:
+            log.err(failure)
+
 
 class ServiceClientConverter(_ConverterBase):
     """ Class which is used as a Service-Client Converter.
     """
+    _DROPPABLE = False
+
     def __init__(self, owner, status, uid, clsName, tag):
         _ConverterBase.__init__(self, owner, status, uid, clsName, tag)
 
@@ -250,12 +312,18 @@ class ServiceClientConverter(_ConverterBase):
                 break
 
         self._pendingRequests[uid] = (msgID, protocol, remoteID)
-        self._owner.sendToClient(self._tag, self._clsName, msgID, msg)
+
+        if not self._owner.sendToClient(self._tag, self._clsName, msgID, msg,
+                                        self._DROPPABLE):
+            # The robot will never respond to a rejected request
+            del self._pendingRequests[uid]
 
 
 class ServiceProviderConverter(_ConverterBase):
     """ Class which is used as a Service-Provider Converter.
     """
+    _DROPPABLE = False
+
     def remote_connect(self, protocol, remoteID):
         if self._protocols:
             raise InternalError('Can not register more than one interface '
@@ -280,7 +348,8 @@ class ServiceProviderConverter(_ConverterBase):
         self.received(msg, msgID)
 
     def _sendToClient(self, msg, msgID, protocol, remoteID):
-        self._owner.sendToClient(self._tag, self._clsName, msgID, msg)
+        self._owner.sendToClient(self._tag, self._clsName, msgID, msg,
+                                 self._DROPPABLE)
 
 
 class PublisherConverter(_ConverterBase):
@@ -299,7 +368,8 @@ class PublisherConverter(_ConverterBase):
         self.received(msg, msgID)
 
     def _sendToClient(self, msg, msgID, protocol, remoteID):
-        self._owner.sendToClient(self._tag, self._clsName, msgID, msg)
+        self._owner.sendToClient(self._tag, self._clsName, msgID, msg,
+                                 self._DROPPABLE)
 
 
 class SubscriberConverter(_ConverterBase):
@@ -318,14 +388,34 @@ class SubscriberConverter(_ConverterBase):
         self.received(msg, msgID)
 
     def _sendToClient(self, msg, msgID, protocol, remoteID):
-        self._owner.sendToClient(self._tag, self._clsName, msgID, msg)
+        self._owner.sendToClient(self._tag, self._clsName, msgID, msg,
+                                 self._DROPPABLE)
 
 
 class _ForwarderBase(_AbstractConverter):
     """ Class which implements the basic functionality of a Forwarder.
+
+        The messages for the robot are compressed as one stream if the robot
+        client requested it; otherwise each message is compressed on its own.
+        The messages are compressed when the connection sends them, such that
+        messages which are dropped from its queue are not part of the stream.
+        The messages from the robot can be compressed either way.
     """
     _GZIP_LVL = settings.gzip_lvl
 
+    # Higher levels only search longer through the previous messages of a
+    # stream, which costs time without reducing the size of small messages
+    _STREAM_LVL = min(settings.gzip_lvl, 6)
+
+    def __init__(self, owner, status, uid, clsName, tag):
+        _AbstractConverter.__init__(self, owner, status, uid, clsName, tag)
+
+        self._compressor = StreamCompressor(self._STREAM_LVL)
+        self._decompressor = StreamDecompressor()
+        self._epoch = None
+
+    __init__.__doc__ = _AbstractConverter.__init__.__doc__
+
     def receive(self, clsName, msgID, msg):
         """ Unwrap and inflate a JSON encoded ROS message.
 
@@ -347,10 +437,16 @@ class _ForwarderBase(_AbstractConverter):
         if not _checkIsStringIO(msg):
             raise ConversionError('Sent message is not a binary message.')
 
-        self._receive(zlib.decompress(msg.getvalue()), msgID)
+        try:
+            msg = self._decompressor.decompress(msg.getvalue())
+        except ValueError as e:
+            raise ConversionError(str(e))
+
+        self._receive(msg, msgID)
 
     def _send(self, msg, msgID, protocol, remoteID):
-        """ Wrap and deflate a ROS message in a JSON encoded message.
+        """ Send a ROS message to the robot; the message is deflated when the
+            connection sends it.
 
             @param msg:         Received ROS message in serialized form.
             @type  msg:         str
@@ -366,13 +462,36 @@ class _ForwarderBase(_AbstractConverter):
                                 message.
             @type  remoteID:    uuid.UUID
         """
-        self._sendToClient(StringIO(zlib.compress(msg, self._GZIP_LVL)),
-                           msgID, protocol, remoteID)
+        self._sendToClient(msg, msgID, protocol, remoteID)
+
+    def _compress(self, msg):
+        """ Internally used method which is called by the connection to
+            compress a serialized ROS message when it is sent to the robot.
+
+            @param msg:         ROS message in serialized form.
+            @type  msg:         str
+
+            @return:            Compressed message.
+            @rtype:             StringIO
+        """
+        epoch = self._owner.getStreamEpoch()
+
+        if epoch is None:
+            return StringIO(zlib.compress(msg, self._GZIP_LVL))
+
+        if epoch != self._epoch:
+            # Messages of the stream might have been lost
+            self._compressor.reset()
+            self._epoch = epoch
+
+        return StringIO(self._compressor.compress(msg))
 
 
 class ServiceClientForwarder(_ForwarderBase):
     """ Class which is used as a Service-Client Forwarder.
     """
+    _DROPPABLE = False
+
     def __init__(self, owner, status, uid, clsName, tag):
         _ForwarderBase.__init__(self, owner, status, uid, clsName, tag)
 
@@ -397,12 +516,18 @@ class ServiceClientForwarder(_ForwarderBase):
                 break
 
         self._pendingRequests[uid] = (msgID, protocol, remoteID)
-        self._owner.sendToClient(self._tag, self._clsName, msgID, msg)
+
+        if not self._owner.sendToClient(self._tag, self._clsName, msgID, msg,
+                                        self._DROPPABLE, self._compress):
+            # The robot will never respond to a rejected request
+            del self._pendingRequests[uid]
 
 
 class ServiceProviderForwarder(_ForwarderBase):
     """ Class which is used as a Service-Provider Forwarder.
     """
+    _DROPPABLE = False
+
     def remote_connect(self, protocol, remoteID):
         if self._protocols:
             raise InternalError('Can not register more than one interface '
@@ -416,7 +541,8 @@ class ServiceProviderForwarder(_ForwarderBase):
         self.received(msg, msgID)
 
     def _sendToClient(self, msg, msgID, protocol, remoteID):
-        self._owner.sendToClient(self._tag, self._clsName, msgID, msg)
+        self._owner.sendToClient(self._tag, self._clsName, msgID, msg,
+                                 self._DROPPABLE, self._compress)
 
 
 class PublisherForwarder(_ForwarderBase):
@@ -426,7 +552,8 @@ class PublisherForwarder(_ForwarderBase):
         self.received(msg, msgID)
 
     def _sendToClient(self, msg, msgID, protocol, remoteID):
-        self._owner.sendToClient(self._tag, self._clsName, msgID, msg)
+        self._owner.sendToClient(self._tag, self._clsName, msgID, msg,
+                                 self._DROPPABLE, self._compress)
 
 
 class SubscriberForwarder(_ForwarderBase):
@@ -436,4 +563,5 @@ class SubscriberForwarder(_ForwarderBase):
         self.received(msg, msgID)
 
     def _sendToClient(self, msg, msgID, protocol, remoteID):
-        self._owner.sendToClient(self._tag, self._clsName, msgID, msg)
+        self._owner.sendToClient(self._tag, self._clsName, msgID, msg,
+                                 self._DROPPABLE, self._compress)
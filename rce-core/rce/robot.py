@@ -31,8 +31,11 @@
 #
 
 # Python specific imports
+import os
 import sys
-from uuid import UUID
+from uuid import UUID, uuid4
+from hashlib import sha256
+from collections import deque
 
 # ROS specific imports
 from rospkg.environment import get_ros_paths
@@ -42,6 +45,9 @@ from zope.interface import implements
 
 # twisted specific imports
 from twisted.python import log
+from twisted.internet.defer import Deferred, DeferredList, succeed
+from twisted.internet.interfaces import IPushProducer
+from twisted.internet.protocol import ProcessProtocol
 from twisted.cred.credentials import UsernamePassword
 from twisted.spread.pb import PBClientFactory, \
     DeadReferenceError, PBConnectionLost
@@ -51,6 +57,8 @@ from autobahn.websocket import listenWS
 
 # rce specific imports
 from rce.util.converter import Converter
+from rce.util.settings import getSettings
+from rce.util.workerpool import WorkerPool
 from rce.util.loader import Loader
 from rce.util.interface import verifyObject
 from rce.comm.error import DeadConnection
@@ -63,6 +71,7 @@ from rce.monitor.interface.robot import PublisherConverter, \
     ServiceClientForwarder, ServiceProviderForwarder
 from rce.slave.endpoint import Endpoint
 from rce.slave.namespace import Namespace
+settings = getSettings()
 
 
 class ForwardingError(Exception):
@@ -72,10 +81,33 @@ class ForwardingError(Exception):
 
 class Connection(object):
     """ Representation of a connection to a robot client.
+
+        Data messages for the robot are queued while no protocol is registered
+        or while the transport of the protocol is congested. Messages which
+        can be dropped, i.e. topic messages, replace the oldest droppable
+        message when their limit is reached; other messages, i.e. service
+        messages, are rejected when their limit is reached and the robot is
+        informed with an error message. The limits are set with the options
+        'topic_queue' and 'service_queue' of the robot settings.
+
+        Each connection is identified by a session token. If the WebSocket
+        connection of the robot is lost, the robot can resume the session
+        within the reconnect timeout of the robot process; the Robot namespace
+        and its interfaces are kept and the queued messages are sent after
+        the reconnect. The robot reconnects to the address of the worker which
+        owns the session, as every worker has its own WebSocket port. A
+        resumed session takes over the old WebSocket connection, in case the
+        robot process has not yet noticed that the old connection is dead.
     """
-    implements(IRobot, IMessageReceiver)
+    implements(IRobot, IMessageReceiver, IPushProducer)
+
+    MAX_DROPPABLE_QUEUE = settings.topic_queue
+    MAX_QUEUE = settings.service_queue
+
+    # CONFIG
+    MAX_ERRORS = 10
 
-    def __init__(self, client, userID, robotID):
+    def __init__(self, client, userID, robotID, password):
         """ Initialize the representation of a connection to a robot client.
 
             @param userID:      User ID of the robot owner
@@ -83,7 +115,15 @@ class Connection(object):
 
             @param robotID:     Unique ID which is used to identify the robot.
             @type  robotID:     str
+
+            @param password:    Hashed password as hex-encoded string which
+                                the robot used to login. It is required to
+                                resume the session.
+            @type  password:    str
         """
+        self._session = uuid4().hex
+        self._password = sha256(password).digest()
+
         client.registerConnection(self)
         self._client = client
         self._userID = userID
@@ -92,6 +132,44 @@ class Connection(object):
         self._view = None
         self._namespace = None
         self._protocol = None
+        self._detached = False
+
+        # Outgoing data messages as tuples of the form
+        #     (droppable, iTag, clsName, msgID, msg, compress)
+        self._queue = deque()
+        self._queuedDroppable = 0
+        self._paused = False
+
+        # Error messages which are reported while no protocol is registered
+        self._errors = deque(maxlen=self.MAX_ERRORS)
+
+        # Time format, codecs and compression of the forwarders requested by
+        # the last registered protocol
+        self._numericTime = False
+        self._codecs = {}
+        self._compressedStreams = False
+
+        # Number of protocols which have been registered
+        self._registered = 0
+
+        # Counters of messages which have been dropped or rejected
+        self._dropped = 0
+        self._rejected = 0
+
+    @property
+    def queueDepth(self):
+        """ Number of data messages waiting to be sent to the robot. """
+        return len(self._queue)
+
+    @property
+    def dropped(self):
+        """ Number of droppable data messages which have been dropped. """
+        return self._dropped
+
+    @property
+    def rejected(self):
+        """ Number of non-droppable data messages which have been rejected. """
+        return self._rejected
 
     @property
     def userID(self):
@@ -103,6 +181,45 @@ class Connection(object):
         """ Robot ID used to identify the connected robot. """
         return self._robotID
 
+    @property
+    def session(self):
+        """ Token which is used to resume the session of the robot. """
+        return self._session
+
+    def resume(self, userID, robotID, password):
+        """ Claim the connection for a robot which tries to resume the
+            session after its WebSocket connection has been lost.
+
+            @param userID:      User ID under which the robot is logging in.
+            @type  userID:      str
+
+            @param robotID:     Unique ID of the robot in the namespace of the
+                                user under which the robot is logging in.
+            @type  robotID:     str
+
+            @param password:    Hashed password as hex-encoded string which is
+                                used to authenticate the user.
+            @type  password:    str
+
+            @return:            True if the session can be resumed.
+            @rtype:             bool
+        """
+        if not ((self._detached or self._protocol) and
+                userID == self._userID and robotID == self._robotID and
+                sha256(password).digest() == self._password):
+            return False
+
+        protocol = self._protocol
+
+        if protocol:
+            # The old WebSocket connection is half-open; drop it such that
+            # the new one can be registered
+            self._client.unregisterWebsocketProtocol(self, protocol)
+            protocol.dropConnection()
+
+        self._detached = False
+        return True
+
     def destroy(self):
         """ # TODO: Add doc
         """
@@ -123,6 +240,9 @@ class Connection(object):
         self._view = None
         self._avatar = None
         self._protocol = None
+        self._queue = deque()
+        self._queuedDroppable = 0
+        self._errors.clear()
 
     ###
     ### Callbacks for RobotClient
@@ -161,35 +281,251 @@ class Connection(object):
         assert self._protocol is None
         verifyObject(IServersideProtocol, protocol)
         self._protocol = protocol
+        self._paused = False
+        self._detached = False
+
+        # The time format and the codecs are kept while the robot is detached
+        # such that the queued messages match the formats requested by the
+        # robot
+        self._numericTime = protocol.sendsNumericTime()
+        self._codecs = protocol.getCodecs()
+        self._compressedStreams = protocol.sendsCompressedStreams()
+        self._registered += 1
+
+        protocol.registerProducer(self)
+
+        while self._errors:
+            protocol.sendErrorMessage(self._errors.popleft())
+
+        self._flushQueue()
 
     def unregisterProtocol(self, protocol):
         """ Unregister the client protocol.
 
             @param protocol:    Protocol which should be unregistered.
             @type  protocol:    rce.comm.interfaces.IServersideProtocol
+
+            @return:            False if the protocol is not registered,
+                                because its session has been taken over by
+                                a resumed connection; True otherwise.
+            @rtype:             bool
         """
+        if protocol is not self._protocol:
+            return False
+
+        protocol.unregisterProducer()
         self._protocol = None
+        self._detached = True
+        return True
 
     ###
     ### Callbacks for View & Namespace
     ###
 
     def reportError(self, msg):
-        self._protocol.sendErrorMessage(msg)
+        # The errors are sent as soon as a protocol is registered
+        if self._protocol:
+            self._protocol.sendErrorMessage(msg)
+        else:
+            self._errors.append(msg)
 
     reportError.__doc__ = IServersideProtocol.get('sendErrorMessage').getDoc()
 
+    def sendsBinaryArrays(self, iTag):
+        # Messages which are queued while the robot is detached are converted
+        # with lists, which every client can handle
+        return bool(self._protocol and self._protocol.sendsBinaryArrays(iTag))
 
-    def sendMessage(self, iTag, clsName, msgID, msg):
-        if not self._protocol:
-            # TODO: What should we do here?
-            #       One solution would be to queue the messages here for some
-            #       time...
-            return
+    sendsBinaryArrays.__doc__ = \
+        IServersideProtocol.get('sendsBinaryArrays').getDoc()
+
+    def sendsNumericTime(self):
+        return self._numericTime
+
+    sendsNumericTime.__doc__ = \
+        IServersideProtocol.get('sendsNumericTime').getDoc()
+
+    def getCodec(self, iTag):
+        """ Get the codec which the robot client requested for the binaries,
+            e.g. images, of the data messages of an interface.
+
+            @param iTag:        Tag which is used to identify the interface.
+            @type  iTag:        str
+
+            @return:            Codec and quality or None if the default codec
+                                should be used.
+            @rtype:             (str, int / None) / None
+        """
+        return self._codecs.get(iTag)
+
+    def getStreamEpoch(self):
+        """ Get the epoch of the compressed streams of the forwarders. The
+            epoch changes whenever a protocol has been registered, as the
+            messages which have been sent through the previous protocol
+            might have been lost, and the streams have to be reset. Queued
+            messages are compressed when they are sent; dropped or rejected
+            messages are therefore never part of a stream.
+
+            @return:            Epoch or None if the messages of the
+                                forwarders should be compressed on their own.
+            @rtype:             int / None
+        """
+        if not self._compressedStreams:
+            return None
+
+        return self._registered
+
+    def sendMessage(self, iTag, clsName, msgID, msg, droppable=True,
+                    compress=None):
+        """ Send a data message to the robot client or queue it, if the
+            message can not be sent at the moment.
+
+            @param iTag:        Tag which is used to identify the interface
+                                from which the message is sent.
+            @type  iTag:        str
+
+            @param clsName:     Message type/Service type consisting of the
+                                package and the name of the message/service,
+                                i.e. 'std_msgs/Int32'.
+            @type  clsName:     str
+
+            @param msgID:       Message ID which can be used to get a
+                                correspondence between request and response
+                                message for a service call.
+            @type  msgID:       str
+
+            @param msg:         Message which should be sent. It has to be a
+                                JSON compatible dictionary where part or the
+                                complete message can be replaced by a StringIO
+                                instance which is interpreted as binary data.
+            @type  msg:         {str : {} / base_types / StringIO} / StringIO
+
+            @param droppable:   Flag which is True if the message may be
+                                dropped while the connection is congested.
+            @type  droppable:   bool
+
+            @param compress:    Function which is called with the message when
+                                it is sent to the robot client and returns the
+                                message which is sent instead, e.g. the
+                                message compressed as part of a stream, or
+                                None if the message is sent as it is.
+            @type  compress:    callable / None
+
+            @return:            False if the message has been rejected,
+                                because the queue is full; True otherwise.
+            @rtype:             bool
+        """
+        if self._protocol and not self._paused and not self._queue:
+            if compress:
+                msg = compress(msg)
+
+            self._protocol.sendDataMessage(iTag, clsName, msgID, msg)
+            return True
+
+        if droppable:
+            if (self._queuedDroppable >= self.MAX_DROPPABLE_QUEUE and
+                not self._dropOldest()):
+                # No topic messages are queued at all, i.e. the limit is 0
+                self._dropped += 1
+                return True
+
+            self._queuedDroppable += 1
+        elif len(self._queue) - self._queuedDroppable >= self.MAX_QUEUE:
+            self._reject(iTag, msgID)
+            return False
+
+        self._queue.append((droppable, iTag, clsName, msgID, msg, compress))
+        return True
+
+    def discardMessage(self, iTag, msgID, droppable=True):
+        """ Count a data message which has been discarded before it reached
+            the queue, e.g. because the conversion of the messages of its
+            interface is congested. Messages which can not be dropped are
+            reported to the robot as rejected.
+
+            @param iTag:        Tag which is used to identify the interface
+                                of the message.
+            @type  iTag:        str
+
+            @param msgID:       Message ID of the discarded message.
+            @type  msgID:       str
+
+            @param droppable:   Flag which is True if the message is a
+                                droppable message.
+            @type  droppable:   bool
+        """
+        if droppable:
+            self._dropped += 1
+        else:
+            self._reject(iTag, msgID)
+
+    def _reject(self, iTag, msgID):
+        """ Internally used method to count a rejected message and to
+            inform the robot.
+        """
+        self._rejected += 1
+        error = ("Message '{0}' from interface '{1}' has been rejected, "
+                 'because the queue is full.'.format(msgID, iTag))
+        log.msg("{0} (robot '{1}')".format(error, self._robotID))
+        self.reportError(error)
+
+    def _dropOldest(self):
+        """ Internally used method to drop the oldest droppable message from
+            the queue.
+
+            @return:            True if a message has been dropped; False if
+                                the queue contains no droppable message.
+            @rtype:             bool
+        """
+        queue = self._queue
+
+        for i, entry in enumerate(queue):
+            if entry[0]:
+                del queue[i]
+                self._queuedDroppable -= 1
+                self._dropped += 1
+                return True
+
+        return False
+
+    def _flushQueue(self):
+        """ Internally used method to send the queued messages until the
+            queue is empty or the transport is congested.
+        """
+        queue = self._queue
 
-        self._protocol.sendDataMessage(iTag, clsName, msgID, msg)
+        while queue and self._protocol and not self._paused:
+            droppable, iTag, clsName, msgID, msg, compress = queue.popleft()
 
-    sendMessage.__doc__ = IServersideProtocol.get('sendDataMessage').getDoc()
+            if droppable:
+                self._queuedDroppable -= 1
+
+            if compress:
+                msg = compress(msg)
+
+            self._protocol.sendDataMessage(iTag, clsName, msgID, msg)
+
+    ###
+    ### Callbacks for the transport of the registered protocol
+    ###
+
+    def pauseProducing(self):
+        """ Callback for the transport to signal that its buffer is full.
+        """
+        self._paused = True
+
+    def resumeProducing(self):
+        """ Callback for the transport to signal that its buffer has been
+            drained.
+        """
+        self._paused = False
+        self._flushQueue()
+
+    def stopProducing(self):
+        """ Callback for the transport to signal that the connection has been
+            lost.
+        """
+        self._paused = True
 
     ###
     ### Forwarding to View
@@ -259,6 +595,14 @@ class Connection(object):
 
     removeParameter.__doc__ = IRobot.get('removeParameter').getDoc()
 
+    def configureComponent(self, config):
+        if not self._view:
+            raise ForwardingError('Reference of the view is missing.')
+
+        self._view.configureComponent(config)
+
+    configureComponent.__doc__ = IRobot.get('configureComponent').getDoc()
+
     def addConnection(self, tagA, tagB):
         if not self._view:
             raise ForwardingError('Reference of the view is missing.')
@@ -397,6 +741,16 @@ class RobotView(object):
 
     removeParameter.__doc__ = IRobot.get('removeParameter').getDoc()
 
+    def configureComponent(self, config):
+        try:
+            d = self._view.callRemote('configureComponent', config)
+        except (DeadReferenceError, PBConnectionLost):
+            raise DeadConnection()
+
+        d.addErrback(self._reportError)
+
+    configureComponent.__doc__ = IRobot.get('configureComponent').getDoc()
+
     def addConnection(self, tagA, tagB):
         try:
             d = self._view.callRemote('addConnection', tagA, tagB)
@@ -455,6 +809,13 @@ class Robot(Namespace):
         """
         return self._client.converter
 
+    @property
+    def workerPool(self):
+        """ Reference to the worker pool used by the Converter interfaces or
+            None if the messages are converted in the reactor.
+        """
+        return self._client.workerPool
+
     @property
     def loader(self):
         """ Reference to ROS components loader. """
@@ -499,7 +860,56 @@ class Robot(Namespace):
         except (DeadReferenceError, PBConnectionLost):
             raise DeadConnection()
 
-    def sendToClient(self, iTag, msgType, msgID, msg):
+    def sendsBinaryArrays(self, iTag):
+        """ Check whether the byte arrays, i.e. uint8[] fields, of the data
+            messages of an interface can be sent to the robot client as
+            binaries.
+
+            @param iTag:        Tag which is used to identify the interface.
+            @type  iTag:        str
+
+            @return:            True if the byte arrays can be sent as
+                                binaries.
+            @rtype:             bool
+        """
+        return bool(self._connection and
+                    self._connection.sendsBinaryArrays(iTag))
+
+    def sendsNumericTime(self):
+        """ Check whether the times and durations in the data messages should
+            be sent to the robot client in the numeric form, i.e. as
+            dictionaries with the keys 'secs' and 'nsecs'.
+
+            @return:            True if the numeric form should be used.
+            @rtype:             bool
+        """
+        return bool(self._connection and self._connection.sendsNumericTime())
+
+    def getCodec(self, iTag):
+        """ Get the codec which the robot client requested for the binaries,
+            e.g. images, of the data messages of an interface.
+
+            @param iTag:        Tag which is used to identify the interface.
+            @type  iTag:        str
+
+            @return:            Codec and quality or None if the default codec
+                                should be used.
+            @rtype:             (str, int / None) / None
+        """
+        return self._connection and self._connection.getCodec(iTag)
+
+    def getStreamEpoch(self):
+        """ Get the epoch of the compressed streams of the forwarders; the
+            streams have to be reset whenever the epoch changes.
+
+            @return:            Epoch or None if the messages of the
+                                forwarders should be compressed on their own.
+            @rtype:             int / None
+        """
+        return self._connection and self._connection.getStreamEpoch()
+
+    def sendToClient(self, iTag, msgType, msgID, msg, droppable=True,
+                     compress=None):
         """ Process a data message which has been received from an interface
             send the message to the registered connection.
 
@@ -522,8 +932,43 @@ class Robot(Namespace):
                                 complete message can be replaced by a StringIO
                                 instance which is interpreted as binary data.
             @type  msg:         {str : {} / base_types / StringIO} / StringIO
+
+            @param droppable:   Flag which is True if the message may be
+                                dropped while the connection is congested.
+            @type  droppable:   bool
+
+            @param compress:    Function which is called with the message when
+                                it is sent to the robot client; refer to
+                                Connection.sendMessage for more information.
+            @type  compress:    callable / None
+
+            @return:            False if the message has been rejected,
+                                because the queue of the connection is full;
+                                True otherwise.
+            @rtype:             bool
         """
-        self._connection.sendMessage(iTag, msgType, msgID, msg)
+        return self._connection.sendMessage(iTag, msgType, msgID, msg,
+                                            droppable, compress)
+
+    def discardMessage(self, iTag, msgID, droppable=True):
+        """ Count a data message of an interface which has been discarded,
+            because the conversion of the messages of the interface is
+            congested.
+
+            @param iTag:        Tag which is used to identify the interface
+                                of the message.
+            @type  iTag:        str
+
+            @param msgID:       Message ID of the discarded message.
+            @type  msgID:       str
+
+            @param droppable:   Flag which is True if the message is a
+                                droppable message; otherwise the robot is
+                                informed that the message has been rejected.
+            @type  droppable:   bool
+        """
+        if self._connection:
+            self._connection.discardMessage(iTag, msgID, droppable)
 
     def remote_createInterface(self, status, uid, iType, msgType, tag):
         """ Create an Interface object in the robot namespace and therefore in
@@ -615,7 +1060,7 @@ class RobotClient(Endpoint):
     RECONNECT_TIMEOUT = 10
 
     def __init__(self, reactor, masterIP, masterPort, commPort, extIP, extPort,
-                 loader, converter):
+                 loader, converter, workerPool=None):
         """ Initialize the Robot Client.
 
             @param reactor:     Reference to the twisted reactor used in this
@@ -651,6 +1096,12 @@ class RobotClient(Endpoint):
                                 messages from JSON to ROS message and vice
                                 versa.
             @type  converter:   rce.util.converter.Converter
+
+            @param workerPool:  Worker pool which is used by the Converter
+                                interfaces to convert the messages off the
+                                reactor or None if the messages should be
+                                converted in the reactor.
+            @type  workerPool:  rce.util.workerpool.WorkerPool
         """
         Endpoint.__init__(self, reactor, commPort)
 
@@ -658,10 +1109,12 @@ class RobotClient(Endpoint):
         self._masterPort = masterPort
         self._extAddress = '{0}:{1}'.format(extIP, extPort)
         self._converter = converter
+        self._workerPool = workerPool
         self._loader = loader
 
         self._connections = set()
         self._deathCandidates = {}
+        self._sessions = {}
 
     @property
     def converter(self):
@@ -670,6 +1123,13 @@ class RobotClient(Endpoint):
         """
         return self._converter
 
+    @property
+    def workerPool(self):
+        """ Reference to the worker pool used by the Converter interfaces or
+            None if the messages are converted in the reactor.
+        """
+        return self._workerPool
+
     @property
     def loader(self):
         """ Reference to ROS components loader. """
@@ -678,6 +1138,7 @@ class RobotClient(Endpoint):
     def registerConnection(self, connection):
         assert connection not in self._connections
         self._connections.add(connection)
+        self._sessions[connection.session] = connection
 
         # Add the connection also to the death candidates
         assert connection not in self._deathCandidates
@@ -696,6 +1157,7 @@ class RobotClient(Endpoint):
 
         # Unregister the candidates
         self._connections.remove(connection)
+        del self._sessions[connection.session]
 
     def _killConnection(self, connection):
         """ Internally used method to destroy a connection whose reconnect
@@ -768,9 +1230,13 @@ class RobotClient(Endpoint):
         connection.registerStatus(status)
         return connection
 
-    def login(self, userID, robotID, password):
+    def login(self, userID, robotID, password, session=None):
         """ Callback for Robot connection to login and authenticate.
 
+            If the session can be resumed, the existing connection is returned
+            without contacting the Master process; otherwise, a new session is
+            started.
+
             @param userID:      User ID under which the robot is logging in.
             @type  userID:      str
 
@@ -782,12 +1248,25 @@ class RobotClient(Endpoint):
                                 used to authenticate the user.
             @type  password:    str
 
+            @param session:     Token of the session which the robot tries to
+                                resume or None, if a new session should be
+                                started.
+            @type  session:     str
+
             @return:            Representation of the connection to the robot
                                 which is used in the Robot process.
                                 (type: rce.robot.Connection)
             @rtype:             twisted.internet.defer.Deferred
         """
-        conn = Connection(self, userID, robotID)
+        if session:
+            conn = self._sessions.get(session)
+
+            if conn and conn.resume(userID, robotID, password):
+                log.msg("Resumed session of robot '{0}' of user "
+                        "'{1}'.".format(robotID, userID))
+                return succeed(conn)
+
+        conn = Connection(self, userID, robotID, password)
 
         factory = PBClientFactory()
         self._reactor.connectTCP(self._masterIP, self._masterPort, factory)
@@ -822,13 +1301,14 @@ class RobotClient(Endpoint):
             @param protocol:    Protocol which should be unregistered.
             @type  protocol:    rce.comm.interfaces.IServersideProtocol
         """
+        if not connection.unregisterProtocol(protocol):
+            return
+
         assert connection not in self._deathCandidates
         deathCall = self._reactor.callLater(self.RECONNECT_TIMEOUT,
                                             self._killConnection, connection)
         self._deathCandidates[connection] = deathCall
 
-        connection.unregisterProtocol(protocol)
-
     def remote_getWebsocketAddress(self):
         """ Get the address of the WebSocket server running in this process.
 
@@ -839,6 +1319,19 @@ class RobotClient(Endpoint):
         """
         return self._extAddress
 
+    def remote_getConversionStats(self):
+        """ Get the statistics of the conversion of the data messages off the
+            reactor.
+
+            @return:            Queue depth and latency histograms of the
+                                worker pool; refer to
+                                rce.util.workerpool.WorkerPool.getStats for
+                                more information. None is returned if the
+                                messages are converted in the reactor.
+            @rtype:             dict / None
+        """
+        return self._workerPool and self._workerPool.getStats()
+
     def terminate(self):
         """ Method should be called to terminate the client before the reactor
             is stopped.
@@ -859,10 +1352,81 @@ class RobotClient(Endpoint):
         Endpoint.terminate(self)
 
 
+class _WorkerProtocol(ProcessProtocol):
+    """ Process protocol which is used to monitor a worker of the robot
+        process.
+    """
+    def __init__(self, nr):
+        self.nr = nr
+        self.ended = Deferred()
+
+    def processEnded(self, reason):
+        print('Robot worker {0} exited: {1}'.format(self.nr,
+                                                    reason.getErrorMessage()))
+        self.ended.callback(None)
+
+
+def runWorkers(reactor, workers, argv):
+    """ Run the robot process as a supervisor for multiple worker processes.
+
+        Each worker registers with the Master as its own robot endpoint and
+        listens on its own WebSocket port, i.e. worker i uses the port
+        'extPort + i'. Therefore, the address which the Master hands out to
+        a robot selects the worker which serves the robot.
+
+        @param reactor:     Reference to the twisted reactor.
+        @type  reactor:     twisted::reactor
+
+        @param workers:     Number of worker processes which should be
+                            started.
+        @type  workers:     int
+
+        @param argv:        Command which is used to start a worker; the
+                            worker number is appended as the last argument.
+        @type  argv:        [str]
+    """
+    log.startLogging(sys.stdout)
+
+    protocols = []
+    terminating = []
+
+    for nr in xrange(workers):
+        protocol = _WorkerProtocol(nr)
+        reactor.spawnProcess(protocol, argv[0], argv + [str(nr)],
+                             env=os.environ, childFDs={0:0, 1:1, 2:2})
+        protocols.append(protocol)
+
+    def stopped(_):
+        if not terminating:
+            reactor.stop()
+
+    def terminate():
+        terminating.append(True)
+
+        for protocol in protocols:
+            if not protocol.ended.called:
+                protocol.transport.signalProcess('TERM')
+
+        return DeferredList([p.ended for p in protocols])
+
+    DeferredList([p.ended for p in protocols]).addCallback(stopped)
+    reactor.addSystemEventTrigger('before', 'shutdown', terminate)
+    reactor.run()
+
+
 def main(reactor, cred, masterIP, masterPort, consolePort,
-		extIP, extPort, commPort, pkgPath, customConverters):
+		extIP, extPort, commPort, pkgPath, customConverters,
+		batchInterval, batchSize, compressThreshold, compressLevel,
+		chunkSize, chunkMemory, conversionThreads=0, codec=None,
+		worker=None):
     log.startLogging(sys.stdout)
 
+    # Each worker has its own servers for the internal and the external
+    # communication
+    if worker is not None:
+        commPort += worker
+        extPort += worker
+
     def _err(reason):
         print(reason)
         reactor.stop()
@@ -886,15 +1450,28 @@ def main(reactor, cred, masterIP, masterPort, consolePort,
         mod = __import__(module, fromlist=[className])
         converter.addCustomConverter(getattr(mod, className))
 
+    if conversionThreads > 0:
+        workerPool = WorkerPool(reactor, conversionThreads)
+    else:
+        workerPool = None
+
     client = RobotClient(reactor, masterIP, consolePort, commPort, extIP,
-                         extPort, loader, converter)
-    d = factory.login(cred, client)
+                         extPort, loader, converter, workerPool)
+    d = factory.login(cred, (client, commPort))
     d.addCallback(lambda ref: setattr(client, '_avatar', ref))
     d.addErrback(_err)
 
     #portal = Portal(client, (client,))
     robot = CloudEngineWebSocketFactory(client,
-                                        'ws://localhost:{0}'.format(extPort))
+                                        'ws://localhost:{0}'.format(extPort),
+                                        codec=codec,
+                                        batchInterval=batchInterval or None,
+                                        batchSize=batchSize,
+                                        compressThreshold=(compressThreshold
+                                                           or None),
+                                        compressLevel=compressLevel,
+                                        chunkSize=chunkSize,
+                                        chunkMemory=chunkMemory)
     listenWS(robot)
 
     reactor.addSystemEventTrigger('before', 'shutdown', client.terminate)
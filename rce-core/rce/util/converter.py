@@ -32,8 +32,14 @@
 
 # Python specific imports
 import time
+import struct
+import calendar
+from array import array
 from datetime import datetime
 from functools import partial
+from itertools import izip
+from threading import Lock
+from collections import OrderedDict
 
 try:
     from cStringIO import StringIO, InputType, OutputType
@@ -47,6 +53,11 @@ except ImportError:
     def _checkIsStringIO(obj):
         return isinstance(obj, StringIO)
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 # ROS specific imports
 from genmsg.names import package_resource_name
 from genpy.message import Message
@@ -73,72 +84,758 @@ def _stringify(obj):
         raise TypeError('Object is not a string.')
 
 
+def _decodeNumeric(data):
+    """ Internally used method to decode a time or duration which is given
+        in the numeric form, i.e. as a dictionary with the keys 'secs' and
+        'nsecs' or as a list [secs, nsecs].
+
+        @return:        Seconds and nanoseconds or None if the data is not in
+                        the numeric form.
+    """
+    if isinstance(data, dict):
+        secs, nsecs = int(data.get('secs', 0)), int(data.get('nsecs', 0))
+    elif isinstance(data, (list, tuple)):
+        if len(data) != 2:
+            raise ValueError('Time has to consist of seconds and '
+                             'nanoseconds.')
+
+        secs, nsecs = int(data[0]), int(data[1])
+    else:
+        return None
+
+    # Canonical form as used by rospy, i.e. 0 <= nsecs < 1e9
+    return secs + nsecs // 1000000000, nsecs % 1000000000
+
+
 class _DurationConverter(object):
     """ Convert ROS Duration type to JSON style and back.
+
+        Durations are encoded as float in seconds or in the numeric form,
+        i.e. as a dictionary with the keys 'secs' and 'nsecs'. Both forms are
+        accepted when decoding.
     """
     implements(ICustomROSConverter)
 
+    def __init__(self, numeric=False):
+        """ Initialize the Duration converter.
+
+            @param numeric:     Flag which is True if the durations should be
+                                encoded in the numeric form.
+            @type  numeric:     bool
+        """
+        self._numeric = numeric
+
+    def decodeParts(self, data):
+        """ Get the seconds and nanoseconds of an encoded duration.
+        """
+        parts = _decodeNumeric(data)
+
+        if parts is not None:
+            return parts
+
+        duration = Duration.from_sec(float(data))
+        return duration.secs, duration.nsecs
+
+    def encodeParts(self, secs, nsecs):
+        """ Encode a duration given by its seconds and nanoseconds.
+        """
+        if self._numeric:
+            return {'secs' : secs, 'nsecs' : nsecs}
+
+        return secs + nsecs * 1e-9
+
     def decode(self, data):
         """ Generate a rospy.rostime.Duration instance based on the given data
-            which should be a string representation of a float.
+            which should be a float or a string representation of a float or
+            be in the numeric form.
         """
-        return Duration.from_sec(float(data))
+        return Duration(*self.decodeParts(data))
 
     def encode(self, rosMsg):
-        """ Transform the rospy.rostime.Duration instance to a float.
+        """ Transform the rospy.rostime.Duration instance to a float or to the
+            numeric form.
         """
         try:
-            return (rosMsg.to_sec(), {})
+            return self.encodeParts(rosMsg.secs, rosMsg.nsecs)
         except AttributeError:
             raise TypeError('Received object is not a Duration instance.')
 
 
 class _TimeConverter(object):
     """ Convert ROS Time type to JSON style and back.
+
+        Times are encoded as string of the form 'YYYY-MM-DDTHH:MM:SS.fffffffff'
+        (ISO 8601, UTC) or in the numeric form, i.e. as a dictionary with the
+        keys 'secs' and 'nsecs'. Both forms are accepted when decoding; the
+        ISO 8601 strings may contain a UTC offset and have a fraction with up
+        to nine digits.
+
+        As the times of consecutive messages are mostly within the same second,
+        the date and time part of the last converted time is cached.
     """
     implements(ICustomROSConverter)
 
-    def decode(self, data):
-        """ Generate a rospy.rostime.Time instance based on the given data of
-            the form 'YYYY-MM-DDTHH:MM:SS.mmmmmm' (ISO 8601).
+    def __init__(self, numeric=False):
+        """ Initialize the Time converter.
+
+            @param numeric:     Flag which is True if the times should be
+                                encoded in the numeric form.
+            @type  numeric:     bool
         """
-        if '+' in data:
-            data = data[:data.index('+')]
+        self._numeric = numeric
+
+        # Tuples of the form (seconds, 'YYYY-MM-DDTHH:MM:SS'); the tuples are
+        # replaced as a whole such that the converter can be used by multiple
+        # threads
+        self._encoded = (None, None)
+        self._decoded = (None, None)
+
+    def decodeParts(self, data):
+        """ Get the seconds and nanoseconds of an encoded time.
+        """
+        parts = _decodeNumeric(data)
+
+        if parts is not None:
+            return parts
+
+        data = _stringify(data)
+        offset = 0
 
         try:
-            dt = datetime(year=int(data[0:4]), month=int(data[5:7]),
-                          day=int(data[8:10]), hour=int(data[11:13]),
-                          minute=int(data[14:16]), second=int(data[17:19]),
-                          microsecond=int(data[20:]))
+            if data[-1:] == 'Z':
+                data = data[:-1]
+            elif len(data) > 19 and data[-6] in '+-' and data[-3] == ':':
+                offset = int(data[-5:-3]) * 3600 + int(data[-2:]) * 60
+
+                if data[-6] == '+':
+                    offset = -offset
+
+                data = data[:-6]
+
+            key = data[:19]
+            fraction = data[20:]
+            cached, secs = self._decoded
+
+            if key != cached:
+                secs = calendar.timegm(datetime(
+                    year=int(key[0:4]), month=int(key[5:7]),
+                    day=int(key[8:10]), hour=int(key[11:13]),
+                    minute=int(key[14:16]),
+                    second=int(key[17:19])).utctimetuple())
+                self._decoded = (key, secs)
+
+            nsecs = int(fraction[:9].ljust(9, '0')) if fraction else 0
         except ValueError:
-            return Time()
+            return 0, 0
+
+        return secs + offset, nsecs
+
+    def encodeParts(self, secs, nsecs):
+        """ Encode a time given by its seconds and nanoseconds.
+        """
+        if self._numeric:
+            return {'secs' : secs, 'nsecs' : nsecs}
+
+        cached, prefix = self._encoded
+
+        if secs != cached:
+            prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(secs))
+            self._encoded = (secs, prefix)
+
+        if not nsecs:
+            return prefix
+        elif nsecs % 1000:
+            return '{0}.{1:09d}'.format(prefix, nsecs)
 
-        return Time.from_sec(time.mktime(dt.timetuple()))
+        return '{0}.{1:06d}'.format(prefix, nsecs // 1000)
+
+    def decode(self, data):
+        """ Generate a rospy.rostime.Time instance based on the given data of
+            the form 'YYYY-MM-DDTHH:MM:SS.fffffffff' (ISO 8601) or in the
+            numeric form.
+        """
+        return Time(*self.decodeParts(data))
 
     def encode(self, rosMsg):
         """ Transform the rospy.rostime.Time instance to a string of the form
-            'YYYY-MM-DDTHH:MM:SS.mmmmmm' (ISO 8601).
+            'YYYY-MM-DDTHH:MM:SS.fffffffff' (ISO 8601, UTC) or to the numeric
+            form.
         """
         try:
-            dt = datetime.fromtimestamp(rosMsg.to_sec())
+            return self.encodeParts(rosMsg.secs, rosMsg.nsecs)
         except AttributeError:
             raise TypeError('Received object is not a Time instance.')
 
-        return (dt.isoformat(), {})
-
 
 # Check custom time classes whether the interface is correctly implemented
 verifyClass(ICustomROSConverter, _DurationConverter)
 verifyClass(ICustomROSConverter, _TimeConverter)
 
 
+def _decodeList(convFunc, field):
+    """ Internally used method to decode a list field of a ROS message.
+    """
+    if not isinstance(field, (list, tuple)):
+        raise TypeError('Given data does not match the definition of the ROS '
+                        'message.')
+
+    return map(convFunc, field)
+
+
+_NAN = float('nan')
+
+
+def _decodeFloat(value):
+    """ Internally used method to decode an element of a floating point array;
+        null values are decoded as NaN.
+    """
+    if value is None:
+        return _NAN
+
+    return float(value)
+
+
+def _encodeArray(dtype, convFunc, threshold, field):
+    """ Internally used method to encode an array field of a primitive type
+        in bulk using NumPy.
+    """
+    if isinstance(field, numpy.ndarray):
+        return field.tolist()
+    elif isinstance(field, str):
+        # genpy represents uint8 arrays as strings
+        return numpy.frombuffer(field, dtype).tolist()
+    elif len(field) < threshold:
+        return map(convFunc, field)
+
+    return numpy.fromiter(field, dtype, len(field)).tolist()
+
+
+def _decodeArray(dtype, convFunc, threshold, field):
+    """ Internally used method to decode an array field of a floating point
+        type in bulk using NumPy; null values are decoded as NaN.
+    """
+    if not isinstance(field, (list, tuple)):
+        raise TypeError('Given data does not match the definition of the ROS '
+                        'message.')
+    elif len(field) < threshold:
+        return map(convFunc, field)
+
+    return numpy.fromiter(field, dtype, len(field)).tolist()
+
+
+def _encodeBinary(typecode, field):
+    """ Internally used method to encode a byte array field of a ROS message
+        as binary data.
+    """
+    if not isinstance(field, str):
+        try:
+            field = array(typecode, field).tostring()
+        except OverflowError as e:
+            raise ValueError(str(e))
+
+    return StringIO(field)
+
+
+def _encodeByteList(typecode, convFunc, field):
+    """ Internally used method to encode a byte array field of a ROS message
+        as a list of integers.
+    """
+    if isinstance(field, str):
+        # genpy represents uint8 arrays as strings
+        return array(typecode, field).tolist()
+
+    return map(convFunc, field)
+
+
+def _decodeBinary(typecode, convFunc, field):
+    """ Internally used method to decode a byte array field of a ROS message
+        which is either given as binary data or as a list of integers.
+    """
+    if _checkIsStringIO(field):
+        field = field.getvalue()
+
+        if typecode == 'B':
+            # genpy represents uint8 arrays as strings
+            return field
+
+        return array(typecode, field).tolist()
+
+    return convFunc(field)
+
+
+### Direct translation of serialized ROS messages
+# The readers of the elements of a serialized ROS message have the signature
+#     read(buff, offset) -> (value, offset)
+# and the writers of the elements have the signature
+#     write(value, chunks)
+# where the serialized element is appended to the list 'chunks'.
+#
+# The nested messages are flattened into their parent message such that
+# consecutive fields of primitive types are read and written with a single
+# struct. The readers and writers of the fields work on the list 'containers'
+# which holds the dictionaries of the message and all its nested messages.
+_UINT32 = struct.Struct('<I')
+_EMPTY = {}
+
+
+def _readLength(length, buff, offset):
+    """ Internally used method to read the number of elements of an array;
+        the length is None for arrays of variable length.
+    """
+    if length is None:
+        return _UINT32.unpack_from(buff, offset)[0], offset + 4
+
+    return length, offset
+
+
+def _writeLength(length, n, chunks):
+    """ Internally used method to write the number of elements of an array;
+        the length is None for arrays of variable length.
+    """
+    if length is None:
+        chunks.append(_UINT32.pack(n))
+    elif n != length:
+        raise ValueError('Array has to contain {0} elements.'.format(length))
+
+
+def _checkList(values):
+    """ Internally used method to check that an array field is a list.
+    """
+    if not isinstance(values, (list, tuple)):
+        raise TypeError('Given data does not match the definition of the ROS '
+                        'message.')
+
+
+def _readScalars(st, fields):
+    """ Internally used method to create the reader of consecutive fields of
+        primitive types; fields are tuples of the form
+            (container index, name)
+    """
+    unpack = st.unpack_from
+    size = st.size
+
+    def read(buff, offset, containers):
+        for (index, name), value in izip(fields, unpack(buff, offset)):
+            containers[index][name] = value
+
+        return offset + size
+
+    return read
+
+
+def _writeScalars(st, fields):
+    """ Internally used method to create the writer of consecutive fields of
+        primitive types; fields are tuples of the form
+            (container index, name, convFunc)
+    """
+    pack = st.pack
+
+    def write(containers, chunks):
+        values = []
+
+        for index, name, convFunc in fields:
+            data = containers[index]
+            values.append(convFunc(data[name]) if name in data else 0)
+
+        chunks.append(pack(*values))
+
+    return write
+
+
+def _readField(index, name, readElement):
+    """ Internally used method to create the reader of a single field.
+    """
+    def read(buff, offset, containers):
+        containers[index][name], offset = readElement(buff, offset)
+        return offset
+
+    return read
+
+
+def _writeField(index, name, writeElement, default):
+    """ Internally used method to create the writer of a single field; the
+        serialized default is used if the field is missing.
+    """
+    def write(containers, chunks):
+        data = containers[index]
+
+        if name in data:
+            writeElement(data[name], chunks)
+        else:
+            chunks.append(default)
+
+    return write
+
+
+def _readString(buff, offset):
+    length, = _UINT32.unpack_from(buff, offset)
+    offset += 4
+    return buff[offset:offset + length], offset + length
+
+
+def _writeString(value, chunks):
+    value = _stringify(value)
+    chunks.append(_UINT32.pack(len(value)))
+    chunks.append(value)
+
+
+def _readSpecial(st, convFunc):
+    """ Internally used method to create the reader of a time or duration;
+        the converter function takes the seconds and nanoseconds.
+    """
+    unpack = st.unpack_from
+    size = st.size
+
+    def read(buff, offset):
+        return convFunc(*unpack(buff, offset)), offset + size
+
+    return read
+
+
+def _writeSpecial(st, convFunc):
+    """ Internally used method to create the writer of a time or duration;
+        the converter function returns the seconds and nanoseconds.
+    """
+    pack = st.pack
+
+    def write(value, chunks):
+        chunks.append(pack(*convFunc(value)))
+
+    return write
+
+
+def _readMessage(links, ops):
+    """ Internally used method to create the reader of a message; links are
+        tuples of the form
+            (parent container index, name)
+        for the nested messages.
+    """
+    def read(buff, offset):
+        containers = [{}]
+
+        for parent, name in links:
+            containers[parent][name] = data = {}
+            containers.append(data)
+
+        for op in ops:
+            offset = op(buff, offset, containers)
+
+        return containers[0], offset
+
+    return read
+
+
+def _writeMessage(links, ops):
+    """ Internally used method to create the writer of a message; links are
+        tuples of the form
+            (parent container index, name)
+        for the nested messages.
+    """
+    def write(data, chunks):
+        if not isinstance(data, dict):
+            raise TypeError('Given data does not match the definition of the '
+                            'ROS message.')
+
+        containers = [data]
+
+        for parent, name in links:
+            data = containers[parent].get(name, _EMPTY)
+
+            if not isinstance(data, dict):
+                raise TypeError('Given data does not match the definition of '
+                                'the ROS message.')
+
+            containers.append(data)
+
+        for op in ops:
+            op(containers, chunks)
+
+    return write
+
+
+def _readPrimitives(code, dtype, threshold, length):
+    """ Internally used method to create the reader of an array of a primitive
+        type; NumPy is used if a dtype is given.
+    """
+    size = struct.calcsize('<' + code)
+
+    def read(buff, offset):
+        n, offset = _readLength(length, buff, offset)
+
+        if dtype is not None and n >= threshold:
+            values = numpy.frombuffer(buff, dtype, n, offset).tolist()
+        else:
+            values = list(struct.unpack_from('<{0}{1}'.format(n, code), buff,
+                                             offset))
+
+        return values, offset + n * size
+
+    return read
+
+
+def _writePrimitives(code, convFunc, dtype, threshold, length):
+    """ Internally used method to create the writer of an array of a primitive
+        type; NumPy is used if a dtype is given.
+    """
+    def write(values, chunks):
+        _checkList(values)
+        n = len(values)
+        _writeLength(length, n, chunks)
+
+        if dtype is not None and n >= threshold:
+            chunks.append(numpy.fromiter(values, dtype, n).tostring())
+        else:
+            chunks.append(struct.pack('<{0}{1}'.format(n, code),
+                                      *map(convFunc, values)))
+
+    return write
+
+
+def _readBytes(typecode, binary, length):
+    """ Internally used method to create the reader of a byte array.
+    """
+    def read(buff, offset):
+        n, offset = _readLength(length, buff, offset)
+        end = offset + n
+
+        if binary:
+            return StringIO(buff[offset:end]), end
+
+        return array(typecode, buff[offset:end]).tolist(), end
+
+    return read
+
+
+def _writeBytes(typecode, length):
+    """ Internally used method to create the writer of a byte array.
+    """
+    def write(values, chunks):
+        if _checkIsStringIO(values):
+            values = values.getvalue()
+        else:
+            _checkList(values)
+
+            try:
+                values = array(typecode, map(int, values)).tostring()
+            except OverflowError as e:
+                raise ValueError(str(e))
+
+        _writeLength(length, len(values), chunks)
+        chunks.append(values)
+
+    return write
+
+
+def _readStrings(length):
+    """ Internally used method to create the reader of an array of strings.
+    """
+    unpack = _UINT32.unpack_from
+
+    def read(buff, offset):
+        n, offset = _readLength(length, buff, offset)
+        values = []
+        append = values.append
+
+        for _ in xrange(n):
+            size, = unpack(buff, offset)
+            offset += 4
+            append(buff[offset:offset + size])
+            offset += size
+
+        return values, offset
+
+    return read
+
+
+def _writeStrings(length):
+    """ Internally used method to create the writer of an array of strings.
+    """
+    pack = _UINT32.pack
+
+    def write(values, chunks):
+        _checkList(values)
+        _writeLength(length, len(values), chunks)
+
+        for value in values:
+            value = _stringify(value)
+            chunks.append(pack(len(value)))
+            chunks.append(value)
+
+    return write
+
+
+def _readArray(readElement, length):
+    """ Internally used method to create the reader of an array of strings,
+        times, durations or messages.
+    """
+    def read(buff, offset):
+        n, offset = _readLength(length, buff, offset)
+        values = []
+        append = values.append
+
+        for _ in xrange(n):
+            value, offset = readElement(buff, offset)
+            append(value)
+
+        return values, offset
+
+    return read
+
+
+def _writeArray(writeElement, length):
+    """ Internally used method to create the writer of an array of strings,
+        times, durations or messages.
+    """
+    def write(values, chunks):
+        _checkList(values)
+        _writeLength(length, len(values), chunks)
+
+        for value in values:
+            writeElement(value, chunks)
+
+    return write
+
+
+def _readSerialized(read, msg):
+    """ Internally used method to translate a serialized ROS message using
+        its reader.
+    """
+    try:
+        data, offset = read(msg, 0)
+    except struct.error as e:
+        raise ValueError('Serialized message is invalid: {0}'.format(e))
+
+    if offset != len(msg):
+        raise ValueError('Serialized message has an invalid length.')
+
+    return data
+
+
+def _writeSerialized(write, data):
+    """ Internally used method to translate JSON compatible data into a
+        serialized ROS message using its writer.
+    """
+    chunks = []
+
+    try:
+        write(data, chunks)
+    except (struct.error, OverflowError) as e:
+        raise ValueError(str(e))
+
+    return ''.join(chunks)
+
+
+def _serialize(rosMsg):
+    """ Internally used method to serialize a ROS message.
+    """
+    buf = StringIO()
+    rosMsg.serialize(buf)
+    return buf.getvalue()
+
+
+class _PlanCache(object):
+    """ Cache for the compiled conversion plans of the ROS message classes
+        which keeps only the least recently used plans.
+
+        The cache can be used by multiple threads; a plan which is missing
+        might be compiled more than once, as the plans are compiled outside
+        of the lock, which allows the nested plans to be compiled using the
+        same cache.
+    """
+    def __init__(self, size):
+        """ Initialize the cache.
+
+            @param size:        Maximal number of plans in the cache.
+            @type  size:        int
+        """
+        self._size = size
+        self._plans = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, msgCls, compile):
+        """ Get the plan for a ROS message class.
+
+            @param msgCls:      ROS message class for which the plan should be
+                                returned.
+            @type  msgCls:      ROS Message class
+
+            @param compile:     Callable which is used to compile the plan if
+                                it is not in the cache.
+            @type  compile:     callable
+
+            @return:            Plan for the ROS message class.
+        """
+        plans = self._plans
+
+        with self._lock:
+            try:
+                plan = plans.pop(msgCls)
+            except KeyError:
+                pass
+            else:
+                plans[msgCls] = plan
+                return plan
+
+        plan = compile(msgCls)
+
+        with self._lock:
+            plans.pop(msgCls, None)
+
+            if len(plans) >= self._size:
+                plans.popitem(last=False)
+
+            plans[msgCls] = plan
+
+        return plan
+
+    def clear(self):
+        """ Remove all plans from the cache.
+        """
+        with self._lock:
+            self._plans.clear()
+
+
 class Converter(object):
     """ This class is used to provide a possibility to convert a ROS message to
         a JSON compatible format and back.
 
         To add customized Converters use the method 'addCustomConverter' and
         the class must implement the interface 'IROSConverter'.
-        As an example view the class ImageConverter.
+        As an example view the class ImageConverter, which takes the codec
+        which is passed to the encode methods, and the class
+        OccupancyGridConverter, which encodes the messages relative to the
+        previous ones and is therefore kept in the context of an interface.
+        Custom converters which declare their codecs in the attribute CODECS
+        are only used if one of these codecs is requested; otherwise the
+        messages are encoded like any other message.
+
+        Each ROS message class is compiled once into a plan which contains
+        the conversion function of each field; the plans of the most recently
+        used message classes are cached.
+
+        Byte arrays, i.e. uint8[] fields, are encoded as StringIO instances
+        unless lists of integers are requested; both forms are accepted when
+        decoding.
+
+        Serialized ROS messages can be translated directly into JSON compatible
+        data and back using 'encodeSerialized' and 'decodeSerialized' without
+        creating the ROS message instances; the readers and writers with the
+        precompiled struct formats are cached like the plans.
+
+        Multiple messages of the same ROS message class can be converted at
+        once using the methods ending with 'Many', which resolve the plan,
+        reader or writer only once.
+
+        Times are encoded as ISO 8601 strings and durations as floats unless
+        the numeric form, i.e. dictionaries with the keys 'secs' and 'nsecs',
+        is requested; both forms are accepted when decoding.
+
+        If NumPy is available, arrays of primitive types are converted in bulk
+        instead of element by element; lists with less than BULK_THRESHOLD
+        elements are still converted element by element. Integer arrays are
+        decoded element by element as NumPy would silently wrap values which
+        are out of range. Null values in floating point arrays are decoded as
+        NaN.
     """
     _BASE_TYPES = { 'bool'    : bool,
                     'byte'    : int,
@@ -158,6 +855,51 @@ class Converter(object):
     _SPECIAL_TYPES = {  'time'     : _TimeConverter,
                         'duration' : _DurationConverter }
 
+    _NUMPY_TYPES = { 'bool'    : 'bool',
+                     'byte'    : 'int8',
+                     'char'    : 'uint8',
+                     'uint8'   : 'uint8',
+                     'int8'    : 'int8',
+                     'uint16'  : 'uint16',
+                     'int16'   : 'int16',
+                     'uint32'  : 'uint32',
+                     'int32'   : 'int32',
+                     'uint64'  : 'uint64',
+                     'int64'   : 'int64',
+                     'float32' : 'float32',
+                     'float64' : 'float64' }
+
+    _BULK_DECODE_TYPES = frozenset(('float32', 'float64'))
+
+    _FLOAT_TYPES = frozenset(('float32', 'float64'))
+
+    # Type codes of the byte arrays for the module array
+    _BINARY_TYPES = { 'uint8' : 'B',
+                      'char'  : 'B',
+                      'byte'  : 'b' }
+
+    # Formats of the primitive types in serialized ROS messages
+    _STRUCT_CODES = { 'bool'    : '?',
+                      'byte'    : 'b',
+                      'char'    : 'B',
+                      'uint8'   : 'B',
+                      'int8'    : 'b',
+                      'uint16'  : 'H',
+                      'int16'   : 'h',
+                      'uint32'  : 'I',
+                      'int32'   : 'i',
+                      'uint64'  : 'Q',
+                      'int64'   : 'q',
+                      'float32' : 'f',
+                      'float64' : 'd' }
+
+    _SPECIAL_STRUCTS = { 'time'     : struct.Struct('<2I'),
+                         'duration' : struct.Struct('<2i') }
+
+    # CONFIG
+    MAX_PLANS = 256
+    BULK_THRESHOLD = 32
+
     def __init__(self, loader):
         """ Initialize the Converter.
 
@@ -166,6 +908,13 @@ class Converter(object):
         """
         self._loader = loader
         self._customTypes = {}
+        self._customClasses = {}
+
+        self._encoders = _PlanCache(self.MAX_PLANS)
+        self._decoders = _PlanCache(self.MAX_PLANS)
+
+        self._readers = _PlanCache(self.MAX_PLANS)
+        self._writers = _PlanCache(self.MAX_PLANS)
 
     def addCustomConverter(self, converter):
         """ Register a new custom Converter.
@@ -186,8 +935,12 @@ class Converter(object):
             raise InternalError('msg type is not valid. Has to be of the from '
                                 'pkg/msg, i.e. std_msgs/Int8.')
 
-        self._customTypes[converter.MESSAGE_TYPE] = (converter,
-            self._loader.loadMsg(pkg, name))
+        msgCls = self._loader.loadMsg(pkg, name)
+        self._customTypes[converter.MESSAGE_TYPE] = (converter, msgCls)
+        self._customClasses[msgCls] = converter
+
+        # The plans contain the custom converters of their fields
+        self._clearPlans()
 
     def removeCustomConverter(self, msgType):
         """ Unregister a custom Converter.
@@ -198,49 +951,160 @@ class Converter(object):
             @type  msgType:     str
         """
         try:
-            del self._customTypes[msgType]
+            _, msgCls = self._customTypes.pop(msgType)
         except KeyError:
             InternalError('Tried to remove a custom converter which was '
                           'never added.')
+        else:
+            del self._customClasses[msgCls]
+
+        self._clearPlans()
 
-    def _encode(self, rosMsg):
-        """ Internally used method which is responsible for the heavy lifting.
+    def _clearPlans(self):
+        """ Internally used method to remove all compiled plans.
         """
-        data = {}
+        self._encoders.clear()
+        self._decoders.clear()
+        self._readers.clear()
+        self._writers.clear()
 
-        for (slotName, slotType) in zip(rosMsg.__slots__, rosMsg._slot_types):
-            if '[]' == slotType[-2:]:
-                listBool = True
-                slotType = slotType[:-2]
-            else:
-                listBool = False
+    def _loadMsg(self, msgType):
+        """ Internally used method to load the ROS message class of a message
+            type of the form 'pkg/msg'.
+        """
+        return self._loader.loadMsg(*msgType.split('/'))
+
+    @staticmethod
+    def _createCustom(converter, codec, context=None):
+        """ Internally used method to create a custom converter which encodes
+            the binaries using the given codec. The custom converters in a
+            context are created only once and keep their state between the
+            messages of the context.
+        """
+        if context is None:
+            return converter(*codec) if codec else converter()
+
+        key = (converter, codec)
+
+        try:
+            return context[key]
+        except KeyError:
+            custom = converter(*codec) if codec else converter()
+            context[key] = custom
+            return custom
+
+    @staticmethod
+    def _usesCustom(converter, codec):
+        """ Internally used method to check whether a custom converter is
+            used to encode the messages with the given codec; converters which
+            declare their codecs are only used if one of them was requested.
+        """
+        codecs = getattr(converter, 'CODECS', None)
+        return not codecs or bool(codec and codec[0] in codecs)
+
+    def _encodeCustom(self, converter, codec, rosMsg):
+        """ Internally used method to encode a field whose message type has a
+            custom converter; the fields are encoded without a context such
+            that no state is shared between the messages of different
+            streams.
+        """
+        return self._createCustom(converter, codec).encode(rosMsg)
+
+    def _getEncoder(self, msgCls, binary, numericTime, codec):
+        """ Internally used method to get the encode function of a ROS
+            message class.
+        """
+        return self._encoders.get((msgCls, binary, numericTime, codec),
+                                  self._compileEncoder)
+
+    def _compileEncoder(self, key):
+        """ Internally used method to compile the encode function of a ROS
+            message class; the key is a tuple of the form
+                (msgCls, binary, numericTime, codec)
+        """
+        msgCls, binary, numericTime, codec = key
+        fields = []
+
+        for slotName, slotType in zip(msgCls.__slots__, msgCls._slot_types):
+            slotType, listBool, _ = slotType.partition('[')
 
             if slotType in self._BASE_TYPES:
                 convFunc = self._BASE_TYPES[slotType]
             elif slotType in self._SPECIAL_TYPES:
-                convFunc = self._SPECIAL_TYPES[slotType]().encode
-            elif slotType in self._customTypes:
-                convFunc = self._customTypes[slotType][0]().encode
+                convFunc = self._SPECIAL_TYPES[slotType](numericTime).encode
+            elif (slotType in self._customTypes and
+                  self._usesCustom(self._customTypes[slotType][0], codec)):
+                convFunc = partial(self._encodeCustom,
+                                   self._customTypes[slotType][0], codec)
             else:
-                convFunc = self._encode
+                convFunc = self._getEncoder(self._loadMsg(slotType), binary,
+                                            numericTime, codec)
 
             if listBool:
-                convFunc = partial(map, convFunc)
+                if binary and slotType in self._BINARY_TYPES:
+                    convFunc = partial(_encodeBinary,
+                                       self._BINARY_TYPES[slotType])
+                elif numpy and slotType in self._NUMPY_TYPES:
+                    dtype = numpy.dtype(self._NUMPY_TYPES[slotType])
+                    convFunc = partial(_encodeArray, dtype, convFunc,
+                                       self.BULK_THRESHOLD)
+                elif slotType in self._BINARY_TYPES:
+                    convFunc = partial(_encodeByteList,
+                                       self._BINARY_TYPES[slotType], convFunc)
+                else:
+                    convFunc = partial(map, convFunc)
 
-            try:
-                data[slotName] = convFunc(getattr(rosMsg, slotName))
-            except ValueError as e:
-                raise ValueError('{0}.{1}: {2}'.format(
-                                     rosMsg.__class__.__name__, slotName, e))
+            fields.append((slotName, convFunc))
 
-        return data
+        clsName = msgCls.__name__
 
-    def encode(self, rosMsg):
+        def encode(rosMsg):
+            data = {}
+
+            for slotName, convFunc in fields:
+                try:
+                    data[slotName] = convFunc(getattr(rosMsg, slotName))
+                except ValueError as e:
+                    raise ValueError('{0}.{1}: {2}'.format(clsName, slotName,
+                                                           e))
+
+            return data
+
+        return encode
+
+    def encode(self, rosMsg, binary=True, numericTime=False, codec=None,
+               context=None):
         """ Generate JSON compatible data from a ROS message.
 
             @param rosMsg:  The ROS message instance which should be converted.
             @type  rosMsg:  ROS message instance
 
+            @param binary:  Flag which is True if byte arrays, i.e. uint8[]
+                            fields, should be added as StringIO instances and
+                            False if they should be added as lists of
+                            integers.
+            @type  binary:  bool
+
+            @param numericTime: Flag which is True if times and durations
+                            should be added in the numeric form, i.e. as
+                            dictionaries with the keys 'secs' and 'nsecs',
+                            and False if times should be added as ISO 8601
+                            strings and durations as floats.
+            @type  numericTime: bool
+
+            @param codec:   Codec and quality which are passed to the custom
+                            converters to encode the binaries, e.g.
+                            ('jpeg', 80), or None if the default codecs should
+                            be used.
+            @type  codec:   (str, int / None) / None
+
+            @param context: Dictionary which keeps the custom converters of a
+                            stream of messages, e.g. of an interface, between
+                            the calls such that they can encode the messages
+                            relative to the previous ones, or None if every
+                            message should be encoded on its own.
+            @type  context: dict / None
+
             @return:        Dictionary containing the parsed message. The basic
                             form does map each field in the ROS message to a
                             key / value pair in the returned data dict. Binaries
@@ -253,32 +1117,85 @@ class Converter(object):
             raise TypeError('Given rosMsg object is not an instance of '
                             'genpy.message.Message.')
 
-        for converter, cls in self._customTypes.itervalues():
-            if isinstance(rosMsg, cls):
-                return converter().encode(rosMsg)
+        converter = self._customClasses.get(rosMsg.__class__)
 
-        return self._encode(rosMsg)
+        if converter and self._usesCustom(converter, codec):
+            return self._createCustom(converter, codec,
+                                      context).encode(rosMsg)
 
-    def _decode(self, msgCls, data):
-        """ Internally used method which is responsible for the heavy lifting.
+        return self._getEncoder(rosMsg.__class__, binary, numericTime,
+                                codec)(rosMsg)
+
+    def encodeMany(self, rosMsgs, binary=True, numericTime=False, codec=None,
+                   context=None):
+        """ Generate JSON compatible data from multiple ROS messages of the
+            same ROS message class; the conversion plan is resolved only once.
+
+            @param rosMsgs: The ROS message instances which should be
+                            converted.
+            @type  rosMsgs: [ROS message instance]
+
+            @param binary:  Flag which is True if byte arrays should be added
+                            as StringIO instances; refer to 'encode' for more
+                            information.
+            @type  binary:  bool
+
+            @param numericTime: Flag which is True if times and durations
+                            should be added in the numeric form; refer to
+                            'encode' for more information.
+            @type  numericTime: bool
+
+            @param codec:   Codec and quality which are passed to the custom
+                            converters; refer to 'encode' for more
+                            information.
+            @type  codec:   (str, int / None) / None
+
+            @param context: Dictionary which keeps the custom converters of a
+                            stream of messages; refer to 'encode' for more
+                            information.
+            @type  context: dict / None
+
+            @return:        Dictionaries containing the parsed messages in the
+                            same order as the ROS messages.
+            @rtype:         [{}]
+
+            @raise:         TypeError, ValueError
         """
-        rosMsg = msgCls()
+        if not rosMsgs:
+            return []
 
-        for (slotName, slotType) in zip(rosMsg.__slots__, rosMsg._slot_types):
-            if slotName not in data:
-                continue
+        msgCls = rosMsgs[0].__class__
 
-            if '[]' == slotType[-2:]:
-                listBool = True
-                slotType = slotType[:-2]
-            else:
-                listBool = False
+        if not issubclass(msgCls, Message):
+            raise TypeError('Given rosMsg object is not an instance of '
+                            'genpy.message.Message.')
 
-            field = data[slotName]
+        converter = self._customClasses.get(msgCls)
 
-            if listBool and not isinstance(field, (list, tuple)):
-                raise TypeError('Given data does not match the definition of '
-                                'the ROS message.')
+        if converter and self._usesCustom(converter, codec):
+            encode = self._createCustom(converter, codec, context).encode
+        else:
+            encode = self._getEncoder(msgCls, binary, numericTime, codec)
+
+        data = []
+
+        for rosMsg in rosMsgs:
+            if rosMsg.__class__ is not msgCls:
+                raise TypeError('All ROS messages have to be instances of the '
+                                'same ROS message class.')
+
+            data.append(encode(rosMsg))
+
+        return data
+
+    def _compileDecoder(self, msgCls):
+        """ Internally used method to compile the decode function of a ROS
+            message class.
+        """
+        fields = []
+
+        for slotName, slotType in zip(msgCls.__slots__, msgCls._slot_types):
+            slotType, listBool, _ = slotType.partition('[')
 
             if slotType == 'string':
                 convFunc = _stringify
@@ -286,20 +1203,54 @@ class Converter(object):
                 convFunc = self._BASE_TYPES[slotType]
             elif slotType in self._SPECIAL_TYPES:
                 convFunc = self._SPECIAL_TYPES[slotType]().decode
-            elif slotType in self._customTypes and _checkIsStringIO(field):
-                convFunc = self._customTypes[slotType][0]().decode
             else:
-                convFunc = partial(self._decode,
-                                   self._loader.loadMsg(*slotType.split('/')))
+                convFunc = self._decoders.get(self._loadMsg(slotType),
+                                              self._compileDecoder)
+
+                if slotType in self._customTypes:
+                    # Custom converters are only used for binary data
+                    convFunc = partial(self._decodeCustom,
+                                       self._customTypes[slotType][0], None,
+                                       convFunc)
 
             if listBool:
-                convFunc = partial(map, convFunc)
+                if slotType in self._FLOAT_TYPES:
+                    convFunc = _decodeFloat
 
-            setattr(rosMsg, slotName, convFunc(field))
+                if numpy and slotType in self._BULK_DECODE_TYPES:
+                    dtype = numpy.dtype(self._NUMPY_TYPES[slotType])
+                    convFunc = partial(_decodeArray, dtype, convFunc,
+                                       self.BULK_THRESHOLD)
+                else:
+                    convFunc = partial(_decodeList, convFunc)
 
-        return rosMsg
+                if slotType in self._BINARY_TYPES:
+                    convFunc = partial(_decodeBinary,
+                                       self._BINARY_TYPES[slotType], convFunc)
+
+            fields.append((slotName, convFunc))
+
+        def decode(data):
+            rosMsg = msgCls()
+
+            for slotName, convFunc in fields:
+                if slotName in data:
+                    setattr(rosMsg, slotName, convFunc(data[slotName]))
 
-    def decode(self, msgCls, data):
+            return rosMsg
+
+        return decode
+
+    def _decodeCustom(self, converter, context, convFunc, field):
+        """ Internally used method to decode a field whose message type has a
+            custom converter.
+        """
+        if _checkIsStringIO(field):
+            return self._createCustom(converter, None, context).decode(field)
+
+        return convFunc(field)
+
+    def decode(self, msgCls, data, context=None):
         """ Generate a ROS message from JSON compatible data.
 
             @param msgCls:  ROS message class into which the decoded data
@@ -308,9 +1259,18 @@ class Converter(object):
 
             @param data:    Dictionary with keys matching the fields in the
                             desired ROS message. Binary files should be
-                            included as StringIO instances.
+                            included as StringIO instances; byte arrays can
+                            be given either as StringIO instances or as lists
+                            of integers.
             @param data:    { str : {} }
 
+            @param context: Dictionary which keeps the custom converters of a
+                            stream of messages, e.g. of an interface, between
+                            the calls such that they can decode the messages
+                            relative to the previous ones, or None if every
+                            message should be decoded on its own.
+            @type  context: dict / None
+
             @return:        ROS message of type rosMsg containing the given
                             data.
 
@@ -318,8 +1278,449 @@ class Converter(object):
                             rce.util.loader.ResourceNotFound
         """
         if _checkIsStringIO(data):
-            for converter, cls in self._customTypes.itervalues():
-                if msgCls == cls:
-                    return converter().decode(msgCls, data)
+            converter = self._customClasses.get(msgCls)
+
+            if converter:
+                return self._createCustom(converter, None,
+                                          context).decode(data)
+
+        return self._decoders.get(msgCls, self._compileDecoder)(data)
+
+    def decodeMany(self, msgCls, dataList, context=None):
+        """ Generate multiple ROS messages of the same ROS message class from
+            JSON compatible data; the conversion plan is resolved only once.
+
+            @param msgCls:  ROS message class into which the decoded data
+                            should filled.
+            @type  msgCls:  ROS Message class
+
+            @param dataList:    Dictionaries with keys matching the fields in
+                            the desired ROS message; refer to 'decode' for
+                            more information.
+            @param dataList:    [{ str : {} }]
+
+            @param context: Dictionary which keeps the custom converters of a
+                            stream of messages; refer to 'decode' for more
+                            information.
+            @type  context: dict / None
+
+            @return:        ROS messages of type msgCls in the same order as
+                            the given data.
+            @rtype:         [ROS message instance]
+
+            @raise:         TypeError, ValueError,
+                            rce.util.loader.ResourceNotFound
+        """
+        decode = self._decoders.get(msgCls, self._compileDecoder)
+        converter = self._customClasses.get(msgCls)
+
+        if converter:
+            decode = partial(self._decodeCustom, converter, context, decode)
+
+        return map(decode, dataList)
+
+    def _getReader(self, msgCls, binary, numericTime, codec):
+        """ Internally used method to get the reader of a ROS message class.
+        """
+        return self._readers.get((msgCls, binary, numericTime, codec),
+                                 self._compileReader)
+
+    def _compileReader(self, key):
+        """ Internally used method to compile the reader which translates a
+            serialized ROS message directly into JSON compatible data; the key
+            is a tuple of the form
+                (msgCls, binary, numericTime, codec)
+
+            @return:        Reader or None if the message contains types
+                            whose custom converter is used for the codec.
+        """
+        links = []
+        ops = []
+        scalars = []
+
+        if not self._flattenReader(key, 0, links, ops, scalars):
+            return None
+
+        if scalars:
+            codes, fields = zip(*scalars)
+            ops.append(_readScalars(struct.Struct('<' + ''.join(codes)),
+                                    fields))
+
+        return _readMessage(links, ops)
+
+    def _flattenReader(self, key, index, links, ops, scalars):
+        """ Internally used method to add the readers of the fields of a ROS
+            message class, whose dictionary has the given container index, to
+            the readers of the message which is compiled.
+
+            @return:        False if the message contains types whose custom
+                            converter is used for the codec.
+        """
+        msgCls, binary, numericTime, codec = key
+        converter = self._customClasses.get(msgCls)
+
+        if converter and self._usesCustom(converter, codec):
+            return False
+
+        for slotName, slotType in zip(msgCls.__slots__, msgCls._slot_types):
+            slotType, listBool, length = slotType.partition('[')
+
+            if not listBool:
+                if slotType in self._STRUCT_CODES:
+                    scalars.append((self._STRUCT_CODES[slotType],
+                                    (index, slotName)))
+                    continue
+                elif (slotType != 'string' and
+                      slotType not in self._SPECIAL_TYPES):
+                    links.append((index, slotName))
+
+                    if not self._flattenReader((self._loadMsg(slotType),
+                                                binary, numericTime, codec),
+                                               len(links), links, ops,
+                                               scalars):
+                        return False
+
+                    continue
+
+            if scalars:
+                codes, fields = zip(*scalars)
+                ops.append(_readScalars(struct.Struct('<' + ''.join(codes)),
+                                        fields))
+                del scalars[:]
+
+            length = int(length[:-1]) if length[:-1] else None
+
+            if listBool and slotType in self._BINARY_TYPES:
+                read = _readBytes(self._BINARY_TYPES[slotType], binary,
+                                  length)
+            elif listBool and slotType in self._STRUCT_CODES:
+                if numpy and slotType in self._NUMPY_TYPES:
+                    dtype = numpy.dtype(self._NUMPY_TYPES[slotType])
+                    dtype = dtype.newbyteorder('<')
+                else:
+                    dtype = None
+
+                read = _readPrimitives(self._STRUCT_CODES[slotType], dtype,
+                                       self.BULK_THRESHOLD, length)
+            elif listBool and slotType == 'string':
+                read = _readStrings(length)
+            else:
+                if slotType == 'string':
+                    read = _readString
+                elif slotType in self._SPECIAL_TYPES:
+                    convFunc = self._SPECIAL_TYPES[slotType](numericTime)
+                    read = _readSpecial(self._SPECIAL_STRUCTS[slotType],
+                                        convFunc.encodeParts)
+                else:
+                    read = self._getReader(self._loadMsg(slotType), binary,
+                                           numericTime, codec)
+
+                    if not read:
+                        return False
+
+                if listBool:
+                    read = _readArray(read, length)
+
+            ops.append(_readField(index, slotName, read))
+
+        return True
+
+    def encodeSerialized(self, msgCls, msg, binary=True, numericTime=False,
+                         codec=None, context=None):
+        """ Generate JSON compatible data directly from a serialized ROS
+            message without creating the ROS message instance. Messages
+            which contain types whose custom converter is used for the codec
+            are deserialized and encoded instead.
+
+            @param msgCls:  ROS message class of the serialized message.
+            @type  msgCls:  ROS Message class
+
+            @param msg:     ROS message in serialized form.
+            @type  msg:     str
+
+            @param binary:  Flag which is True if byte arrays, i.e. uint8[]
+                            fields, should be added as StringIO instances and
+                            False if they should be added as lists of
+                            integers.
+            @type  binary:  bool
+
+            @param numericTime: Flag which is True if times and durations
+                            should be added in the numeric form; refer to
+                            'encode' for more information.
+            @type  numericTime: bool
+
+            @param codec:   Codec and quality which are passed to the custom
+                            converters; refer to 'encode' for more
+                            information.
+            @type  codec:   (str, int / None) / None
+
+            @param context: Dictionary which keeps the custom converters of a
+                            stream of messages; refer to 'encode' for more
+                            information.
+            @type  context: dict / None
+
+            @return:        Dictionary containing the parsed message; refer to
+                            'encode' for more information.
+            @rtype:         {}
+
+            @raise:         TypeError, ValueError
+        """
+        read = self._getReader(msgCls, binary, numericTime, codec)
+
+        if not read:
+            return self.encode(self._deserialize(msgCls, msg), binary,
+                               numericTime, codec, context)
+
+        return _readSerialized(read, msg)
+
+    def encodeSerializedMany(self, msgCls, msgs, binary=True,
+                             numericTime=False, codec=None, context=None):
+        """ Generate JSON compatible data directly from multiple serialized
+            ROS messages of the same ROS message class; the reader is resolved
+            only once.
+
+            @param msgCls:  ROS message class of the serialized messages.
+            @type  msgCls:  ROS Message class
+
+            @param msgs:    ROS messages in serialized form.
+            @type  msgs:    [str]
+
+            @param binary:  Flag which is True if byte arrays should be added
+                            as StringIO instances; refer to 'encode' for more
+                            information.
+            @type  binary:  bool
+
+            @param numericTime: Flag which is True if times and durations
+                            should be added in the numeric form; refer to
+                            'encode' for more information.
+            @type  numericTime: bool
+
+            @param codec:   Codec and quality which are passed to the custom
+                            converters; refer to 'encode' for more
+                            information.
+            @type  codec:   (str, int / None) / None
+
+            @param context: Dictionary which keeps the custom converters of a
+                            stream of messages; refer to 'encode' for more
+                            information.
+            @type  context: dict / None
+
+            @return:        Dictionaries containing the parsed messages in the
+                            same order as the serialized messages.
+            @rtype:         [{}]
+
+            @raise:         TypeError, ValueError
+        """
+        read = self._getReader(msgCls, binary, numericTime, codec)
+
+        if not read:
+            return self.encodeMany([self._deserialize(msgCls, msg)
+                                    for msg in msgs], binary, numericTime,
+                                   codec, context)
+
+        return [_readSerialized(read, msg) for msg in msgs]
+
+    @staticmethod
+    def _deserialize(msgCls, msg):
+        """ Internally used method to deserialize a ROS message.
+        """
+        rosMsg = msgCls()
+
+        if numpy:
+            # Arrays of primitive types are encoded in bulk
+            rosMsg.deserialize_numpy(msg, numpy)
+        else:
+            rosMsg.deserialize(msg)
+
+        return rosMsg
+
+    def _compileWriter(self, msgCls):
+        """ Internally used method to compile the writer which translates
+            JSON compatible data directly into a serialized ROS message.
+
+            @return:        Writer and serialized default message or None if
+                            the message contains types which have a custom
+                            converter.
+        """
+        links = []
+        ops = []
+        scalars = []
+
+        if not self._flattenWriter(msgCls, 0, links, ops, scalars):
+            return None
+
+        if scalars:
+            codes, fields = zip(*scalars)
+            ops.append(_writeScalars(struct.Struct('<' + ''.join(codes)),
+                                     fields))
+
+        write = _writeMessage(links, ops)
+
+        chunks = []
+        write({}, chunks)
+        return write, ''.join(chunks)
+
+    def _flattenWriter(self, msgCls, index, links, ops, scalars):
+        """ Internally used method to add the writers of the fields of a ROS
+            message class, whose dictionary has the given container index, to
+            the writers of the message which is compiled.
+
+            @return:        False if the message contains types which have a
+                            custom converter.
+        """
+        if msgCls in self._customClasses:
+            return False
+
+        for slotName, slotType in zip(msgCls.__slots__, msgCls._slot_types):
+            slotType, listBool, length = slotType.partition('[')
+
+            if not listBool:
+                if slotType in self._STRUCT_CODES:
+                    scalars.append((self._STRUCT_CODES[slotType],
+                                    (index, slotName,
+                                     self._BASE_TYPES[slotType])))
+                    continue
+                elif slotType in self._customTypes:
+                    return False
+                elif (slotType != 'string' and
+                      slotType not in self._SPECIAL_TYPES):
+                    links.append((index, slotName))
+
+                    if not self._flattenWriter(self._loadMsg(slotType),
+                                               len(links), links, ops,
+                                               scalars):
+                        return False
+
+                    continue
+
+            if scalars:
+                codes, fields = zip(*scalars)
+                ops.append(_writeScalars(struct.Struct('<' + ''.join(codes)),
+                                         fields))
+                del scalars[:]
+
+            length = int(length[:-1]) if length[:-1] else None
+
+            if listBool and slotType in self._BINARY_TYPES:
+                write = _writeBytes(self._BINARY_TYPES[slotType], length)
+                default = '\x00'
+            elif listBool and slotType in self._STRUCT_CODES:
+                code = self._STRUCT_CODES[slotType]
+
+                if numpy and slotType in self._BULK_DECODE_TYPES:
+                    dtype = numpy.dtype(self._NUMPY_TYPES[slotType])
+                    dtype = dtype.newbyteorder('<')
+                else:
+                    dtype = None
+
+                if slotType in self._FLOAT_TYPES:
+                    convFunc = _decodeFloat
+                else:
+                    convFunc = self._BASE_TYPES[slotType]
+
+                write = _writePrimitives(code, convFunc, dtype,
+                                         self.BULK_THRESHOLD, length)
+                default = struct.pack('<' + code, 0)
+            elif listBool and slotType == 'string':
+                write = _writeStrings(length)
+                default = _UINT32.pack(0)
+            else:
+                if slotType == 'string':
+                    write = _writeString
+                    default = _UINT32.pack(0)
+                elif slotType in self._SPECIAL_TYPES:
+                    st = self._SPECIAL_STRUCTS[slotType]
+                    convFunc = self._SPECIAL_TYPES[slotType]()
+                    write = _writeSpecial(st, convFunc.decodeParts)
+                    default = st.pack(0, 0)
+                elif slotType in self._customTypes:
+                    return False
+                else:
+                    plan = self._writers.get(self._loadMsg(slotType),
+                                             self._compileWriter)
+
+                    if not plan:
+                        return False
+
+                    write, default = plan
+
+                if listBool:
+                    write = _writeArray(write, length)
+
+            if listBool:
+                if length is None:
+                    default = _UINT32.pack(0)
+                else:
+                    default *= length
+
+            ops.append(_writeField(index, slotName, write, default))
+
+        return True
+
+    def decodeSerialized(self, msgCls, data, context=None):
+        """ Generate a serialized ROS message directly from JSON compatible
+            data without creating the ROS message instance. Messages which
+            contain types with a custom converter are decoded and serialized
+            instead.
+
+            @param msgCls:  ROS message class into which the decoded data
+                            should be serialized.
+            @type  msgCls:  ROS Message class
+
+            @param data:    Dictionary with keys matching the fields in the
+                            desired ROS message; refer to 'decode' for more
+                            information.
+            @param data:    { str : {} }
+
+            @param context: Dictionary which keeps the custom converters of a
+                            stream of messages; refer to 'decode' for more
+                            information.
+            @type  context: dict / None
+
+            @return:        ROS message in serialized form.
+            @rtype:         str
+
+            @raise:         TypeError, ValueError,
+                            rce.util.loader.ResourceNotFound
+        """
+        plan = self._writers.get(msgCls, self._compileWriter)
+
+        if not plan:
+            return _serialize(self.decode(msgCls, data, context))
+
+        return _writeSerialized(plan[0], data)
+
+    def decodeSerializedMany(self, msgCls, dataList, context=None):
+        """ Generate multiple serialized ROS messages of the same ROS message
+            class directly from JSON compatible data; the writer is resolved
+            only once.
+
+            @param msgCls:  ROS message class into which the decoded data
+                            should be serialized.
+            @type  msgCls:  ROS Message class
+
+            @param dataList:    Dictionaries with keys matching the fields in
+                            the desired ROS message; refer to 'decode' for
+                            more information.
+            @param dataList:    [{ str : {} }]
+
+            @param context: Dictionary which keeps the custom converters of a
+                            stream of messages; refer to 'decode' for more
+                            information.
+            @type  context: dict / None
+
+            @return:        ROS messages in serialized form in the same order
+                            as the given data.
+            @rtype:         [str]
+
+            @raise:         TypeError, ValueError,
+                            rce.util.loader.ResourceNotFound
+        """
+        plan = self._writers.get(msgCls, self._compileWriter)
+
+        if not plan:
+            return map(_serialize, self.decodeMany(msgCls, dataList,
+                                                   context))
 
-        return self._decode(msgCls, data)
+        write = plan[0]
+        return [_writeSerialized(write, data) for data in dataList]
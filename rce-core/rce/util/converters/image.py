@@ -31,6 +31,9 @@
 #
 
 # Python specific imports
+import sys
+from array import array
+
 try:
     from cStringIO import StringIO, InputType, OutputType
     from StringIO import StringIO as pyStringIO
@@ -44,10 +47,18 @@ except ImportError:
         return isinstance(obj, StringIO)
 
 try:
-    import Image
+    from PIL import Image
+except ImportError:
+    try:
+        import Image
+    except ImportError:
+        print('Requires Python Image Library.')
+        exit(1)
+
+try:
+    import numpy
 except ImportError:
-    print('Requires Python Image Library.')
-    exit(1)
+    numpy = None
 
 # ROS specific imports
 import sensor_msgs.msg
@@ -59,19 +70,125 @@ from zope.interface import implements
 from rce.util.converters.interfaces import ICustomROSConverter
 
 
+# Pillow renamed 'tostring' to 'tobytes'
+_tobytes = getattr(Image.Image, 'tobytes', None) or Image.Image.tostring
+
+
+def _modeIToBytes(img):
+    """ Internally used method to get the pixel data of a PIL image in the
+        mode 'I', as which PIL opens 16 bit images, as little-endian 16 bit
+        integers.
+    """
+    if numpy:
+        return numpy.asarray(img).clip(0, 65535).astype('<u2').tostring()
+
+    pixels = array('H', (min(max(p, 0), 65535)
+                         for p in array('i', _tobytes(img, 'raw', 'I'))))
+
+    if sys.byteorder == 'big':
+        pixels.byteswap()
+
+    return pixels.tostring()
+
+
+def _yuv422ToImage(data, width, height, step):
+    """ Internally used method to convert an image with the encoding
+        'yuv422', i.e. UYVY, to a PIL image in the mode 'YCbCr'.
+    """
+    if not numpy:
+        raise ValueError("Encoding 'yuv422' requires NumPy.")
+
+    if width % 2:
+        raise ValueError("Width of 'yuv422' image has to be even.")
+
+    uyvy = numpy.frombuffer(data, numpy.uint8, step * height)
+    uyvy = uyvy.reshape(height, step)[:, :width * 2].reshape(height,
+                                                             width // 2, 4)
+
+    ycbcr = numpy.empty((height, width, 3), numpy.uint8)
+    ycbcr[:, 0::2, 0] = uyvy[:, :, 1]
+    ycbcr[:, 1::2, 0] = uyvy[:, :, 3]
+    ycbcr[:, 0::2, 1] = ycbcr[:, 1::2, 1] = uyvy[:, :, 0]
+    ycbcr[:, 0::2, 2] = ycbcr[:, 1::2, 2] = uyvy[:, :, 2]
+
+    return Image.fromarray(ycbcr, 'YCbCr')
+
+
 class ImageConverter(object):
-    """ Convert images from PNG file format to ROS sensor message format and
-        back.
+    """ Convert images from an image file format to ROS sensor message format
+        and back.
+
+        Images are encoded using the codec 'png', 'jpeg' or 'webp' with an
+        optional quality, which is given when the converter is created, e.g.
+        using the codec which a robot requested for an interface. The codec
+        'raw' encodes the image as a dictionary with the fields of the ROS
+        message and the pixel data as StringIO instance.
+
+        Images in all file formats which can be read by PIL can be decoded;
+        the image is decoded only once, which verifies it as well.
     """
     implements(ICustomROSConverter)
 
     MESSAGE_TYPE = 'sensor_msgs/Image'
 
-    _ENCODINGMAP_PY_TO_ROS = { 'L' : 'mono8', 'RGB' : 'rgb8',
-                               'RGBA' : 'rgba8', 'YCbCr' : 'yuv422' }
-    _ENCODINGMAP_ROS_TO_PY = { 'mono8' : 'L', 'rgb8' : 'RGB',
-                               'rgba8' : 'RGBA', 'yuv422' : 'YCbCr' }
-    _PIL_MODE_CHANNELS = { 'L' : 1, 'RGB' : 3, 'RGBA' : 4, 'YCbCr' : 3 }
+    # Codecs as a mapping of the form
+    #     codec : (PIL format, default options, quality option)
+    _CODECS = { 'png'  : ('PNG', { 'compress_level' : 1 }, None),
+                'jpeg' : ('JPEG', { 'quality' : 90 }, 'quality'),
+                'webp' : ('WEBP', { 'quality' : 90, 'method' : 0 },
+                          'quality'),
+                'raw'  : (None, None, None) }
+
+    # ROS encodings as a mapping of the form
+    #     encoding : (PIL mode, PIL raw mode, bytes per pixel)
+    _ENCODINGMAP_ROS_TO_PY = { 'mono8'  : ('L', 'L', 1),
+                               '8UC1'   : ('L', 'L', 1),
+                               'rgb8'   : ('RGB', 'RGB', 3),
+                               'bgr8'   : ('RGB', 'BGR', 3),
+                               'rgba8'  : ('RGBA', 'RGBA', 4),
+                               'bgra8'  : ('RGBA', 'BGRA', 4),
+                               'mono16' : ('I;16', 'I;16', 2),
+                               '16UC1'  : ('I;16', 'I;16', 2),
+                               'yuv422' : ('YCbCr', None, 2) }
+
+    # PIL modes as a mapping of the form
+    #     mode : (ROS encoding, PIL raw mode, bytes per pixel)
+    _ENCODINGMAP_PY_TO_ROS = { 'L'     : ('mono8', 'L', 1),
+                               'RGB'   : ('rgb8', 'RGB', 3),
+                               'RGBA'  : ('rgba8', 'RGBA', 4),
+                               'I;16'  : ('mono16', 'I;16', 2),
+                               'I;16B' : ('mono16', 'I;16', 2),
+                               'I'     : ('mono16', None, 2) }
+
+    # PIL modes which can not be stored in the lossy codecs
+    _WIDE_MODES = ('I;16',)
+
+    def __init__(self, codec='png', quality=None):
+        """ Initialize the Image converter.
+
+            @param codec:       Codec which is used to encode the images;
+                                'png', 'jpeg', 'webp' or 'raw'.
+            @type  codec:       str
+
+            @param quality:     Quality from 1 to 100 which is used by the
+                                codecs 'jpeg' and 'webp'; the default of the
+                                codec is used if None.
+            @type  quality:     int / None
+        """
+        try:
+            self._format, options, qualityOption = self._CODECS[codec]
+        except KeyError:
+            raise ValueError("Image codec '{0}' is not supported.".format(
+                                                                        codec))
+
+        self._options = dict(options or {})
+
+        if quality is not None:
+            if not 1 <= quality <= 100:
+                raise ValueError('Image quality has to be between 1 and 100.')
+
+            if qualityOption:
+                self._options[qualityOption] = quality
 
     def decode(self, imgObj):
         """ Convert a image stored (PIL library readable image file format)
@@ -81,49 +198,98 @@ class ImageConverter(object):
         if not _checkIsStringIO(imgObj):
             raise TypeError('Given object is not a StringIO instance.')
 
-        # Checking of image according to django.forms.fields.ImageField
+        # Decoding the complete image verifies its content as well
         try:
             imgObj.seek(0)
             img = Image.open(imgObj)
-            img.verify()
-        except:
+            img.load()
+        except Exception:
             raise ValueError('Content of given image could not be verified.')
 
-        imgObj.seek(0)
-        img = Image.open(imgObj)
-        img.load()
+        if img.mode not in self._ENCODINGMAP_PY_TO_ROS:
+            if img.mode in ('P', 'LA', 'PA') and ('transparency' in img.info
+                                                  or 'A' in img.mode):
+                img = img.convert('RGBA')
+            elif img.mode == '1':
+                img = img.convert('L')
+            else:
+                img = img.convert('RGB')
 
-        # Everything ok, convert PIL.Image to ROS and return it
-        if img.mode == 'P':
-            img = img.convert('RGB')
+        encoding, rawMode, size = self._ENCODINGMAP_PY_TO_ROS[img.mode]
 
         rosimage = sensor_msgs.msg.Image()
-        rosimage.encoding = ImageConverter._ENCODINGMAP_PY_TO_ROS[img.mode]
+        rosimage.encoding = encoding
         (rosimage.width, rosimage.height) = img.size
-        rosimage.step = (ImageConverter._PIL_MODE_CHANNELS[img.mode]
-                         * rosimage.width)
-        rosimage.data = img.tostring()
+        rosimage.step = size * rosimage.width
+
+        if rawMode:
+            rosimage.data = _tobytes(img, 'raw', rawMode)
+        else:
+            rosimage.data = _modeIToBytes(img)
         return rosimage
 
     def encode(self, rosMsg):
-        """ Convert a ROS compatible message (sensor_msgs.Image) to a
-            PNG encoded image stored in a StringIO object.
+        """ Convert a ROS compatible message (sensor_msgs.Image) to an image
+            stored in a StringIO object using the codec of the converter or,
+            for the codec 'raw', to a dictionary with the pixel data as
+            StringIO object.
         """
         if not isinstance(rosMsg, sensor_msgs.msg.Image):
             raise TypeError('Given object is not a sensor_msgs.msg.Image '
                             'instance.')
 
-        # Convert to PIL Image
-        pil = Image.fromstring(
-                ImageConverter._ENCODINGMAP_ROS_TO_PY[rosMsg.encoding],
-                (rosMsg.width, rosMsg.height),
-                rosMsg.data,
-                'raw',
-                ImageConverter._ENCODINGMAP_ROS_TO_PY[rosMsg.encoding],
-                0,
-                1)
+        try:
+            mode, rawMode, size = \
+                self._ENCODINGMAP_ROS_TO_PY[rosMsg.encoding]
+        except KeyError:
+            raise ValueError("Image encoding '{0}' is not supported.".format(
+                                                            rosMsg.encoding))
+
+        width, height = rosMsg.width, rosMsg.height
+        step = rosMsg.step or width * size
+        data = rosMsg.data
+
+        if not isinstance(data, str):
+            data = str(bytearray(data))
+
+        if step < width * size or len(data) < step * height:
+            raise ValueError('Image data does not match the size of the '
+                             'image.')
+
+        if not self._format:
+            return { 'width' : width, 'height' : height,
+                     'encoding' : rosMsg.encoding,
+                     'is_bigendian' : rosMsg.is_bigendian, 'step' : step,
+                     'data' : StringIO(data) }
+
+        if mode == 'I;16' and rosMsg.is_bigendian:
+            pixels = array('H', data[:step * height])
+            pixels.byteswap()
+            data = pixels.tostring()
+
+        # Convert to PIL Image; the pixel data is not copied if possible
+        if rawMode:
+            pil = Image.frombuffer(mode, (width, height), data, 'raw', rawMode,
+                                   step, 1)
+        else:
+            pil = _yuv422ToImage(data, width, height, step)
+
+        imgFormat, options = self._format, self._options
+
+        if mode in self._WIDE_MODES and imgFormat != 'PNG':
+            # The lossy codecs can not store 16 bit images
+            imgFormat, options = 'PNG', self._CODECS['png'][1]
+        elif mode == 'YCbCr' and imgFormat != 'JPEG':
+            pil = pil.convert('RGB')
+        elif mode == 'RGBA' and imgFormat == 'JPEG':
+            pil = pil.convert('RGB')
 
         # Save to StringIO
         img = StringIO()
-        pil.save(img, 'PNG')
+
+        try:
+            pil.save(img, imgFormat, **options)
+        except IOError as e:
+            raise ValueError('Image could not be encoded: {0}'.format(e))
+
         return img
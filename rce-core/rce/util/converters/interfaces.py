@@ -37,6 +37,22 @@ from zope.interface import Interface, Attribute
 class ICustomROSConverter(Interface):
     """ Interface which declares the necessary methods which all ROS message
         types converters have to implement.
+
+        Converters which support multiple codecs for their binaries take the
+        codec and the quality, which a robot requested for an interface, as
+        arguments of the constructor; by default they are created without
+        arguments.
+
+        Converters which change the format of the messages can declare the
+        names of their codecs in the class attribute CODECS; they are only
+        used to encode the messages of interfaces for which a robot requested
+        one of these codecs, all other messages are encoded as plain JSON.
+
+        Converters which encode the messages relative to the previous ones
+        keep their state in the instance. The instance is kept for all
+        messages of an interface; converters for the fields of a message are
+        created for every message and therefore have to start without a
+        previous message.
     """
     MESSAGE_TYPE = Attribute("""
     Identifier which is used to select the ROS converter.
@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#     rce-core/rce/util/converters/occupancygrid.py
+#
+#     This file is part of the RoboEarth Cloud Engine framework.
+#
+#     This file was originally created for RoboEearth
+#     http://www.roboearth.org/
+#
+#     The research leading to these results has received funding from
+#     the European Union Seventh Framework Programme FP7/2007-2013 under
+#     grant agreement no248942 RoboEarth.
+#
+#     Copyright 2012 RoboEarth
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+#     \author/s: Dominique Hunziker
+#
+#
+
+# Python specific imports
+import zlib
+import struct
+
+try:
+    from cStringIO import StringIO, InputType, OutputType
+    from StringIO import StringIO as pyStringIO
+
+    def _checkIsStringIO(obj):
+        return isinstance(obj, (InputType, OutputType, pyStringIO))
+except ImportError:
+    from StringIO import StringIO
+
+    def _checkIsStringIO(obj):
+        return isinstance(obj, StringIO)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# ROS specific imports
+import nav_msgs.msg
+
+# zope specific imports
+from zope.interface import implements
+
+# rce specific imports
+from rce.util.converters.interfaces import ICustomROSConverter
+
+
+# Kinds of the encoded frames
+_KEYFRAME = 0
+_DELTA = 1
+
+# Header of the encoded occupancy grids of the form
+#     (magic, version, kind, frame ID, ID of the base frame, number of runs,
+#      length of the metadata)
+_HEADER = struct.Struct('<3sBBIIII')
+_MAGIC = 'OGZ'
+_VERSION = 1
+
+
+def _encodeRuns(cells):
+    """ Internally used method to run-length encode the cells of an
+        occupancy grid.
+
+        @return:        Values of the runs followed by the lengths of the runs
+                        as byte planes and the number of runs.
+        @rtype:         (str, int)
+    """
+    if not cells.size:
+        return '', 0
+
+    starts = numpy.flatnonzero(cells[1:] != cells[:-1]) + 1
+    starts = numpy.concatenate(([0], starts))
+    lengths = numpy.diff(numpy.append(starts, cells.size)).astype('<u4')
+
+    planes = lengths.view(numpy.uint8).reshape(-1, 4).T.tostring()
+    return cells[starts].tostring() + planes, starts.size
+
+
+def _decodeRuns(payload, runs, size):
+    """ Internally used method to decode the cells which were run-length
+        encoded by '_encodeRuns'.
+    """
+    if len(payload) != runs * 5:
+        raise ValueError('Cells of occupancy grid are not valid.')
+
+    values = numpy.frombuffer(payload, numpy.int8, runs)
+    planes = numpy.frombuffer(payload, numpy.uint8, runs * 4, runs)
+    lengths = numpy.ascontiguousarray(planes.reshape(4, runs).T)
+    lengths = lengths.view('<u4').reshape(-1)
+
+    if lengths.sum() != size:
+        raise ValueError('Cells of occupancy grid do not match the size of '
+                         'the occupancy grid.')
+
+    return numpy.repeat(values, lengths)
+
+
+def _layout(rosMsg):
+    """ Internally used method to get the layout of an occupancy grid; deltas
+        can only be used between frames with the same layout.
+    """
+    info = rosMsg.info
+    position, orientation = info.origin.position, info.origin.orientation
+    return (rosMsg.header.frame_id, info.width, info.height, info.resolution,
+            position.x, position.y, position.z, orientation.x, orientation.y,
+            orientation.z, orientation.w)
+
+
+def _serializeMeta(rosMsg):
+    """ Internally used method to serialize the fields of an occupancy grid
+        without the cells.
+    """
+    meta = nav_msgs.msg.OccupancyGrid()
+    meta.header = rosMsg.header
+    meta.info = rosMsg.info
+
+    buf = StringIO()
+    meta.serialize(buf)
+    return buf.getvalue()
+
+
+class OccupancyGridConverter(object):
+    """ Convert occupancy grids from a compressed run-length encoded format
+        to ROS navigation message format and back.
+
+        With the codec 'delta' a keyframe, which contains all cells, is
+        followed by frames which contain only the difference to the previous
+        frame; a keyframe is sent every few frames, given as quality, and
+        whenever the layout of the grid changes. The frames reference the
+        previous frame such that a frame whose previous frame was lost, e.g.
+        because it was dropped on a congested connection, is rejected until
+        the next keyframe arrives. With the codec 'rle' every frame is a
+        keyframe.
+
+        The converter keeps the previous frames and therefore has to be used
+        for a single stream of occupancy grids, e.g. the interface for which
+        the Converter keeps it in a context. A client which receives the
+        frames decodes them using its own instance of this converter.
+
+        The encoded occupancy grid is a StringIO instance containing a header,
+        the serialized occupancy grid without the cells and the compressed
+        runs of the cells. The converter is only used for interfaces for which
+        a robot requested one of the codecs and requires NumPy.
+    """
+    implements(ICustomROSConverter)
+
+    MESSAGE_TYPE = 'nav_msgs/OccupancyGrid'
+    CODECS = frozenset(('delta', 'rle'))
+
+    # CONFIG
+    KEYFRAME_INTERVAL = 10
+    ZLIB_LEVEL = 6
+
+    def __init__(self, codec='delta', quality=None):
+        """ Initialize the OccupancyGrid converter.
+
+            @param codec:       Codec which is used to encode the occupancy
+                                grids; 'delta' or 'rle'.
+            @type  codec:       str
+
+            @param quality:     Number of frames from 1 to 100 after which a
+                                keyframe is sent; the default interval is used
+                                if None.
+            @type  quality:     int / None
+        """
+        if not numpy:
+            raise ValueError('Occupancy grid codecs require NumPy.')
+
+        if codec not in self.CODECS:
+            raise ValueError("Occupancy grid codec '{0}' is not "
+                             'supported.'.format(codec))
+
+        if quality is None:
+            quality = self.KEYFRAME_INTERVAL
+        elif not 1 <= quality <= 100:
+            raise ValueError('Keyframe interval has to be between 1 and 100.')
+
+        self._delta = codec == 'delta'
+        self._interval = quality
+
+        # State of the encoded frames
+        self._frameID = 0
+        self._layout = None
+        self._previous = None
+        self._sinceKeyframe = 0
+
+        # State of the decoded frames
+        self._decodedID = None
+        self._decoded = None
+
+    def decode(self, data):
+        """ Convert an occupancy grid stored in a StringIO object to a ROS
+            compatible message (nav_msgs.OccupancyGrid).
+        """
+        if not _checkIsStringIO(data):
+            raise TypeError('Given object is not a StringIO instance.')
+
+        data = data.getvalue()
+
+        try:
+            magic, version, kind, frameID, baseID, runs, size = \
+                _HEADER.unpack_from(data)
+        except struct.error:
+            raise ValueError('Occupancy grid header is not valid.')
+
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError('Occupancy grid format is not supported.')
+
+        start = _HEADER.size + size
+
+        try:
+            rosMsg = nav_msgs.msg.OccupancyGrid()
+            rosMsg.deserialize(data[_HEADER.size:start])
+            payload = zlib.decompress(data[start:])
+        except Exception:
+            raise ValueError('Content of given occupancy grid could not be '
+                             'verified.')
+
+        cells = _decodeRuns(payload, runs,
+                            rosMsg.info.width * rosMsg.info.height)
+
+        if kind == _DELTA:
+            if self._decodedID != baseID or self._decoded.size != cells.size:
+                raise ValueError('Previous frame of the occupancy grid is '
+                                 'missing; waiting for the next keyframe.')
+
+            cells = self._decoded + cells
+        elif kind != _KEYFRAME:
+            raise ValueError('Occupancy grid format is not supported.')
+
+        self._decodedID = frameID
+        self._decoded = cells
+
+        rosMsg.data = cells.tolist()
+        return rosMsg
+
+    def encode(self, rosMsg):
+        """ Convert a ROS compatible message (nav_msgs.OccupancyGrid) to an
+            occupancy grid stored in a StringIO object using the codec of the
+            converter.
+        """
+        if not isinstance(rosMsg, nav_msgs.msg.OccupancyGrid):
+            raise TypeError('Given object is not a nav_msgs.msg.OccupancyGrid '
+                            'instance.')
+
+        data = rosMsg.data
+
+        if isinstance(data, str):
+            cells = numpy.frombuffer(data, numpy.int8)
+        else:
+            cells = numpy.fromiter(data, numpy.int8, len(data))
+
+        if cells.size != rosMsg.info.width * rosMsg.info.height:
+            raise ValueError('Cells do not match the size of the occupancy '
+                             'grid.')
+
+        frameID = (self._frameID + 1) & 0xFFFFFFFF
+        layout = _layout(rosMsg)
+
+        if (self._delta and self._previous is not None and
+                self._layout == layout and
+                self._sinceKeyframe < self._interval):
+            # The differences wrap around like the cells
+            kind, baseID = _DELTA, self._frameID
+            values = cells - self._previous
+            self._sinceKeyframe += 1
+        else:
+            kind, baseID = _KEYFRAME, 0
+            values = cells
+            self._sinceKeyframe = 1
+
+        self._frameID = frameID
+
+        if self._delta:
+            self._layout = layout
+            self._previous = cells
+
+        runs, count = _encodeRuns(values)
+        meta = _serializeMeta(rosMsg)
+
+        buf = StringIO()
+        buf.write(_HEADER.pack(_MAGIC, _VERSION, kind, frameID, baseID, count,
+                               len(meta)))
+        buf.write(meta)
+        buf.write(zlib.compress(runs, self.ZLIB_LEVEL))
+        return buf
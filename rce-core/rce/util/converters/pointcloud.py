@@ -0,0 +1,393 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#     rce-core/rce/util/converters/pointcloud.py
+#
+#     This file is part of the RoboEarth Cloud Engine framework.
+#
+#     This file was originally created for RoboEearth
+#     http://www.roboearth.org/
+#
+#     The research leading to these results has received funding from
+#     the European Union Seventh Framework Programme FP7/2007-2013 under
+#     grant agreement no248942 RoboEarth.
+#
+#     Copyright 2012 RoboEarth
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+#     \author/s: Dominique Hunziker
+#
+#
+
+# Python specific imports
+import zlib
+import struct
+
+try:
+    from cStringIO import StringIO, InputType, OutputType
+    from StringIO import StringIO as pyStringIO
+
+    def _checkIsStringIO(obj):
+        return isinstance(obj, (InputType, OutputType, pyStringIO))
+except ImportError:
+    from StringIO import StringIO
+
+    def _checkIsStringIO(obj):
+        return isinstance(obj, StringIO)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# ROS specific imports
+import sensor_msgs.msg
+
+# zope specific imports
+from zope.interface import implements
+
+# rce specific imports
+from rce.util.converters.interfaces import ICustomROSConverter
+
+
+# Data types of the point fields as a mapping of the form
+#     PointField datatype : NumPy type
+_DATATYPES = { 1 : 'i1', 2 : 'u1', 3 : 'i2', 4 : 'u2', 5 : 'i4', 6 : 'u4',
+               7 : 'f4', 8 : 'f8' }
+
+# Encodings of the columns
+_LOSSLESS = 0
+_QUANTIZED = 1
+
+# Header of the encoded point clouds of the form
+#     (magic, version, resolution in meters, length of the metadata)
+_HEADER = struct.Struct('<3sBdI')
+_MAGIC = 'PCZ'
+_VERSION = 1
+
+# Largest quantized coordinate; the differences of consecutive coordinates
+# have to fit into 32 bit integers
+_MAX_STEPS = 2 ** 30
+
+
+def _pointType(fields, pointStep, byteOrder):
+    """ Internally used method to get the NumPy data type of a point from the
+        point fields of a point cloud.
+    """
+    names, formats, offsets = [], [], []
+
+    for field in fields:
+        try:
+            code = byteOrder + _DATATYPES[field.datatype]
+        except KeyError:
+            raise ValueError("Data type '{0}' of point field '{1}' is not "
+                             'supported.'.format(field.datatype, field.name))
+
+        names.append(field.name)
+        formats.append((code, (field.count,)) if field.count > 1 else code)
+        offsets.append(field.offset)
+
+    try:
+        return numpy.dtype({ 'names' : names, 'formats' : formats,
+                             'offsets' : offsets, 'itemsize' : pointStep })
+    except (TypeError, ValueError) as e:
+        raise ValueError('Point fields do not match the point step: '
+                         '{0}'.format(e))
+
+
+def _columns(points, fields):
+    """ Internally used method to get the columns of the points, i.e. one
+        column per element of the point fields.
+    """
+    for field in fields:
+        column = points[field.name]
+
+        if field.count > 1:
+            for i in xrange(field.count):
+                yield field.name, column[:, i]
+        else:
+            yield field.name, column
+
+
+def _shuffle(values):
+    """ Internally used method to get the little-endian integers of an array
+        as byte planes, i.e. first the lowest byte of all values, which
+        compresses much better than the values one after the other.
+    """
+    size = values.dtype.itemsize
+    return values.astype('<u{0}'.format(size)).view(numpy.uint8).reshape(
+                                                        -1, size).T.tostring()
+
+
+def _unshuffle(payload, offset, count, size):
+    """ Internally used method to read byte planes which were written by
+        '_shuffle' as little-endian unsigned integers.
+    """
+    planes = numpy.frombuffer(payload, numpy.uint8, count * size, offset)
+    values = numpy.ascontiguousarray(planes.reshape(size, count).T)
+    return values.view('<u{0}'.format(size)).reshape(-1), offset + count * size
+
+
+def _quantize(column, resolution):
+    """ Internally used method to quantize a column of coordinates. The
+        quantized coordinates are stored as differences to the previous
+        point, which are small for the ordered point clouds of a sensor, and
+        the invalid points as bit mask.
+
+        @return:        Encoded column or None if the coordinates can not be
+                        quantized.
+    """
+    values = column.astype(numpy.float64)
+    invalid = ~numpy.isfinite(values)
+    values[invalid] = 0.0
+
+    steps = numpy.rint(values / resolution)
+
+    if numpy.abs(steps).max() >= _MAX_STEPS:
+        return None
+
+    steps = steps.astype(numpy.int64)
+    deltas = numpy.empty_like(steps)
+    deltas[0] = steps[0]
+    numpy.subtract(steps[1:], steps[:-1], deltas[1:])
+
+    if invalid.any():
+        mask = '\x01' + numpy.packbits(invalid).tostring()
+    else:
+        mask = '\x00'
+
+    return mask + _shuffle(deltas.astype('<i4'))
+
+
+def _dequantize(payload, offset, count, resolution):
+    """ Internally used method to read a column which was written by
+        '_quantize'.
+    """
+    hasMask = payload[offset] == '\x01'
+    offset += 1
+
+    if hasMask:
+        size = (count + 7) // 8
+        mask = numpy.frombuffer(payload, numpy.uint8, size, offset)
+        invalid = numpy.unpackbits(mask)[:count].astype(bool)
+        offset += size
+
+    deltas, offset = _unshuffle(payload, offset, count, 4)
+    values = numpy.cumsum(deltas.view('<i4'), dtype=numpy.int64) * resolution
+
+    if hasMask:
+        values[invalid] = numpy.nan
+
+    return values, offset
+
+
+def _serializeMeta(rosMsg):
+    """ Internally used method to serialize the fields of a point cloud
+        without the point data.
+    """
+    meta = sensor_msgs.msg.PointCloud2()
+    meta.header = rosMsg.header
+    meta.height = rosMsg.height
+    meta.width = rosMsg.width
+    meta.fields = rosMsg.fields
+    meta.is_bigendian = rosMsg.is_bigendian
+    meta.point_step = rosMsg.point_step
+    meta.row_step = rosMsg.row_step
+    meta.is_dense = rosMsg.is_dense
+
+    buf = StringIO()
+    meta.serialize(buf)
+    return buf.getvalue()
+
+
+class PointCloud2Converter(object):
+    """ Convert point clouds from a compressed columnar format to ROS sensor
+        message format and back.
+
+        The points are split into one column per point field, whose values
+        are stored as byte planes and compressed. With the codec 'columnar'
+        the point clouds are encoded without loss. With the codec 'quantized'
+        the coordinates, i.e. the point fields 'x', 'y' and 'z', are
+        quantized using the resolution in millimeters, which is given as
+        quality, and stored as differences between consecutive points; the
+        invalid coordinates are restored as NaN.
+
+        The encoded point cloud is a StringIO instance containing a header,
+        the serialized point cloud without the point data and the compressed
+        columns. The converter is only used for interfaces for which a robot
+        requested one of the codecs and requires NumPy.
+    """
+    implements(ICustomROSConverter)
+
+    MESSAGE_TYPE = 'sensor_msgs/PointCloud2'
+    CODECS = frozenset(('columnar', 'quantized'))
+
+    # CONFIG
+    QUANTIZED_FIELDS = ('x', 'y', 'z')
+    DEFAULT_RESOLUTION = 1   # in millimeters
+    ZLIB_LEVEL = 1
+
+    def __init__(self, codec='columnar', quality=None):
+        """ Initialize the PointCloud2 converter.
+
+            @param codec:       Codec which is used to encode the point
+                                clouds; 'columnar' or 'quantized'.
+            @type  codec:       str
+
+            @param quality:     Resolution of the quantized coordinates in
+                                millimeters from 1 to 100; the default
+                                resolution is used if None.
+            @type  quality:     int / None
+        """
+        if not numpy:
+            raise ValueError('Point cloud codecs require NumPy.')
+
+        if codec not in self.CODECS:
+            raise ValueError("Point cloud codec '{0}' is not "
+                             'supported.'.format(codec))
+
+        if quality is None:
+            quality = self.DEFAULT_RESOLUTION
+        elif not 1 <= quality <= 100:
+            raise ValueError('Point cloud resolution has to be between 1 and '
+                             '100 millimeters.')
+
+        self._resolution = quality / 1000.0 if codec == 'quantized' else 0.0
+
+    def decode(self, data):
+        """ Convert a point cloud stored in a StringIO object to a ROS
+            compatible message (sensor_msgs.PointCloud2).
+        """
+        if not _checkIsStringIO(data):
+            raise TypeError('Given object is not a StringIO instance.')
+
+        data = data.getvalue()
+
+        try:
+            magic, version, resolution, size = _HEADER.unpack_from(data)
+        except struct.error:
+            raise ValueError('Point cloud header is not valid.')
+
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError('Point cloud format is not supported.')
+
+        start = _HEADER.size + size
+
+        try:
+            rosMsg = sensor_msgs.msg.PointCloud2()
+            rosMsg.deserialize(data[_HEADER.size:start])
+            payload = zlib.decompress(data[start:])
+        except Exception:
+            raise ValueError('Content of given point cloud could not be '
+                             'verified.')
+
+        width, height = rosMsg.width, rosMsg.height
+        pointStep, rowStep = rosMsg.point_step, rosMsg.row_step
+        byteOrder = '>' if rosMsg.is_bigendian else '<'
+
+        if rowStep < width * pointStep:
+            raise ValueError('Row step of point cloud is too small.')
+
+        points = numpy.zeros(width * height,
+                             _pointType(rosMsg.fields, pointStep, byteOrder))
+
+        if points.size:
+            offset = 0
+
+            try:
+                for name, column in _columns(points, rosMsg.fields):
+                    encoding = payload[offset]
+                    offset += 1
+
+                    if encoding == chr(_QUANTIZED):
+                        column[:], offset = _dequantize(payload, offset,
+                                                        points.size,
+                                                        resolution)
+                    else:
+                        values, offset = _unshuffle(payload, offset,
+                                                    points.size,
+                                                    column.dtype.itemsize)
+                        raw = '{0}u{1}'.format(byteOrder,
+                                               column.dtype.itemsize)
+                        column[:] = values.astype(raw).view(column.dtype)
+            except (IndexError, ValueError):
+                raise ValueError('Point data of point cloud is not valid.')
+
+            if offset != len(payload):
+                raise ValueError('Point data of point cloud is not valid.')
+
+        rows = points.view(numpy.uint8).reshape(height, width * pointStep)
+
+        if rowStep > width * pointStep:
+            padded = numpy.zeros((height, rowStep), numpy.uint8)
+            padded[:, :width * pointStep] = rows
+            rows = padded
+
+        rosMsg.data = rows.tostring()
+        return rosMsg
+
+    def encode(self, rosMsg):
+        """ Convert a ROS compatible message (sensor_msgs.PointCloud2) to a
+            point cloud stored in a StringIO object using the codec of the
+            converter.
+        """
+        if not isinstance(rosMsg, sensor_msgs.msg.PointCloud2):
+            raise TypeError('Given object is not a sensor_msgs.msg.PointCloud2 '
+                            'instance.')
+
+        width, height = rosMsg.width, rosMsg.height
+        pointStep, rowStep = rosMsg.point_step, rosMsg.row_step
+        byteOrder = '>' if rosMsg.is_bigendian else '<'
+        data = rosMsg.data
+
+        if not isinstance(data, str):
+            data = str(bytearray(data))
+
+        if rowStep < width * pointStep or len(data) < rowStep * height:
+            raise ValueError('Point data does not match the size of the '
+                             'point cloud.')
+
+        dtype = _pointType(rosMsg.fields, pointStep, byteOrder)
+
+        # The padding at the end of the rows is dropped
+        rows = numpy.frombuffer(data, numpy.uint8, rowStep * height)
+        rows = rows.reshape(height, rowStep)[:, :width * pointStep]
+        points = numpy.ascontiguousarray(rows).view(dtype).reshape(-1)
+
+        chunks = []
+
+        if points.size:
+            for name, column in _columns(points, rosMsg.fields):
+                encoded = None
+
+                if (self._resolution and name in self.QUANTIZED_FIELDS and
+                        column.dtype.kind == 'f'):
+                    encoded = _quantize(column, self._resolution)
+
+                if encoded is None:
+                    raw = 'u{0}'.format(column.dtype.itemsize)
+                    chunks.append(chr(_LOSSLESS))
+                    chunks.append(_shuffle(
+                        numpy.ascontiguousarray(column).view(byteOrder + raw)))
+                else:
+                    chunks.append(chr(_QUANTIZED))
+                    chunks.append(encoded)
+
+        meta = _serializeMeta(rosMsg)
+
+        buf = StringIO()
+        buf.write(_HEADER.pack(_MAGIC, _VERSION, self._resolution, len(meta)))
+        buf.write(meta)
+        buf.write(zlib.compress(''.join(chunks), self.ZLIB_LEVEL))
+        return buf
@@ -32,6 +32,7 @@
 
 # Python specific imports
 import os
+import time
 import fileinput
 import re
 import base64
@@ -44,11 +45,20 @@ from zope.interface import implements
 
 # twisted specific imports
 from twisted.internet import defer
-from twisted.python import failure
+from twisted.internet.task import LoopingCall
+from twisted.internet.threads import deferToThread
+from twisted.python import failure, log
 from twisted.cred import error
 from twisted.cred.credentials import IUsernameHashedPassword
 from twisted.cred.checkers import ICredentialsChecker
 
+try:
+    from twisted.internet.inotify import INotify, INotifyError, \
+        IN_CLOSE_WRITE, IN_MOVED_TO
+    from twisted.python.filepath import FilePath
+except ImportError:
+    INotify = None
+
 
 ### AES Encryption Stuff
 # AES Encryptors strength depends on input password length, ensure it with
@@ -117,9 +127,15 @@ class RCECredChecker(object):
 
     credentialInterfaces = (IUsernameHashedPassword,)
 
+    # CONFIG
+    RELOAD_INTERVAL = 5
+
     cache = False
     _credCache = None
     _cacheTimestamp = 0
+    _reloading = False
+    _outdated = False
+    _watcher = None
 
     def __init__(self, pw_file, provision=False):
         """ Initialize the credentials checker for the RoboEarth Cloud Engine.
@@ -180,7 +196,8 @@ class RCECredChecker(object):
     def __getstate__(self):
         # TODO: Why do we have this method?
         d = dict(vars(self))
-        for k in ('_credCache', '_cacheTimestamp'):
+        for k in ('_credCache', '_cacheTimestamp', '_reloading', '_outdated',
+                  '_watcher'):
             try:
                 del d[k]
             except KeyError:
@@ -206,13 +223,129 @@ class RCECredChecker(object):
                 yield parts[0], Userinfo(parts[1], int(parts[2]),
                                          set(parts[3].split(':')))
 
+    def _readCredentials(self, force=False):
+        """ Internal method to read the credentials database if it has
+            changed since it was last read. The method does not modify the
+            checker and can therefore be called from a thread.
+
+            @param force:       Flag which is True if the database should be
+                                read even if its modification time did not
+                                change.
+            @type  force:       bool
+
+            @return:            Modification time and credentials of the
+                                database or None if it is unchanged.
+            @rtype:             (float, { str : Userinfo }) / None
+        """
+        timestamp = os.path.getmtime(self.filename)
+
+        if (not force and self._credCache is not None and
+            timestamp <= self._cacheTimestamp):
+            return None
+
+        return timestamp, dict(self._loadCredentials())
+
+    def _setCredentials(self, result):
+        """ Internal method to replace the in-memory credentials.
+        """
+        if result:
+            self._cacheTimestamp, self._credCache = result
+
+    def reload(self, force=False):
+        """ Reload the in-memory credentials in a thread if the credentials
+            database has changed.
+
+            @param force:       Flag which is True if the database should be
+                                read even if its modification time did not
+                                change.
+            @type  force:       bool
+
+            @return:            Deferred which fires as soon as the
+                                credentials have been reloaded.
+            @rtype:             twisted.internet.defer.Deferred
+        """
+        if self._reloading:
+            # Reload again as the database might have changed while it was
+            # read
+            self._outdated = True
+            return defer.succeed(None)
+
+        def done(result):
+            self._reloading = False
+
+            if self._outdated:
+                self._outdated = False
+                self.reload(True)
+
+            return result
+
+        self._reloading = True
+        d = deferToThread(self._readCredentials, force)
+        d.addCallback(self._setCredentials)
+        d.addErrback(log.err, 'Could not reload the credentials database.')
+        d.addBoth(done)
+        return d
+
+    def watch(self, reactor):
+        """ Keep the credentials in memory and reload them whenever the
+            credentials database changes. Afterwards no login has to access
+            the file system anymore.
+
+            The database is watched using inotify if it is available and polled
+            every RELOAD_INTERVAL seconds otherwise.
+
+            @param reactor:     Reference to the twisted reactor.
+            @type  reactor:     twisted::reactor
+        """
+        assert self._watcher is None
+        self._setCredentials(self._readCredentials())
+
+        if INotify:
+            name = os.path.basename(self.filename)
+
+            def changed(_, path, mask):
+                if path.basename() == name:
+                    self.reload(True)
+
+            try:
+                watcher = INotify(reactor)
+            except INotifyError as e:
+                log.msg('Credentials database is polled, because inotify is '
+                        'not available: {0}'.format(e))
+            else:
+                try:
+                    # The directory is watched as the database is replaced
+                    # when it is modified
+                    watcher.watch(FilePath(os.path.dirname(self.filename)),
+                                  IN_CLOSE_WRITE | IN_MOVED_TO,
+                                  callbacks=[changed])
+                except INotifyError as e:
+                    watcher.connectionLost(None)
+                    log.msg('Credentials database is polled, because it can '
+                            'not be watched: {0}'.format(e))
+                else:
+                    watcher.startReading()
+                    self._watcher = watcher
+                    return
+
+        watcher = LoopingCall(self.reload)
+        watcher.clock = reactor
+        watcher.start(self.RELOAD_INTERVAL, now=False)
+        self._watcher = watcher
+
+    def _updated(self):
+        """ Internal method which has to be called after the credentials
+            database has been modified by the checker itself.
+        """
+        if self._watcher:
+            self._setCredentials(self._readCredentials(True))
+
     def getUser(self, username):
         """ Fetch username from db or cache. (Internal method)
         """
-        if (self._credCache is None or
-            os.path.getmtime(self.filename) > self._cacheTimestamp):
-            self._cacheTimestamp = os.path.getmtime(self.filename)
-            self._credCache = dict(self._loadCredentials())
+        if not self._watcher:
+            self._setCredentials(self._readCredentials())
+
         return self._credCache[username]
 
     def getUserMode(self, username):
@@ -292,6 +425,7 @@ class RCECredChecker(object):
                 else:
                     print(formatUser(username, props.password, mode,
                                      props.groups))
+        self._updated()
         return True
 
     def addUserGroups(self, username, *groups):
@@ -319,6 +453,7 @@ class RCECredChecker(object):
                 else:
                     print(formatUser(username, props.password, str(props.mode),
                                      groups))
+        self._updated()
         return True
 
     def removeUserGroups(self, username, *groups):
@@ -346,6 +481,7 @@ class RCECredChecker(object):
                 else:
                     print(formatUser(username, props.password, str(props.mode),
                                      groups))
+        self._updated()
         return True
 
     def addUser(self, username, password, provision=False):
@@ -381,6 +517,7 @@ class RCECredChecker(object):
                 f.write(formatUser(username, sha256(password).hexdigest(),
                                    _DEFAULT_USER_MODE, _DEFAULT_GROUPS))
                 f.write('\n')
+            self._updated()
             return True
 
     def removeUser(self, username):
@@ -397,6 +534,7 @@ class RCECredChecker(object):
             for line in fileinput.input(self.filename, inplace=1):
                 if self.scanner.match(line).groups()[0] != username:
                     print(line[:-1])
+            self._updated()
         except KeyError:
                 raise CredentialError('No such user')
 
@@ -441,6 +579,7 @@ class RCECredChecker(object):
             else:
                 print(formatUser(username, sha256(new_password).hexdigest(),
                                  str(props.mode), props.groups))
+        self._updated()
         return True
 
 
@@ -449,6 +588,9 @@ class RCEInternalChecker(object):
     """
     implements(ICredentialsChecker)
 
+    # CONFIG
+    CACHE_TTL = 300
+
     def __init__(self, cred_checker):
         """
             @param cred_checker:    Cred Checker used to authenticate the cloud
@@ -458,6 +600,8 @@ class RCEInternalChecker(object):
         self._root_checker = cred_checker
         self.credentialInterfaces = (IUsernameHashedPassword,)
 
+        self._passwords = {}
+
     def add_checker(self, method):
         """ TODO: Add doc
         """
@@ -471,10 +615,38 @@ class RCEInternalChecker(object):
         else:
             return failure.Failure(error.UnauthorizedLogin())
 
+    def _environmentPassword(self, uid, main, infra):
+        """ Internal method to get the password of an environment. The
+            password is derived in a thread and cached for CACHE_TTL seconds.
+        """
+        now = time.time()
+        key = (uid, main, infra)
+
+        try:
+            deadline, p = self._passwords[key]
+        except KeyError:
+            pass
+        else:
+            if deadline > now:
+                return defer.succeed(p)
+
+        def cb(p):
+            for k, (deadline, _) in self._passwords.items():
+                if deadline <= now:
+                    del self._passwords[k]
+
+            self._passwords[key] = (now + self.CACHE_TTL, p)
+            return p
+
+        d = deferToThread(lambda: encodeAES(cipher(main), salter(uid, infra)))
+        d.addCallback(cb)
+        return d
+
     def requestAvatarId(self, c):
         try:
             if c.username in ('container', 'robot'):
                 p = self._root_checker.getUser('adminInfra').password
+                d = defer.succeed(p)
                 user = c.username
             else: # it is the environment uuid
                 try:
@@ -485,11 +657,12 @@ class RCEInternalChecker(object):
 
                 infra = self._root_checker.getUser('adminInfra').password
                 main = self._root_checker.getUser('admin').password
-                p = encodeAES(cipher(main), salter(c.username, infra))
+                d = self._environmentPassword(c.username, main, infra)
                 user = 'environment'
         except KeyError:
             return defer.fail(error.UnauthorizedLogin())
         else:
-            return defer.maybeDeferred(c.checkPassword, p
-                        ).addCallback(self._cbPasswordMatch, user)
+            d.addCallback(c.checkPassword)
+            d.addCallback(self._cbPasswordMatch, user)
+            return d
 
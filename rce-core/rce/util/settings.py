@@ -153,6 +153,18 @@ class _Settings(object):
         self._comm_port = None
         self._ros_proxy_port = None
 
+        # Robot
+        self._batch_interval = None
+        self._batch_size = None
+        self._compress_threshold = None
+        self._chunk_size = None
+        self._chunk_memory = None
+        self._workers = None
+        self._conversion_threads = None
+        self._topic_queue = None
+        self._service_queue = None
+        self._codec = None
+
         # Converters
         self._converters = None
 
@@ -247,6 +259,83 @@ class _Settings(object):
         """
         return self._ros_proxy_port
 
+    @property
+    def batch_interval(self):
+        """ Time in seconds after which data messages which are batched for
+            a robot are sent. Batching is disabled if the value is 0.
+        """
+        return self._batch_interval
+
+    @property
+    def batch_size(self):
+        """ Number of bytes of batched data messages after which the batch is
+            sent immediately.
+        """
+        return self._batch_size
+
+    @property
+    def compress_threshold(self):
+        """ Minimal size in bytes of a WebSocket frame which is compressed for
+            a robot. Compression is disabled if the value is 0.
+        """
+        return self._compress_threshold
+
+    @property
+    def chunk_size(self):
+        """ Size in bytes of the chunks into which larger binaries for a robot
+            are split. Chunking is disabled if the value is 0.
+        """
+        return self._chunk_size
+
+    @property
+    def chunk_memory(self):
+        """ Maximum number of bytes per robot connection which are used to
+            reassemble binaries received in chunks in memory.
+        """
+        return self._chunk_memory
+
+    @property
+    def workers(self):
+        """ Number of worker processes which are started by a robot process.
+            Worker i listens on the WebSocket port 'ws_port + i' and uses the
+            port 'comm_port + i' for the internal communication.
+        """
+        return self._workers
+
+    @property
+    def conversion_threads(self):
+        """ Number of threads which are used by a robot process to convert
+            the data messages off the reactor. The conversion is done in the
+            reactor if the value is 0.
+        """
+        return self._conversion_threads
+
+    @property
+    def topic_queue(self):
+        """ Maximum number of topic messages per robot connection which are
+            queued while the connection is congested; the oldest message is
+            dropped when the limit is reached. If the value is 0, topic
+            messages are dropped whenever the connection is congested.
+        """
+        return self._topic_queue
+
+    @property
+    def service_queue(self):
+        """ Maximum number of service messages per robot connection which are
+            queued while the connection is congested; further messages are
+            rejected when the limit is reached. If the value is 0, service
+            messages are rejected whenever the connection is congested.
+        """
+        return self._service_queue
+
+    @property
+    def codec(self):
+        """ Name of the JSON codec which is used by the robot processes to
+            encode and decode the JSON messages of the robots or None if the
+            'json' module of the standard library should be used.
+        """
+        return self._codec
+
     @property
     def converters(self):
         """ List of custom message converters which are used in the Robot
@@ -324,6 +413,34 @@ class _Settings(object):
         settings._comm_port = parser.getint('comm', 'comm_port')
         settings._ros_proxy_port = parser.getint('comm', 'ros_proxy_port')
 
+        # Robot
+        settings._batch_interval = parser.getOptional('robot', 'batch_interval',
+                                                      0.0, parser.getfloat)
+        settings._batch_size = parser.getOptional('robot', 'batch_size',
+                                                  65536, parser.getint)
+        settings._compress_threshold = parser.getOptional('robot',
+                                                          'compress_threshold',
+                                                          0, parser.getint)
+        settings._chunk_size = parser.getOptional('robot', 'chunk_size', 0,
+                                                  parser.getint)
+        settings._chunk_memory = parser.getOptional('robot', 'chunk_memory',
+                                                    67108864, parser.getint)
+        settings._workers = parser.getOptional('robot', 'workers', 1,
+                                               parser.getint)
+        settings._conversion_threads = parser.getOptional('robot',
+                                                          'conversion_threads',
+                                                          0, parser.getint)
+        settings._topic_queue = parser.getOptional('robot', 'topic_queue',
+                                                   100, parser.getint)
+        settings._service_queue = parser.getOptional('robot', 'service_queue',
+                                                     100, parser.getint)
+        settings._codec = parser.getOptional('robot', 'codec', None) or None
+
+        for name in ('topic_queue', 'service_queue'):
+            if getattr(settings, name) < 0:
+                raise ValueError("Option '{0}' of the robot settings has to "
+                                 'be at least 0.'.format(name))
+
         # Converters
         settings._converters = tuple(c for _, c in parser.items('converters'))
 
@@ -391,6 +508,30 @@ class _RCESettingsParser(SafeConfigParser, object):
 
         self.read(PATH)
 
+    def getOptional(self, section, option, default, getter=None):
+        """ Get an option which might be missing in older configuration files.
+
+            @param section:     Section from which the option should be
+                                retrieved.
+            @type  section:     str
+
+            @param option:      Option which should be retrieved.
+            @type  option:      str
+
+            @param default:     Value which is returned if the option is
+                                missing.
+
+            @param getter:      Method of the parser which is used to retrieve
+                                the option, e.g. 'getint'. (default: 'get')
+            @type  getter:      callable
+
+            @return:            Value of the option or the default value.
+        """
+        if not self.has_option(section, option):
+            return default
+
+        return (getter or self.get)(section, option)
+
     def getIP(self, section, option):
         """ Get IP address.
 
@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#     rce-core/rce/util/workerpool.py
+#
+#     This file is part of the RoboEarth Cloud Engine framework.
+#
+#     This file was originally created for RoboEearth
+#     http://www.roboearth.org/
+#
+#     The research leading to these results has received funding from
+#     the European Union Seventh Framework Programme FP7/2007-2013 under
+#     grant agreement no248942 RoboEarth.
+#
+#     Copyright 2013 RoboEarth
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+#     \author/s: Dominique Hunziker
+#
+#
+
+# Python specific imports
+from time import time
+from bisect import bisect_left
+from collections import deque
+
+# twisted specific imports
+from twisted.python.threadpool import ThreadPool
+from twisted.internet.defer import Deferred, fail
+from twisted.internet.threads import deferToThreadPool
+
+
+class QueueFull(Exception):
+    """ Exception is raised when a job has been dropped or rejected,
+        because the SerialQueue is full.
+    """
+
+
+class Histogram(object):
+    """ Histogram of durations in seconds with logarithmic buckets.
+    """
+    # CONFIG
+    BOUNDS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5,
+              1.0, 2.0, 5.0)
+
+    def __init__(self):
+        """ Initialize the Histogram.
+        """
+        self._counts = [0] * (len(self.BOUNDS) + 1)
+        self._total = 0.0
+
+    @property
+    def count(self):
+        """ Number of recorded durations. """
+        return sum(self._counts)
+
+    @property
+    def mean(self):
+        """ Mean of the recorded durations in seconds. """
+        count = self.count
+        return self._total / count if count else 0.0
+
+    @property
+    def buckets(self):
+        """ Buckets of the histogram as a list of tuples of the form
+                (upper bound in seconds, count)
+            where the upper bound of the last bucket is None.
+        """
+        return zip(self.BOUNDS + (None,), self._counts)
+
+    def add(self, duration):
+        """ Record a duration.
+
+            @param duration:    Duration in seconds.
+            @type  duration:    float
+        """
+        self._counts[bisect_left(self.BOUNDS, duration)] += 1
+        self._total += duration
+
+
+class SerialQueue(object):
+    """ Queue of jobs which are run one after the other in the threads of a
+        WorkerPool; the results are delivered in the order in which the jobs
+        were added. The jobs of different queues run in parallel.
+
+        The number of jobs which wait for the running job can be limited.
+        When the limit is reached, a queue with droppable jobs drops the
+        oldest pending job, or the new job if none is pending, otherwise the
+        new job is rejected; the Deferred of the dropped or rejected job fails
+        with QueueFull.
+    """
+    def __init__(self, pool, limit=None, droppable=False):
+        """ Initialize the queue.
+
+            @param pool:        Worker pool which runs the jobs.
+            @type  pool:        rce.util.workerpool.WorkerPool
+
+            @param limit:       Maximal number of pending jobs or None if the
+                                number should not be limited.
+            @type  limit:       int / None
+
+            @param droppable:   Flag which is True if the oldest pending job
+                                should be dropped when the limit is reached
+                                and False if the new job should be rejected.
+            @type  droppable:   bool
+        """
+        self._pool = pool
+        self._limit = limit
+        self._droppable = droppable
+        self._pending = deque()
+        self._running = False
+
+    def __len__(self):
+        return len(self._pending) + self._running
+
+    def run(self, func, *args):
+        """ Add a job to the queue.
+
+            @param func:        Callable which should be run in a thread of
+                                the worker pool.
+            @type  func:        callable
+
+            @param *args:       Positional arguments for the callable.
+
+            @return:            Deferred which fires with the result of the
+                                job.
+            @rtype:             twisted.internet.defer.Deferred
+        """
+        if (self._running and self._limit is not None and
+            len(self._pending) >= self._limit):
+            if not self._droppable:
+                return fail(QueueFull('Job has been rejected, because the '
+                                      'queue is full.'))
+
+            if not self._pending:
+                # The limit is 0, i.e. no job may wait for the running job
+                return fail(QueueFull('Job has been dropped, because the '
+                                      'queue is full.'))
+
+            _, _, dropped, _ = self._pending.popleft()
+            self._pool._dropped()
+            dropped.errback(QueueFull('Job has been dropped, because the '
+                                      'queue is full.'))
+
+        d = Deferred()
+        self._pending.append((func, args, d, time()))
+        self._pool._queued()
+        self._next()
+        return d
+
+    def _next(self):
+        """ Internally used method to start the next job.
+        """
+        if self._running or not self._pending:
+            return
+
+        func, args, d, queued = self._pending.popleft()
+        self._running = True
+
+        job = self._pool._submit(_timed, func, args)
+        job.addCallbacks(self._done, self._failed, (d, queued), None,
+                         (d, queued))
+
+    def _done(self, result, d, queued):
+        """ Internally used method to deliver the result of a job.
+        """
+        result, duration = result
+        self._finished(duration, queued)
+        d.callback(result)
+        self._next()
+
+    def _failed(self, failure, d, queued):
+        """ Internally used method to deliver the failure of a job.
+        """
+        self._finished(None, queued)
+        d.errback(failure)
+        self._next()
+
+    def _finished(self, duration, queued):
+        """ Internally used method to update the state and the statistics
+            when a job has finished.
+        """
+        self._running = False
+        self._pool._finished(duration, time() - queued)
+
+
+def _timed(func, args):
+    """ Internally used method to measure the duration of a job in the
+        worker thread.
+    """
+    start = time()
+    result = func(*args)
+    return result, time() - start
+
+
+class WorkerPool(object):
+    """ Pool of threads which is used to run CPU heavy work, e.g. the
+        conversion of the data messages, off the reactor thread.
+
+        The jobs are added to SerialQueues which preserve the order of the
+        results. Running jobs in parallel only pays off if they release the
+        GIL, as zlib, the image codecs and NumPy do for larger data.
+    """
+    def __init__(self, reactor, size):
+        """ Initialize the worker pool; the threads are started with the
+            reactor and stopped when the reactor shuts down.
+
+            @param reactor:     Reference to the twisted reactor.
+            @type  reactor:     twisted::reactor
+
+            @param size:        Maximal number of threads.
+            @type  size:        int
+        """
+        self._reactor = reactor
+        self._threads = ThreadPool(0, size, 'WorkerPool')
+
+        self._depth = 0
+        self._maxDepth = 0
+        self._latency = Histogram()
+        self._jobTime = Histogram()
+
+        reactor.callWhenRunning(self._threads.start)
+        reactor.addSystemEventTrigger('during', 'shutdown', self._threads.stop)
+
+    @property
+    def depth(self):
+        """ Number of jobs which are queued or running. """
+        return self._depth
+
+    @property
+    def maxDepth(self):
+        """ Maximal number of jobs which were queued or running at once. """
+        return self._maxDepth
+
+    @property
+    def latency(self):
+        """ Histogram of the time from adding a job to a queue until its
+            result is delivered.
+        """
+        return self._latency
+
+    @property
+    def jobTime(self):
+        """ Histogram of the time which the jobs run in the worker threads.
+        """
+        return self._jobTime
+
+    def queue(self, limit=None, droppable=False):
+        """ Create a new queue for jobs which have to be run in order.
+
+            @param limit:       Maximal number of pending jobs or None if the
+                                number should not be limited.
+            @type  limit:       int / None
+
+            @param droppable:   Flag which is True if the oldest pending job
+                                should be dropped when the limit is reached
+                                and False if the new job should be rejected.
+            @type  droppable:   bool
+
+            @return:            New queue.
+            @rtype:             rce.util.workerpool.SerialQueue
+        """
+        return SerialQueue(self, limit, droppable)
+
+    def getStats(self):
+        """ Get the statistics of the worker pool.
+
+            @return:            Dictionary with the keys 'depth' and
+                                'maxDepth' which contain the number of jobs
+                                and the keys 'latency' and 'jobTime' which
+                                contain the buckets of the histograms.
+            @rtype:             dict
+        """
+        return {'depth' : self._depth,
+                'maxDepth' : self._maxDepth,
+                'latency' : self._latency.buckets,
+                'jobTime' : self._jobTime.buckets}
+
+    def _submit(self, func, *args):
+        """ Internally used method to run a callable in a worker thread.
+        """
+        return deferToThreadPool(self._reactor, self._threads, func, *args)
+
+    def _queued(self):
+        """ Internally used method to update the statistics when a job has
+            been added to a queue.
+        """
+        self._depth += 1
+        self._maxDepth = max(self._maxDepth, self._depth)
+
+    def _dropped(self):
+        """ Internally used method to update the statistics when a pending
+            job has been dropped.
+        """
+        self._depth -= 1
+
+    def _finished(self, duration, latency):
+        """ Internally used method to update the statistics when a job has
+            finished.
+        """
+        self._depth -= 1
+        self._latency.add(latency)
+
+        if duration is not None:
+            self._jobTime.add(duration)
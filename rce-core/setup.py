@@ -44,6 +44,7 @@ setup(
     url='http://github.com/IDSCETHZurich/rce.git',
     license='Apache 2.0',
     install_requires=['rce_comm', 'rce_util', 'python_iptables'],
+    extras_require={ 'numpy' : ['numpy'] },
     keywords='',
     platforms='',
     namespace_packages=['rce', 'rce.util'],
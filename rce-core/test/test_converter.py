@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#     rce-core/test/test_converter.py
+#
+#     This file is part of the RoboEarth Cloud Engine framework.
+#
+#     This file was originally created for RoboEearth
+#     http://www.roboearth.org/
+#
+#     The research leading to these results has received funding from
+#     the European Union Seventh Framework Programme FP7/2007-2013 under
+#     grant agreement no248942 RoboEarth.
+#
+#     Copyright 2013 RoboEarth
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+#     \author/s: Dominique Hunziker
+#
+#
+
+# Python specific imports
+import unittest
+from cStringIO import StringIO
+
+# ROS specific imports
+try:
+    from genpy import Time, Duration
+    from std_msgs import msg as std_msgs
+    from geometry_msgs import msg as geometry_msgs
+    from sensor_msgs import msg as sensor_msgs
+except ImportError:
+    std_msgs = None
+
+# rce specific imports
+if std_msgs:
+    from rce.util.converter import Converter
+    from rce.util.converters.pointcloud import PointCloud2Converter
+
+
+class _Loader(object):
+    """ Loader which imports the ROS message classes from the Python path.
+    """
+    def loadMsg(self, pkg, name):
+        return getattr(__import__(pkg + '.msg', fromlist=[name]), name)
+
+
+def _serialize(rosMsg):
+    """ Serialize a ROS message using genpy.
+    """
+    buff = StringIO()
+    rosMsg.serialize(buff)
+    return buff.getvalue()
+
+
+def _header():
+    return std_msgs.Header(seq=7, stamp=Time(1365000000, 123456789),
+                           frame_id='map')
+
+
+def _pose(i=0):
+    return geometry_msgs.Pose(
+        position=geometry_msgs.Point(x=1.5 + i, y=-2.25, z=3.0),
+        orientation=geometry_msgs.Quaternion(x=0.0, y=0.0, z=0.5, w=1.0))
+
+
+def _messages():
+    """ ROS messages which cover the message types supported by the
+        serialized conversion, i.e. nested messages and arrays of nested
+        messages, fixed-length arrays, strings, byte arrays, times and
+        durations.
+    """
+    xyz = [sensor_msgs.PointField(name=name, offset=4 * i, count=1,
+                                  datatype=sensor_msgs.PointField.FLOAT32)
+           for i, name in enumerate('xyz')]
+
+    return [
+        # std_msgs
+        std_msgs.String(data='RoboEarth'),
+        _header(),
+        std_msgs.Time(data=Time(1365000000, 5)),
+        std_msgs.Duration(data=Duration(-3, 250000000)),
+        std_msgs.Float64MultiArray(
+            layout=std_msgs.MultiArrayLayout(
+                dim=[std_msgs.MultiArrayDimension(label='rows', size=2,
+                                                  stride=6),
+                     std_msgs.MultiArrayDimension(label='cols', size=3,
+                                                  stride=3)],
+                data_offset=1),
+            data=[0.5 * i for i in xrange(6)]),
+        std_msgs.Int32MultiArray(data=range(-50, 50)),
+        std_msgs.UInt8MultiArray(data='\x00\x01\x7f\xff'),
+
+        # geometry_msgs
+        geometry_msgs.PoseStamped(header=_header(), pose=_pose()),
+        geometry_msgs.PoseArray(header=_header(),
+                                poses=[_pose(i) for i in xrange(3)]),
+        geometry_msgs.PoseWithCovarianceStamped(
+            header=_header(),
+            pose=geometry_msgs.PoseWithCovariance(
+                pose=_pose(), covariance=[0.25 * i for i in xrange(36)])),
+        geometry_msgs.TransformStamped(
+            header=_header(), child_frame_id='base_link',
+            transform=geometry_msgs.Transform(
+                translation=geometry_msgs.Vector3(x=0.5, y=1.0, z=-1.5),
+                rotation=geometry_msgs.Quaternion(w=1.0))),
+        geometry_msgs.PolygonStamped(
+            header=_header(),
+            polygon=geometry_msgs.Polygon(
+                points=[geometry_msgs.Point32(x=0.5 * i, y=-1.0, z=2.0)
+                        for i in xrange(4)])),
+
+        # sensor_msgs
+        sensor_msgs.LaserScan(header=_header(), angle_min=-1.5,
+                              angle_max=1.5, angle_increment=0.25,
+                              time_increment=0.0, scan_time=0.125,
+                              range_min=0.5, range_max=32.0,
+                              ranges=[0.25 * i for i in xrange(100)],
+                              intensities=[1.0, 2.0, 4.0]),
+        sensor_msgs.Image(header=_header(), height=2, width=3,
+                          encoding='rgb8', is_bigendian=0, step=9,
+                          data=''.join(chr(i) for i in xrange(18))),
+        sensor_msgs.JointState(header=_header(), name=['shoulder', 'elbow'],
+                               position=[0.5, -1.5], velocity=[],
+                               effort=[2.0, 4.0]),
+        sensor_msgs.CameraInfo(header=_header(), height=480, width=640,
+                               distortion_model='plumb_bob',
+                               D=[0.5, -0.25, 0.0, 0.0, 0.125],
+                               K=[1.0 * i for i in xrange(9)],
+                               R=[1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0],
+                               P=[2.0 * i for i in xrange(12)],
+                               binning_x=1, binning_y=2,
+                               roi=sensor_msgs.RegionOfInterest(
+                                   x_offset=1, y_offset=2, height=3, width=4,
+                                   do_rectify=True)),
+        sensor_msgs.Imu(header=_header(),
+                        orientation=geometry_msgs.Quaternion(w=1.0),
+                        orientation_covariance=[-1.0] + [0.0] * 8,
+                        angular_velocity=geometry_msgs.Vector3(z=0.5),
+                        angular_velocity_covariance=[0.5] * 9,
+                        linear_acceleration=geometry_msgs.Vector3(z=9.75),
+                        linear_acceleration_covariance=[0.25] * 9),
+        sensor_msgs.PointCloud2(header=_header(), height=1, width=2,
+                                fields=xyz, is_bigendian=False,
+                                point_step=12, row_step=24,
+                                data=''.join(chr(i) for i in xrange(24)),
+                                is_dense=True),
+        sensor_msgs.PointCloud(
+            header=_header(),
+            points=[geometry_msgs.Point32(x=0.5, y=1.5, z=-2.0)] * 2,
+            channels=[sensor_msgs.ChannelFloat32(name='intensity',
+                                                 values=[0.5, 1.5])]),
+        sensor_msgs.NavSatFix(header=_header(),
+                              status=sensor_msgs.NavSatStatus(status=-1,
+                                                              service=1),
+                              latitude=47.375, longitude=8.5, altitude=408.25,
+                              position_covariance=[0.5] * 9,
+                              position_covariance_type=2),
+        sensor_msgs.TimeReference(header=_header(),
+                                  time_ref=Time(1365000001, 999999999),
+                                  source='gps')
+    ]
+
+
+@unittest.skipIf(std_msgs is None, 'ROS messages are not available.')
+class SerializedConversionTest(unittest.TestCase):
+    """ Round-trip tests of the conversion of serialized ROS messages
+        against the serialization of genpy.
+    """
+    def setUp(self):
+        self.converter = Converter(_Loader())
+
+    def test_encodeSerialized(self):
+        for rosMsg in _messages():
+            msgCls = rosMsg.__class__
+            serialized = _serialize(rosMsg)
+            expected = self.converter.encode(msgCls().deserialize(serialized),
+                                             False, True)
+
+            self.assertEqual(self.converter.encodeSerialized(msgCls,
+                                                             serialized,
+                                                             False, True),
+                             expected, msgCls.__name__)
+
+    def test_decodeSerialized(self):
+        for rosMsg in _messages():
+            msgCls = rosMsg.__class__
+            data = self.converter.encode(rosMsg, False, True)
+
+            self.assertEqual(self.converter.decodeSerialized(msgCls, data),
+                             _serialize(rosMsg), msgCls.__name__)
+
+    def test_roundTrip(self):
+        for rosMsg in _messages():
+            msgCls = rosMsg.__class__
+            serialized = _serialize(rosMsg)
+
+            for binary in (True, False):
+                for numericTime in (True, False):
+                    data = self.converter.encodeSerialized(msgCls, serialized,
+                                                           binary, numericTime)
+                    self.assertEqual(self.converter.decodeSerialized(msgCls,
+                                                                     data),
+                                     serialized, msgCls.__name__)
+
+    def test_binary(self):
+        image = _messages()[13]
+        data = self.converter.encodeSerialized(sensor_msgs.Image,
+                                               _serialize(image))
+
+        self.assertEqual(data['data'].getvalue(), image.data)
+
+    def test_time(self):
+        serialized = _serialize(_header())
+
+        for numericTime in (True, False):
+            data = self.converter.encodeSerialized(std_msgs.Header, serialized,
+                                                   True, numericTime)
+            self.assertEqual(data['stamp'],
+                             self.converter.encode(_header(), True,
+                                                   numericTime)['stamp'])
+
+        data = self.converter.encodeSerialized(std_msgs.Duration,
+                                               _serialize(_messages()[3]))
+        self.assertEqual(data['data'], -2.75)
+
+    def test_missingFields(self):
+        for rosMsg in _messages():
+            msgCls = rosMsg.__class__
+
+            self.assertEqual(self.converter.decodeSerialized(msgCls, {}),
+                             _serialize(msgCls()), msgCls.__name__)
+
+            data = self.converter.encode(rosMsg, False, True)
+
+            for key in data.keys()[::2]:
+                del data[key]
+
+            self.assertEqual(self.converter.decodeSerialized(msgCls, data),
+                             _serialize(self.converter.decode(msgCls, data)),
+                             msgCls.__name__)
+
+    def test_outOfRange(self):
+        for data in ({'x' : 1e40}, {'x' : 'a'}):
+            self.assertRaises(ValueError, self.converter.decodeSerialized,
+                              geometry_msgs.Point32, data)
+
+        self.assertRaises(ValueError, self.converter.decodeSerialized,
+                          sensor_msgs.LaserScan, {'ranges' : [1e40] * 3})
+
+    def test_many(self):
+        rosMsgs = [_pose(i) for i in xrange(5)]
+        serialized = [_serialize(rosMsg) for rosMsg in rosMsgs]
+        data = self.converter.encodeSerializedMany(geometry_msgs.Pose,
+                                                   serialized)
+
+        self.assertEqual(data, [self.converter.encode(rosMsg)
+                                for rosMsg in rosMsgs])
+        self.assertEqual(self.converter.decodeSerializedMany(
+                             geometry_msgs.Pose, data), serialized)
+
+    def test_customCodec(self):
+        converter = Converter(_Loader())
+        converter.addCustomConverter(PointCloud2Converter)
+
+        field = sensor_msgs.PointField(name='x', offset=0, datatype=7, count=1)
+        cloud = sensor_msgs.PointCloud2(header=_header(), height=1, width=2,
+                                        fields=[field], point_step=4,
+                                        row_step=8, data='\x00\x00\x80?' * 2,
+                                        is_dense=True)
+        serialized = _serialize(cloud)
+        expected = self.converter.encode(cloud, False)
+
+        # The point cloud converter is only used if one of its codecs is
+        # requested
+        self.assertEqual(converter.encode(cloud, False), expected)
+        self.assertEqual(converter.encode(cloud, False,
+                                          codec=('jpeg', 80)), expected)
+        self.assertEqual(converter.encodeSerialized(sensor_msgs.PointCloud2,
+                                                    serialized, False),
+                         expected)
+        self.assertEqual(converter.decodeSerialized(sensor_msgs.PointCloud2,
+                                                    expected), serialized)
+
+
+if __name__ == '__main__':
+    unittest.main()